@@ -1,20 +1,26 @@
 from .enums import *
 from .errors import *
+from .cache import BaseTrackCache, TrackCache, SQLiteTrackCache
+from .codec import *
 from .events import *
 from .filters import *
 from .node import BaseNode, Node
 from .mixin import NodeListenerMixin
 from .player import Player, PresetPlayer
 from .pool import NodePool
-from .search import TrackSearcher
+from .search import TrackSearcher, TrackStream
+from .snapshot import PlayerState, dump_states, load_states
 from .spotify import SpotifyClient
 from .stats import Stats
-from .track import Track, Playlist
+from .store import BlockList, TrackStore
+from .strategy import BaseStrategy, LeastLoadedStrategy, PenaltyStrategy, RoundRobinStrategy
+from .track import ContextReference, Track, TrackInfo, Playlist
 from .queue import *
 
 
 initiate_node = NodePool.initiate_node
 get_node = NodePool.get_node
+get_best_node = NodePool.get_best_node
 
 
 __version__ = '0.3.0'
@@ -0,0 +1,472 @@
+import time
+import asyncio
+import logging
+import sqlite3
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+from .codec import JSONCodec, get_default_codec
+
+
+__all__: tuple = (
+    'BaseTrackCache',
+    'TrackCache',
+    'SQLiteTrackCache',
+    'SingleFlight'
+)
+
+T = TypeVar('T')
+
+__log__: logging.Logger = logging.getLogger('obsidian.cache')
+
+
+class BaseTrackCache(object):
+    """The base class for all track caches.
+
+    Track caches store raw `/loadtracks` responses keyed by the identifier that was loaded.
+
+    See Also
+    --------
+    :class:`TrackCache`
+    """
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__}>'
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Returns the cached response for the given key, or `None` if it isn't cached or has expired."""
+        raise NotImplementedError
+
+    def put(self, key: str, value: Dict[str, Any], *, negative: bool = False) -> None:
+        """Caches a response.
+
+        Parameters
+        ----------
+        key: str
+            The identifier that was loaded.
+        value: Dict[str, Any]
+            The response to cache.
+        negative: bool, default: False
+            Whether or not this is a negative result, e.g. one with no matches.
+            These are usually kept for a shorter time.
+        """
+        raise NotImplementedError
+
+    def remove(self, key: str) -> None:
+        """Removes the given key from the cache, if cached."""
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        """Removes everything from the cache."""
+        raise NotImplementedError
+
+    async def get_async(self, key: str) -> Optional[Dict[str, Any]]:
+        """|coro|
+
+        Like :meth:`get`, but for use on the event loop. Caches that do I/O override this so that they don't block.
+        """
+        return self.get(key)
+
+    async def put_async(self, key: str, value: Dict[str, Any], *, negative: bool = False) -> None:
+        """|coro|
+
+        Like :meth:`put`, but for use on the event loop. Caches that do I/O override this so that they don't block.
+        """
+        self.put(key, value, negative=negative)
+
+
+class TrackCache(BaseTrackCache):
+    """An in-memory, size-bounded LRU cache with expiring entries.
+
+    Parameters
+    ----------
+    max_size: int, default: 1024
+        The maximum amount of responses to keep. The least recently used ones are evicted first.
+    ttl: Optional[float], default: 300
+        How long, in seconds, responses are kept. If `None`, they never expire.
+    negative_ttl: Optional[float], default: 60
+        How long, in seconds, negative responses are kept. If `None`, they never expire.
+    """
+
+    def __init__(
+            self,
+            max_size: int = 1024,
+            *,
+            ttl: Optional[float] = 300,
+            negative_ttl: Optional[float] = 60
+    ) -> None:
+        if max_size < 1:
+            raise ValueError('Max size must be at least 1.')
+
+        self.max_size: int = max_size
+        self.ttl: Optional[float] = ttl
+        self.negative_ttl: Optional[float] = negative_ttl
+
+        self.__entries: Dict[str, Tuple[Optional[float], Dict[str, Any]]] = OrderedDict()
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def __repr__(self) -> str:
+        return f'<TrackCache size={len(self)} max_size={self.max_size} hits={self.hits} misses={self.misses}>'
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key, count=False) is not None
+
+    @property
+    def hit_rate(self) -> float:
+        """float: The fraction of lookups that were hits."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Dict[str, Any]: The hit, miss and eviction counts of this cache."""
+        return {
+            'size': len(self),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hit_rate
+        }
+
+    def get(self, key: str, *, count: bool = True) -> Optional[Dict[str, Any]]:
+        try:
+            expires, value = self.__entries[key]
+        except KeyError:
+            if count:
+                self.misses += 1
+            return None
+
+        if expires is not None and expires <= time.monotonic():
+            del self.__entries[key]
+            if count:
+                self.misses += 1
+            return None
+
+        self.__entries.move_to_end(key)
+        if count:
+            self.hits += 1
+
+        return value
+
+    def put(self, key: str, value: Dict[str, Any], *, negative: bool = False) -> None:
+        ttl = self.negative_ttl if negative else self.ttl
+        expires = time.monotonic() + ttl if ttl is not None else None
+
+        self.__entries[key] = expires, value
+        self.__entries.move_to_end(key)
+
+        while len(self.__entries) > self.max_size:
+            self.__entries.popitem(last=False)
+            self.evictions += 1
+
+    def remove(self, key: str) -> None:
+        self.__entries.pop(key, None)
+
+    def clear(self) -> None:
+        self.__entries.clear()
+
+    def reset_stats(self) -> None:
+        """Resets the hit, miss and eviction counts."""
+        self.hits = self.misses = self.evictions = 0
+
+
+class SQLiteTrackCache(BaseTrackCache):
+    """A persistent cache backed by an SQLite database in WAL mode.
+
+    The database can be shared between processes on the same host,
+    e.g. between the shards of an :class:`~discord.ext.commands.AutoShardedBot` deployment.
+    On the event loop, :meth:`get_async` and :meth:`put_async` run queries in a background thread.
+    If the database is busy, lookups are treated as misses rather than waiting for it,
+    and so are entries that can't be decoded, which are removed.
+
+    Expired entries are removed lazily, and by :meth:`SQLiteTrackCache.compact`,
+    which also trims the cache down to `max_size`.
+    See :meth:`SQLiteTrackCache.start_compaction` to run it periodically in the background.
+
+    Parameters
+    ----------
+    path: str
+        The path of the database file.
+    max_size: int, default: 100000
+        The maximum amount of entries to keep after compaction. The oldest ones are removed first.
+    ttl: Optional[float], default: 86400
+        How long, in seconds, responses are kept. If `None`, they never expire.
+    negative_ttl: Optional[float], default: 600
+        How long, in seconds, negative responses are kept. If `None`, they never expire.
+    codec: Optional[:class:`.JSONCodec`]
+        The codec used to store responses. Defaults to :func:`.get_default_codec`.
+    """
+
+    TIMEOUT: float = 0.05
+
+    def __init__(
+            self,
+            path: str,
+            max_size: int = 100000,
+            *,
+            ttl: Optional[float] = 86400,
+            negative_ttl: Optional[float] = 600,
+            codec: Optional[JSONCodec] = None
+    ) -> None:
+        if max_size < 1:
+            raise ValueError('Max size must be at least 1.')
+
+        self.path: str = path
+        self.max_size: int = max_size
+        self.ttl: Optional[float] = ttl
+        self.negative_ttl: Optional[float] = negative_ttl
+
+        self.__codec: Optional[JSONCodec] = codec
+        self.__task: Optional[asyncio.Task] = None
+        self.__connection: sqlite3.Connection = self._connect()
+
+        # A single thread, so that queries on the shared connection never run concurrently
+        self.__executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='obsidian-cache')
+
+        with self.__connection:
+            self.__connection.execute(
+                'CREATE TABLE IF NOT EXISTS tracks ('
+                'key TEXT PRIMARY KEY, value BLOB NOT NULL, created REAL NOT NULL, expires REAL)'
+            )
+            self.__connection.execute('CREATE INDEX IF NOT EXISTS tracks_created ON tracks (created)')
+
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def __repr__(self) -> str:
+        return f'<SQLiteTrackCache path={self.path!r} hits={self.hits} misses={self.misses}>'
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=self.TIMEOUT, isolation_level=None, check_same_thread=False)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        connection.execute('PRAGMA mmap_size=67108864')
+        return connection
+
+    @property
+    def codec(self) -> JSONCodec:
+        return self.__codec or get_default_codec()
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Dict[str, Any]: The hit and miss counts of this cache."""
+        return {'hits': self.hits, 'misses': self.misses}
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            row = self.__connection.execute(
+                'SELECT value FROM tracks WHERE key = ? AND (expires IS NULL OR expires > ?)',
+                (key, time.time())
+            ).fetchone()
+        except sqlite3.OperationalError as exc:
+            __log__.debug(f'CACHE | Lookup of {key!r} failed: {exc}')
+            row = None
+
+        if row is None:
+            self.misses += 1
+            return None
+
+        try:
+            value = self.codec.loads(row[0])
+        except (TypeError, ValueError) as exc:
+            __log__.warning(f'CACHE | Removing undecodable entry {key!r}: {exc}')
+            self.remove(key)
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value: Dict[str, Any], *, negative: bool = False) -> None:
+        self.__put_encoded(key, self.codec.dumps(value), negative)
+
+    def remove(self, key: str) -> None:
+        try:
+            self.__connection.execute('DELETE FROM tracks WHERE key = ?', (key,))
+        except sqlite3.OperationalError as exc:
+            __log__.debug(f'CACHE | Removing {key!r} failed: {exc}')
+
+    def clear(self) -> None:
+        try:
+            self.__connection.execute('DELETE FROM tracks')
+        except sqlite3.OperationalError as exc:
+            __log__.warning(f'CACHE | Clearing {self.path!r} failed: {exc}')
+
+    async def get_async(self, key: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.get_event_loop().run_in_executor(self.__executor, self.get, key)
+
+    async def put_async(self, key: str, value: Dict[str, Any], *, negative: bool = False) -> None:
+        # Encode on the loop, so that the value can't change while it is being stored
+        data = self.codec.dumps(value)
+        await asyncio.get_event_loop().run_in_executor(self.__executor, self.__put_encoded, key, data, negative)
+
+    def __put_encoded(self, key: str, data: Any, negative: bool) -> None:
+        now = time.time()
+        ttl = self.negative_ttl if negative else self.ttl
+        expires = now + ttl if ttl is not None else None
+
+        try:
+            self.__connection.execute(
+                'INSERT OR REPLACE INTO tracks (key, value, created, expires) VALUES (?, ?, ?, ?)',
+                (key, data, now, expires)
+            )
+        except sqlite3.OperationalError as exc:
+            __log__.debug(f'CACHE | Storing {key!r} failed: {exc}')
+
+    def compact(self) -> int:
+        """Removes expired entries and trims the cache down to `max_size`.
+
+        This opens its own connection, so it can be run in an executor.
+
+        Returns
+        -------
+        int
+            The amount of entries removed.
+        """
+
+        connection = self._connect()
+        connection.execute('PRAGMA busy_timeout=5000')
+
+        try:
+            removed = connection.execute(
+                'DELETE FROM tracks WHERE expires IS NOT NULL AND expires <= ?', (time.time(),)
+            ).rowcount
+
+            removed += connection.execute(
+                'DELETE FROM tracks WHERE key IN '
+                '(SELECT key FROM tracks ORDER BY created DESC LIMIT -1 OFFSET ?)',
+                (self.max_size,)
+            ).rowcount
+
+            connection.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        finally:
+            connection.close()
+
+        return removed
+
+    def start_compaction(self, *, interval: float = 600, loop: Optional[asyncio.AbstractEventLoop] = None) -> asyncio.Task:
+        """Starts compacting this cache every `interval` seconds in the background.
+
+        Parameters
+        ----------
+        interval: float, default: 600
+            How often, in seconds, to compact.
+        loop: Optional[:class:`asyncio.AbstractEventLoop`]
+            The event loop to run the task on.
+
+        Returns
+        -------
+        :class:`asyncio.Task`
+            The background task.
+        """
+
+        loop = loop or asyncio.get_event_loop()
+
+        async def runner() -> None:
+            while True:
+                await asyncio.sleep(interval)
+
+                try:
+                    removed = await loop.run_in_executor(None, self.compact)
+                except sqlite3.Error as exc:
+                    __log__.warning(f'CACHE | Compaction of {self.path!r} failed: {exc}')
+                else:
+                    __log__.debug(f'CACHE | Compacted {self.path!r}, removed {removed} entries')
+
+        self.stop_compaction()
+        self.__task = task = loop.create_task(runner())
+        return task
+
+    def stop_compaction(self) -> None:
+        """Stops compacting this cache in the background."""
+        if self.__task is not None:
+            self.__task.cancel()
+            self.__task = None
+
+    def close(self) -> None:
+        """Stops compaction and closes the database connection."""
+        self.stop_compaction()
+        self.__executor.shutdown()
+        self.__connection.close()
+
+
+class SingleFlight(object):
+    """Deduplicates concurrent calls that share the same key.
+
+    While a call for a key is in flight, further calls with the same key
+    wait for and share its result instead of starting their own.
+    """
+
+    def __init__(self) -> None:
+        self.__calls: Dict[Hashable, asyncio.Future] = {}
+        self.__waiters: Dict[asyncio.Future, int] = {}
+
+        self.calls: int = 0
+        self.shared: int = 0
+
+    def __repr__(self) -> str:
+        return f'<SingleFlight in_flight={len(self.__calls)} calls={self.calls} shared={self.shared}>'
+
+    @property
+    def in_flight(self) -> int:
+        """int: The amount of calls currently in flight."""
+        return len(self.__calls)
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[T]]) -> T:
+        """Runs `factory()` unless a call with the same key is already in flight.
+
+        Cancelling one of the waiting callers does not cancel the shared call,
+        unless it was the last caller waiting for it.
+
+        Parameters
+        ----------
+        key
+            The key identifying the call.
+        factory: Callable[[], Awaitable]
+            Creates the awaitable to run.
+
+        Returns
+        -------
+        Any
+            The result of the shared call.
+        """
+
+        future = self.__calls.get(key)
+
+        if future is None:
+            self.calls += 1
+            self.__calls[key] = future = asyncio.ensure_future(factory())
+
+            def _done(fut: asyncio.Future) -> None:
+                if self.__calls.get(key) is fut:
+                    del self.__calls[key]
+
+                if not fut.cancelled():
+                    fut.exception()  # Mark the exception as retrieved
+
+            future.add_done_callback(_done)
+        else:
+            self.shared += 1
+
+        waiters = self.__waiters
+        waiters[future] = waiters.get(future, 0) + 1
+
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            if waiters[future] == 1 and not future.done():
+                # Nobody is left to use the result
+                future.cancel()
+            raise
+        finally:
+            waiters[future] -= 1
+            if not waiters[future]:
+                del waiters[future]
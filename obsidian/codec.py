@@ -0,0 +1,99 @@
+import json
+
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+__all__: tuple = (
+    'JSONCodec',
+    'StdlibCodec',
+    'OrjsonCodec',
+    'get_default_codec',
+    'set_default_codec'
+)
+
+Raw = Union[str, bytes, bytearray, memoryview]
+
+
+class JSONCodec(object):
+    """The base class for all JSON codecs.
+
+    Codecs are used to encode websocket payloads and decode websocket frames and HTTP responses.
+
+    See Also
+    --------
+    :func:`set_default_codec`
+    """
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__}>'
+
+    def dumps(self, obj: Any) -> str:
+        """Encodes an object into a JSON string."""
+        raise NotImplementedError
+
+    def loads(self, data: Raw) -> Any:
+        """Decodes JSON from a string or bytes-like object."""
+        raise NotImplementedError
+
+
+class StdlibCodec(JSONCodec):
+    """A codec using the :mod:`json` module of the standard library."""
+
+    def dumps(self, obj: Any) -> str:
+        return json.dumps(obj, separators=(',', ':'))
+
+    def loads(self, data: Raw) -> Any:
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    """A codec using `orjson <https://github.com/ijl/orjson>`_.
+
+    Bytes are decoded directly without being converted into a string first.
+    """
+
+    def __init__(self) -> None:
+        if orjson is None:
+            raise RuntimeError('orjson must be installed in order to use OrjsonCodec.')
+
+    def dumps(self, obj: Any) -> str:
+        return orjson.dumps(obj).decode('utf-8')
+
+    def loads(self, data: Raw) -> Any:
+        return orjson.loads(data)
+
+
+_default_codec: JSONCodec = OrjsonCodec() if orjson is not None else StdlibCodec()
+
+
+def get_default_codec() -> JSONCodec:
+    """Returns the codec used by nodes that were not given one explicitly.
+
+    This is :class:`OrjsonCodec` if orjson is installed, else :class:`StdlibCodec`.
+    """
+    return _default_codec
+
+
+def set_default_codec(codec: JSONCodec) -> None:
+    """Sets the codec used by nodes that were not given one explicitly.
+
+    Parameters
+    ----------
+    codec: :class:`JSONCodec`
+        The new default codec.
+    """
+
+    global _default_codec
+
+    if not isinstance(codec, JSONCodec):
+        raise TypeError('Codecs must inherit from JSONCodec.')
+
+    _default_codec = codec
@@ -0,0 +1,199 @@
+import struct
+
+from base64 import b64decode
+from binascii import Error as BinasciiError
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+__all__: tuple = (
+    'decode_track_info',
+    'decode_track_bytes',
+    'decode_tracks_info',
+    'SUPPORTED_VERSIONS'
+)
+
+SUPPORTED_VERSIONS: Tuple[int, ...] = (1, 2, 3)
+
+_TRACK_INFO_VERSIONED: int = 1
+
+_INT = struct.Struct('>i')
+_LONG = struct.Struct('>q')
+_USHORT = struct.Struct('>H')
+
+
+class _Reader:
+    __slots__ = ('data', 'offset', 'end')
+
+    def __init__(self, data: bytes, offset: int, end: int) -> None:
+        self.data: bytes = data
+        self.offset: int = offset
+        self.end: int = end
+
+    def _take(self, size: int) -> int:
+        start = self.offset
+        self.offset += size
+
+        if self.offset > self.end:
+            raise ValueError('Track data is truncated.')
+
+        return start
+
+    def read_byte(self) -> int:
+        return self.data[self._take(1)]
+
+    def read_boolean(self) -> bool:
+        return self.read_byte() != 0
+
+    def read_long(self) -> int:
+        return _LONG.unpack_from(self.data, self._take(8))[0]
+
+    def read_utf(self) -> str:
+        size = _USHORT.unpack_from(self.data, self._take(2))[0]
+        start = self._take(size)
+        return _decode_modified_utf8(self.data[start:start + size])
+
+    def read_nullable_utf(self) -> Optional[str]:
+        return self.read_utf() if self.read_boolean() else None
+
+
+def _decode_modified_utf8(raw: bytes) -> str:
+    # Java's DataOutput encodes NUL as two bytes and supplementary characters as surrogate pairs.
+    raw = raw.replace(b'\xc0\x80', b'\x00')
+
+    try:
+        return raw.decode('utf-8')
+    except UnicodeDecodeError:
+        return raw.decode('utf-8', 'surrogatepass').encode('utf-16', 'surrogatepass').decode('utf-16')
+
+
+def decode_track_info(id: str, /) -> Dict[str, Any]:
+    """Decodes a Base 64 track ID into the same info payload Obsidian's `/decodetrack` route returns.
+
+    This does not make any requests.
+
+    Parameters
+    ----------
+    id: str
+        The Base 64 track ID.
+
+    Returns
+    -------
+    Dict[str, Any]
+        The track info.
+
+    Raises
+    ------
+    ValueError
+        The ID is malformed or uses an unsupported message version.
+    """
+
+    try:
+        data = b64decode(id, validate=True)
+    except (BinasciiError, ValueError):
+        raise ValueError('Track ID is not valid Base 64.') from None
+
+    return decode_track_bytes(data)
+
+
+def decode_track_bytes(data: bytes, /) -> Dict[str, Any]:
+    """Decodes a track ID that was already decoded from Base 64.
+
+    This does not make any requests.
+
+    Parameters
+    ----------
+    data: bytes
+        The raw bytes of the track ID.
+
+    Returns
+    -------
+    Dict[str, Any]
+        The track info.
+
+    Raises
+    ------
+    ValueError
+        The data is malformed or uses an unsupported message version.
+    """
+
+    if len(data) < 4:
+        raise ValueError('Track data is truncated.')
+
+    header = _INT.unpack_from(data, 0)[0]
+    flags = (header >> 30) & 0x3
+    end = 4 + (header & 0x3FFFFFFF)
+
+    if end > len(data):
+        raise ValueError('Track data is truncated.')
+
+    reader = _Reader(data, 4, end)
+    version = reader.read_byte() if flags & _TRACK_INFO_VERSIONED else 1
+
+    if version not in SUPPORTED_VERSIONS:
+        raise ValueError(f'Unsupported track message version {version}.')
+
+    title = reader.read_utf()
+    author = reader.read_utf()
+    length = reader.read_long()
+    identifier = reader.read_utf()
+    is_stream = reader.read_boolean()
+    uri = reader.read_nullable_utf() if version >= 2 else None
+
+    thumbnail = None
+    if version >= 3:
+        thumbnail = reader.read_nullable_utf()
+        reader.read_nullable_utf()  # ISRC
+
+    source_name = reader.read_utf()
+
+    # Sources may write extra data of their own here, but the position is always last.
+    if reader.offset + 8 > end:
+        raise ValueError('Track data is truncated.')
+
+    position = _LONG.unpack_from(data, end - 8)[0]
+
+    info = {
+        'title': title,
+        'author': author,
+        'length': length,
+        'identifier': identifier,
+        'is_stream': is_stream,
+        'is_seekable': not is_stream,
+        'uri': uri,
+        'source_name': source_name,
+        'position': position
+    }
+
+    if thumbnail is not None:
+        info['thumbnail'] = thumbnail
+
+    return info
+
+
+def decode_tracks_info(ids: Iterable[str]) -> List[Optional[Dict[str, Any]]]:
+    """Decodes multiple Base 64 track IDs.
+
+    Unlike :func:`decode_track_info`, this does not raise for IDs that can't be decoded locally,
+    but returns `None` in their place instead.
+
+    Parameters
+    ----------
+    ids: Iterable[str]
+        The Base 64 track IDs.
+
+    Returns
+    -------
+    List[Optional[Dict[str, Any]]]
+        The track info of each ID, in the same order.
+    """
+
+    result = []
+    append = result.append
+
+    for id_ in ids:
+        try:
+            append(decode_track_info(id_))
+        except ValueError:
+            append(None)
+
+    return result
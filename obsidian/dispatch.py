@@ -0,0 +1,123 @@
+import asyncio
+import logging
+
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from .enums import OpCode
+
+
+__all__: tuple = (
+    'EventDispatcher',
+)
+
+__log__: logging.Logger = logging.getLogger('obsidian.node')
+
+
+class EventDispatcher:
+    """Feeds websocket payloads into a node.
+
+    Payloads of the same guild are processed one after another in the order they were received,
+    while different guilds are processed concurrently by at most `max_workers` workers.
+
+    Cheap payloads, such as stats and player updates, are processed inline
+    whenever nothing else is pending for their guild.
+    If a guild is backlogged, only its newest pending player update is kept.
+
+    Parameters
+    ----------
+    node: :class:`.BaseNode`
+        The node to feed payloads into.
+    loop: :class:`asyncio.AbstractEventLoop`
+        The event loop to run workers on.
+    max_workers: int, default: 64
+        The maximum amount of guilds whose payloads are processed at once.
+    """
+
+    def __init__(self, node, loop: asyncio.AbstractEventLoop, *, max_workers: int = 64) -> None:
+        from .node import BaseNode
+
+        if max_workers < 1:
+            raise ValueError('Max workers must be at least 1.')
+
+        self._node: BaseNode = node
+        self._loop: asyncio.AbstractEventLoop = loop
+
+        # Mailbox entries are [op, data] lists so that stale player updates can be dropped in place
+        self.__mailboxes: Dict[Optional[str], Deque[List[Any]]] = {}
+        self.__pending_updates: Dict[Optional[str], List[Any]] = {}
+        self.__semaphore: asyncio.Semaphore = asyncio.Semaphore(max_workers)
+        self.__coalesced: int = 0
+
+    def __repr__(self) -> str:
+        return f'<EventDispatcher node={self._node.identifier!r} pending={self.pending} coalesced={self.__coalesced}>'
+
+    @property
+    def pending(self) -> int:
+        """int: The amount of payloads waiting to be processed, including dropped player updates."""
+        return sum(map(len, self.__mailboxes.values()))
+
+    @property
+    def coalesced(self) -> int:
+        """int: The amount of player updates that were dropped because a newer one arrived first."""
+        return self.__coalesced
+
+    def feed(self, op: OpCode, data: Dict[str, Any]) -> None:
+        """Queues a payload to be processed.
+
+        Parameters
+        ----------
+        op: :class:`.OpCode`
+            The Op-Code of the payload.
+        data: Dict[str, Any]
+            The payload data.
+        """
+
+        key = data.get('guild_id')
+        mailbox = self.__mailboxes.get(key)
+
+        if mailbox is not None:
+            entry = [op, data]
+
+            if op is OpCode.PLAYER_UPDATE:
+                stale = self.__pending_updates.get(key)
+                if stale is not None:
+                    stale[1] = None
+                    self.__coalesced += 1
+
+                self.__pending_updates[key] = entry
+
+            mailbox.append(entry)
+            return
+
+        if self._node.handle_ws_response_inline(op, data):
+            return
+
+        self.__mailboxes[key] = mailbox = deque()
+        mailbox.append([op, data])
+        self._loop.create_task(self.__drain(key, mailbox))
+
+    def reset_stats(self) -> None:
+        """Resets :attr:`coalesced` back to zero."""
+        self.__coalesced = 0
+
+    async def __drain(self, key: Optional[str], mailbox: Deque[List[Any]]) -> None:
+        try:
+            async with self.__semaphore:
+                while mailbox:
+                    entry = mailbox.popleft()
+                    op, data = entry
+
+                    if self.__pending_updates.get(key) is entry:
+                        del self.__pending_updates[key]
+
+                    if data is None:
+                        continue
+
+                    try:
+                        await self._node.handle_ws_response(op, data)
+                    except Exception as exc:
+                        __log__.error(f'NODE {self._node.identifier!r} | Failed to handle {op!r} payload: {exc!r}')
+        finally:
+            del self.__mailboxes[key]
+            self.__pending_updates.pop(key, None)
@@ -10,7 +10,9 @@ __all__: tuple = (
     'SearchType',
     'EventType',
     'TrackEndReason',
-    'TrackExceptionSeverity'
+    'TrackExceptionSeverity',
+    'RequestPriority',
+    'CircuitState'
 )
 
 
@@ -206,3 +208,44 @@ class TrackExceptionSeverity(Enum):
     COMMON = 'COMMON'
     SUSPICIOUS = 'SUSPICIOUS'
     FAULT = 'FAULT'
+
+
+class RequestPriority(Enum):
+    """|enum|
+
+    Represents the priority of a REST request to Obsidian.
+    When a node is at its concurrency limit, waiting requests with a higher priority are sent first.
+
+    Attributes
+    ----------
+    INTERACTIVE
+        Requests that a user is actively waiting for, e.g. searches.
+    PREFETCH
+        Requests made ahead of time, e.g. resolving upcoming tracks.
+    BULK
+        Large background jobs, e.g. decoding an entire playlist.
+    """
+
+    INTERACTIVE = 0
+    PREFETCH = 1
+    BULK = 2
+
+
+class CircuitState(Enum):
+    """|enum|
+
+    Represents the state of a node's REST circuit breaker.
+
+    Attributes
+    ----------
+    CLOSED
+        Requests are sent normally.
+    OPEN
+        The node is failing, so requests fail immediately without being sent.
+    HALF_OPEN
+        The node is given another chance. A single trial request is sent to check if it has recovered.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
@@ -8,6 +8,7 @@ __all__: tuple = (
     'ObsidianSearchFailure',
     'NoSearchMatchesFound',
     'HTTPError',
+    'CircuitOpen',
     'NodeNotConnected',
     'NodeAlreadyExists',
     'NodeCreationError',
@@ -50,6 +51,12 @@ class HTTPError(ObsidianException):
         self.response: ClientResponse = response
 
 
+class CircuitOpen(ObsidianException):
+    """
+    Raised when a request isn't sent because the node's circuit breaker is open.
+    """
+
+
 class ObsidianSpotifyException(ObsidianException):
     """
     Raised when an error related to spotify occurs.
@@ -113,9 +120,13 @@ class ObsidianAuthorizationFailure(ObsidianConnectionFailure):
     Raised when connecting fails due to invalid authorization.
     """
 
-    def __new__(cls, node, *args, **kwargs) -> ObsidianAuthorizationFailure:
-        message = f'Node {node.identifier!r} failed authorization.'
-        return ObsidianConnectionFailure.from_message(node, message)
+    def __init__(self, node, *args, **kwargs) -> None:
+        from .node import BaseNode
+
+        self.node: BaseNode = node
+        self.original = None
+
+        super(ObsidianException, self).__init__(f'Node {node.identifier!r} failed authorization.')
 
 
 class NodeCreationError(ObsidianException):
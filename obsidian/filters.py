@@ -141,6 +141,24 @@ class FilterSink(object):
     def reset(self) -> None:
         self.__filters = {}
 
+    def load(self, filters: Dict[str, Any]) -> FilterSink:
+        """Replaces the filters of this sink with ones built from their raw payloads.
+
+        This is the inverse of the `filters` key of :meth:`FilterSink.to_json`.
+        Unknown filters are ignored.
+
+        Parameters
+        ----------
+        filters: Dict[str, Any]
+            The raw filter payloads, keyed by their identifier.
+        """
+
+        self.__filters = {
+            key: _FILTER_CLASSES[key].from_raw(value)
+            for key, value in filters.items() if key in _FILTER_CLASSES
+        }
+        return self
+
     def to_json(self, guild_id: Optional[int] = None) -> Dict[str, Any]:
         payload = {}
 
@@ -320,7 +338,8 @@ class TimescaleFilter(BaseFilter):
 
     @classmethod
     def from_raw(cls, data: Dict[str, float]) -> TimescaleFilter:
-        data['pitch_semitones'] = data.get('pitch_semi_tones')
+        data = dict(data)
+        data['pitch_semitones'] = data.pop('pitch_semi_tones', None)
         return cls(**data)
 
     def to_raw(self) -> Dict[str, float]:
@@ -873,3 +892,17 @@ class LowPassFilter(BaseFilter):
 
     def to_raw(self) -> float:
         return self.smoothing
+
+
+_FILTER_CLASSES: Dict[str, type] = {
+    'volume': VolumeFilter,
+    'timescale': TimescaleFilter,
+    'karaoke': KaraokeFilter,
+    'channel_mix': ChannelMixFilter,
+    'vibrato': VibratoFilter,
+    'rotation': RotationFilter,
+    'low_pass': LowPassFilter,
+    'tremolo': TremoloFilter,
+    'equalizer': Equalizer,
+    'distortion': DistortionFilter
+}
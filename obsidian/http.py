@@ -1,31 +1,258 @@
+import time
 import logging
 import asyncio
 
-from aiohttp import ClientSession
+from aiohttp import ClientError, ClientSession
+from collections import deque
 from discord.backoff import ExponentialBackoff
-from typing import Any, Coroutine, Dict, List, Optional
+from typing import Any, AsyncIterator, Coroutine, Deque, Dict, List, Optional, Tuple
 
-from .errors import HTTPError
+from .enums import CircuitState, RequestPriority
+from .errors import CircuitOpen, HTTPError
+from .cache import SingleFlight
+from .codec import JSONCodec, get_default_codec
+from .stream import LoadTracksParser
 
 
 __all__: tuple = (
     'HTTPClient',
+    'RequestScheduler',
+    'CircuitBreaker'
 )
 
 __log__: logging.Logger = logging.getLogger('obsidian.node')
 
 
+class RequestScheduler:
+    """Limits the amount of concurrent requests to a node.
+
+    Requests waiting for a slot are granted one in order of their :class:`.RequestPriority`,
+    and in the order they arrived within the same priority.
+
+    Parameters
+    ----------
+    max_concurrency: int, default: 16
+        The maximum amount of requests in flight at once.
+    """
+
+    def __init__(self, max_concurrency: int = 16) -> None:
+        if max_concurrency < 1:
+            raise ValueError('Max concurrency must be at least 1.')
+
+        self.max_concurrency: int = max_concurrency
+
+        self.__active: int = 0
+        self.__waiters: Dict[RequestPriority, Deque[asyncio.Future]] = {
+            priority: deque() for priority in RequestPriority
+        }
+        self.__wait_time: Dict[RequestPriority, float] = dict.fromkeys(RequestPriority, 0.)
+        self.__granted: Dict[RequestPriority, int] = dict.fromkeys(RequestPriority, 0)
+
+    def __repr__(self) -> str:
+        return f'<RequestScheduler active={self.__active} max_concurrency={self.max_concurrency}>'
+
+    @property
+    def active(self) -> int:
+        """int: The amount of requests currently in flight."""
+        return self.__active
+
+    @property
+    def queue_depth(self) -> Dict[RequestPriority, int]:
+        """Dict[:class:`.RequestPriority`, int]: The amount of requests waiting for a slot, per priority."""
+        return {
+            priority: sum(not future.done() for future in waiters)
+            for priority, waiters in self.__waiters.items()
+        }
+
+    @property
+    def average_wait_time(self) -> Dict[RequestPriority, float]:
+        """Dict[:class:`.RequestPriority`, float]: The average time, in seconds, requests waited for a slot, per priority."""
+        return {
+            priority: self.__wait_time[priority] / granted if granted else 0.
+            for priority, granted in self.__granted.items()
+        }
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Dict[str, Any]: The queue depth and wait time metrics of this scheduler."""
+        return {
+            'active': self.__active,
+            'queue_depth': {priority.name: depth for priority, depth in self.queue_depth.items()},
+            'granted': {priority.name: granted for priority, granted in self.__granted.items()},
+            'average_wait_time': {priority.name: wait for priority, wait in self.average_wait_time.items()}
+        }
+
+    def _waiting(self) -> bool:
+        return any(not future.done() for waiters in self.__waiters.values() for future in waiters)
+
+    async def acquire(self, priority: RequestPriority = RequestPriority.INTERACTIVE) -> None:
+        """Waits for a slot. :meth:`release` must be called once the request is done."""
+
+        if self.__active < self.max_concurrency and not self._waiting():
+            self.__active += 1
+            self.__granted[priority] += 1
+            return
+
+        future = asyncio.get_event_loop().create_future()
+        self.__waiters[priority].append(future)
+        start = time.monotonic()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            # The slot may have been handed to us right before we were cancelled
+            if future.done() and not future.cancelled():
+                self.release()
+            raise
+
+        self.__wait_time[priority] += time.monotonic() - start
+        self.__granted[priority] += 1
+
+    def release(self) -> None:
+        """Frees a slot, handing it to the next waiting request if there is one."""
+
+        for priority in RequestPriority:
+            waiters = self.__waiters[priority]
+
+            while waiters:
+                future = waiters.popleft()
+                if not future.done():
+                    future.set_result(None)
+                    return
+
+        self.__active -= 1
+
+
+class CircuitBreaker:
+    """Stops requests to a node that keeps failing.
+
+    After `failure_threshold` consecutive failures the circuit opens and requests fail immediately.
+    Once `recovery_timeout` seconds have passed, a single trial request is let through;
+    if it succeeds the circuit closes again, otherwise it stays open for another `recovery_timeout`.
+
+    Parameters
+    ----------
+    failure_threshold: int, default: 5
+        The amount of consecutive failures needed to open the circuit.
+    recovery_timeout: float, default: 30
+        How long, in seconds, the circuit stays open before a trial request is sent.
+    """
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30) -> None:
+        if failure_threshold < 1:
+            raise ValueError('Failure threshold must be at least 1.')
+
+        self.failure_threshold: int = failure_threshold
+        self.recovery_timeout: float = recovery_timeout
+
+        self.__failures: int = 0
+        self.__opened_at: Optional[float] = None
+        self.__trial: bool = False
+
+    def __repr__(self) -> str:
+        return f'<CircuitBreaker state={self.state!r} failures={self.__failures}>'
+
+    @property
+    def failures(self) -> int:
+        """int: The amount of consecutive failures."""
+        return self.__failures
+
+    @property
+    def state(self) -> CircuitState:
+        """:class:`.CircuitState`: The current state of the circuit."""
+        if self.__opened_at is None:
+            return CircuitState.CLOSED
+
+        if time.monotonic() - self.__opened_at >= self.recovery_timeout:
+            return CircuitState.HALF_OPEN
+
+        return CircuitState.OPEN
+
+    def allow(self) -> bool:
+        """Returns whether or not a request may be sent. A trial request must be followed by a record call."""
+        state = self.state
+
+        if state is CircuitState.CLOSED:
+            return True
+
+        if state is CircuitState.HALF_OPEN and not self.__trial:
+            self.__trial = True
+            return True
+
+        return False
+
+    def record_success(self) -> None:
+        self.__failures = 0
+        self.__opened_at = None
+        self.__trial = False
+
+    def record_failure(self) -> None:
+        self.__failures += 1
+
+        if self.__trial or self.__failures >= self.failure_threshold:
+            self.__opened_at = time.monotonic()
+
+        self.__trial = False
+
+    def cancel_trial(self) -> None:
+        """Allows another trial request if the current one was aborted without an outcome."""
+        self.__trial = False
+
+    def reset(self) -> None:
+        """Closes the circuit."""
+        self.record_success()
+
+
 class HTTPClient:
-    def __init__(self, session: ClientSession, host: str, port: str, password: str) -> None:
+    RETRY_STATUSES: frozenset = frozenset({408, 429})
+
+    def __init__(
+            self,
+            session: ClientSession,
+            host: str,
+            port: str,
+            password: str,
+            *,
+            codec: Optional[JSONCodec] = None,
+            max_concurrency: int = 16,
+            circuit_breaker: Optional[CircuitBreaker] = None
+    ) -> None:
         self.__session: ClientSession = session
         self.__host: str = host
         self.__port: str = port
         self.__password: str = password
+        self.__codec: Optional[JSONCodec] = codec
+        self.__flights: SingleFlight = SingleFlight()
+        self.__scheduler: RequestScheduler = RequestScheduler(max_concurrency)
+        self.__circuit: CircuitBreaker = circuit_breaker or CircuitBreaker()
 
     @property
     def url(self) -> str:
         return f'http://{self.__host}:{self.__port}/'
 
+    @property
+    def codec(self) -> JSONCodec:
+        return self.__codec or get_default_codec()
+
+    @property
+    def scheduler(self) -> RequestScheduler:
+        return self.__scheduler
+
+    @property
+    def circuit(self) -> CircuitBreaker:
+        return self.__circuit
+
+    def _should_retry(self, status: int) -> bool:
+        return status >= 500 or status in self.RETRY_STATUSES
+
+    async def __acquire(self, priority: RequestPriority) -> None:
+        try:
+            await self.__scheduler.acquire(priority)
+        except BaseException:
+            # A request cancelled while queued never reached the node, so it can't be the trial either
+            self.__circuit.cancel_trial()
+            raise
+
     async def request(
             self,
             method: str,
@@ -35,7 +262,8 @@ class HTTPClient:
             *,
             max_retries: int = 3,
             backoff: Optional[ExponentialBackoff] = None,
-            headers: Optional[Dict[str, Any]] = None
+            headers: Optional[Dict[str, Any]] = None,
+            priority: RequestPriority = RequestPriority.INTERACTIVE
     ) -> Dict[str, Any]:
         if max_retries < 1:
             raise ValueError('Max retries must be at least 1.')
@@ -51,41 +279,154 @@ class HTTPClient:
         kwargs = {
             'method': method,
             'url': url,
-            'headers': headers
+            'headers': _headers
         }
 
         if parameters is not None:
             kwargs['params'] = parameters
 
         if payload is not None:
-            kwargs['json'] = payload
+            kwargs['data'] = self.codec.dumps(payload)
+            _headers['Content-Type'] = 'application/json'
+
+        for attempt in range(1, max_retries + 1):
+            if not self.__circuit.allow():
+                raise CircuitOpen(f'HTTP | Circuit to {self.url!r} is open, not requesting {route!r}')
+
+            retry_after = None
+            await self.__acquire(priority)
+
+            try:
+                async with self.__session.request(**kwargs) as response:
+                    if 200 <= response.status < 300:
+                        data = self.codec.loads(await response.read())
+                        self.__circuit.record_success()
+                        return data
 
-        for _ in range(max_retries):
-            async with self.__session.request(**kwargs) as response:
-                if 200 <= response.status < 300:
-                    return await response.json()
+                    if response.status == 429 and 'Retry-After' in response.headers:
+                        try:
+                            retry_after = float(response.headers['Retry-After'])
+                        except ValueError:
+                            pass
+            except (ClientError, asyncio.TimeoutError) as exc:
+                self.__circuit.record_failure()
+
+                if attempt == max_retries:
+                    __log__.error(f'HTTP | {exc!r} while requesting from {url!r}, retry limit exhausted')
+                    raise
 
                 delay = backoff.delay()
-                __log__.warning(f'HTTP | {response.status} status code while requesting from {response.url!r}, retrying in {delay:.2f} seconds')
+                __log__.warning(f'HTTP | {exc!r} while requesting from {url!r}, retrying in {delay:.2f} seconds')
 
                 await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                # e.g. cancellation, which says nothing about the node's health
+                self.__circuit.cancel_trial()
+                raise
+            finally:
+                self.__scheduler.release()
+
+            if not self._should_retry(response.status):
+                # Client errors won't succeed by retrying and don't mean the node is unhealthy
+                self.__circuit.record_success()
+
+                message = f'HTTP | {response.status} status code while requesting from {response.url!r}'
+                __log__.error(message)
+                raise HTTPError(message, response)
+
+            self.__circuit.record_failure()
+
+            if attempt == max_retries:
+                break
+
+            delay = retry_after if retry_after is not None else backoff.delay()
+            __log__.warning(f'HTTP | {response.status} status code while requesting from {response.url!r}, retrying in {delay:.2f} seconds')
+
+            await asyncio.sleep(delay)
 
         message = f'HTTP | {response.status} status code while requesting from {response.url!r}, retry limit exhausted'
 
         __log__.error(message)
         raise HTTPError(message, response)
 
-    def load_tracks(self, identifier: str) -> Coroutine[Any, Any, Dict[str, Any]]:
+    def load_tracks(
+            self,
+            identifier: str,
+            *,
+            priority: RequestPriority = RequestPriority.INTERACTIVE
+    ) -> Coroutine[Any, Any, Dict[str, Any]]:
         return self.request('GET', '/loadtracks', parameters={
             'identifier': identifier
-        })
+        }, priority=priority)
+
+    async def stream_load_tracks(
+            self,
+            identifier: str,
+            *,
+            priority: RequestPriority = RequestPriority.INTERACTIVE,
+            chunk_size: int = 65536
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        # Parts of the body may already have been consumed, so this is never retried.
+        if not self.__circuit.allow():
+            raise CircuitOpen(f'HTTP | Circuit to {self.url!r} is open, not requesting \'/loadtracks\'')
+
+        url = self.url + 'loadtracks'
+        parser = LoadTracksParser()
+        holding = True
+
+        await self.__acquire(priority)
+
+        try:
+            async with self.__session.get(
+                url,
+                params={'identifier': identifier},
+                headers={'Authorization': self.__password}
+            ) as response:
+                if not 200 <= response.status < 300:
+                    if self._should_retry(response.status):
+                        self.__circuit.record_failure()
+                    else:
+                        self.__circuit.record_success()
+
+                    message = f'HTTP | {response.status} status code while requesting from {response.url!r}'
+                    __log__.error(message)
+                    raise HTTPError(message, response)
+
+                self.__circuit.record_success()
+
+                # The body is read at the consumer's pace, so it shouldn't hold up other requests
+                self.__scheduler.release()
+                holding = False
+
+                async for chunk in response.content.iter_chunked(chunk_size):
+                    for item in parser.feed(chunk):
+                        yield item
+
+                for item in parser.close():
+                    yield item
+        except (ClientError, asyncio.TimeoutError) as exc:
+            self.__circuit.record_failure()
+            __log__.error(f'HTTP | {exc!r} while requesting from {url!r}')
+            raise
+        except BaseException:
+            self.__circuit.cancel_trial()
+            raise
+        finally:
+            if holding:
+                self.__scheduler.release()
 
     def decode_track(self, track: str) -> Coroutine[Any, Any, Dict[str, Any]]:
-        return self.request('GET', '/decodetrack', parameters={
+        return self.__flights.do(('decodetrack', track), lambda: self.request('GET', '/decodetrack', parameters={
             'track': track
-        })
+        }))
 
-    def decode_tracks(self, tracks: List[str]) -> Coroutine[Any, Any, Dict[str, Any]]:
-        return self.request('POST', '/decodetracks', parameters={
+    def decode_tracks(
+            self,
+            tracks: List[str],
+            *,
+            priority: RequestPriority = RequestPriority.BULK
+    ) -> Coroutine[Any, Any, Dict[str, Any]]:
+        return self.request('POST', '/decodetracks', payload={
             'tracks': tracks
-        })
+        }, priority=priority)
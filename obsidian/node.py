@@ -1,24 +1,27 @@
-import json
 import aiohttp
 import asyncio
 import discord
 import logging
 
 from discord.ext import commands
-from typing import Any, Dict, List, Optional, Union, overload
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, Iterable, List, Optional, Union, overload
 
 from .stats import Stats
 from .player import Player
-from .http import HTTPClient
+from .http import CircuitBreaker, HTTPClient
 from .websocket import Websocket
-from .search import TrackSearcher
+from .search import TrackSearcher, TrackStream
 from .errors import NodeNotConnected
 
 from .mixin import NodeListenerMixin
-from .enums import OpCode, Source
+from .enums import CircuitState, OpCode, Source, RequestPriority
 from .track import Track, Playlist
 
 from .spotify import SpotifyClient
+from .cache import BaseTrackCache
+from .decoder import decode_track_info, decode_tracks_info
+from .codec import JSONCodec, get_default_codec
 
 
 Bot = Union[discord.Client, discord.AutoShardedClient, commands.Bot, commands.AutoShardedBot]
@@ -49,12 +52,50 @@ class BaseNode(object):
         The name to use to refer to this node. Defaults to `'MAIN'`
     region: Optional[:class:`discord.VoiceRegion`]
         The voice region this node will be in.
+    failover: bool, default: False
+        Whether or not to move this node's players to another node in the :class:`.NodePool`
+        when the websocket connection is lost.
+        If resuming is enabled, players are only moved once the resume timeout has passed.
+    resume_key: Optional[str]
+        The key used to resume the session after the connection is lost.
+        If given, outgoing payloads are buffered while disconnected and sent once the session is resumed.
+        At most :attr:`MAX_BUFFERED_PAYLOADS` payloads are buffered. If any had to be dropped,
+        the players are restored on resume instead.
+    resume_timeout: float, default: 60
+        How long, in seconds, Obsidian should keep the session alive after the connection is lost.
+    buffer_timeout: Optional[float]
+        How long, in seconds, Obsidian should buffer outgoing events while the connection is lost.
+    codec: Optional[:class:`.JSONCodec`]
+        The codec to encode and decode JSON with. Defaults to :func:`.get_default_codec`.
+    dispatch_workers: int, default: 64
+        The maximum amount of guilds whose websocket payloads are processed at once.
+        Payloads of the same guild are always processed in order.
+    search_cache: Optional[:class:`.BaseTrackCache`]
+        The cache to store track search results in, e.g. a :class:`.TrackCache`.
+    decode_cache: Optional[:class:`.BaseTrackCache`]
+        The cache to store tracks that had to be decoded by Obsidian in, keyed by their ID.
+        This should be a different cache than `search_cache`.
+    local_decoding: bool, default: True
+        Whether or not to decode track IDs locally instead of requesting Obsidian to.
+        Obsidian is still requested for track IDs that can't be decoded locally.
+    max_http_concurrency: int, default: 16
+        The maximum amount of REST requests to this node in flight at once.
+        Waiting requests are sent in order of their :class:`.RequestPriority`.
+    circuit_breaker: Optional[:class:`.CircuitBreaker`]
+        The circuit breaker for REST requests to this node.
+        While it is open, requests fail immediately and :meth:`.NodePool.get_best_node` skips this node.
+    hedge_searches: bool, default: False
+        Whether or not to also send slow track loads to another node and use whichever responds first.
+        See :class:`.TrackSearcher` for more information.
 
     See Also
     --------
     :class:`Node`
     """
 
+    MAX_BUFFERED_PAYLOADS: int = 1000
+    LISTENER_TIMEOUT: float = 5
+
     @overload
     def __init__(
             self,
@@ -69,6 +110,18 @@ class BaseNode(object):
             loop: Optional[asyncio.AbstractEventLoop] = None,
             heartbeat: Optional[float] = None,
             secure: Optional[bool] = None,
+            failover: bool = False,
+            resume_key: Optional[str] = None,
+            resume_timeout: float = 60,
+            buffer_timeout: Optional[float] = None,
+            codec: Optional[JSONCodec] = None,
+            dispatch_workers: int = 64,
+            search_cache: Optional[BaseTrackCache] = None,
+            decode_cache: Optional[BaseTrackCache] = None,
+            local_decoding: bool = True,
+            max_http_concurrency: int = 16,
+            circuit_breaker: Optional[CircuitBreaker] = None,
+            hedge_searches: bool = False,
             **kwargs
     ) -> None:
         ...
@@ -87,6 +140,18 @@ class BaseNode(object):
             loop: Optional[asyncio.AbstractEventLoop] = None,
             heartbeat: Optional[float] = None,
             secure: Optional[bool] = None,
+            failover: bool = False,
+            resume_key: Optional[str] = None,
+            resume_timeout: float = 60,
+            buffer_timeout: Optional[float] = None,
+            codec: Optional[JSONCodec] = None,
+            dispatch_workers: int = 64,
+            search_cache: Optional[BaseTrackCache] = None,
+            decode_cache: Optional[BaseTrackCache] = None,
+            local_decoding: bool = True,
+            max_http_concurrency: int = 16,
+            circuit_breaker: Optional[CircuitBreaker] = None,
+            hedge_searches: bool = False,
             spotify: Optional[SpotifyClient] = None,
             **kwargs
     ) -> None:
@@ -106,6 +171,18 @@ class BaseNode(object):
             loop: Optional[asyncio.AbstractEventLoop] = None,
             heartbeat: Optional[float] = None,
             secure: Optional[bool] = None,
+            failover: bool = False,
+            resume_key: Optional[str] = None,
+            resume_timeout: float = 60,
+            buffer_timeout: Optional[float] = None,
+            codec: Optional[JSONCodec] = None,
+            dispatch_workers: int = 64,
+            search_cache: Optional[BaseTrackCache] = None,
+            decode_cache: Optional[BaseTrackCache] = None,
+            local_decoding: bool = True,
+            max_http_concurrency: int = 16,
+            circuit_breaker: Optional[CircuitBreaker] = None,
+            hedge_searches: bool = False,
             spotify_client_id: Optional[str] = None,
             spotify_client_secret: Optional[str] = None,
             **kwargs
@@ -129,16 +206,29 @@ class BaseNode(object):
         self._identifier: str = identifier or 'MAIN'
         self._region: Optional[discord.VoiceRegion] = region
         self._players: Dict[int, Player] = {}
-        self._search: TrackSearcher = TrackSearcher(self)
+        self._search: TrackSearcher = TrackSearcher(
+            self,
+            cache=kwargs.get('search_cache'),
+            hedge=kwargs.get('hedge_searches', False)
+        )
 
         self.__stats: Optional[Stats] = None
         self.__session: aiohttp.ClientSession = kwargs.get('session') or aiohttp.ClientSession()
         self.__loop: asyncio.AbstractEventLoop = kwargs.get('loop') or bot.loop
         self.__task: Optional[asyncio.Task] = None
         self.__ws: Optional[Websocket] = None
+        self.__buffer: Deque[Dict[str, Any]] = deque(maxlen=self.MAX_BUFFERED_PAYLOADS)
+        self.__buffer_overflowed: bool = False
 
+        self.__codec: Optional[JSONCodec] = kwargs.get('codec')
         self.__http: HTTPClient = HTTPClient(
-            self.__session, self._host, self._port, self._password
+            self.__session,
+            self._host,
+            self._port,
+            self._password,
+            codec=self.__codec,
+            max_concurrency=kwargs.get('max_http_concurrency', 16),
+            circuit_breaker=kwargs.get('circuit_breaker')
         )
 
         spotify = kwargs.get('spotify')
@@ -194,6 +284,11 @@ class BaseNode(object):
         """:class:`discord.VoiceRegion`: The voice region for this node, specified in the constructor."""
         return self._region
 
+    @property
+    def searcher(self) -> TrackSearcher:
+        """:class:`.TrackSearcher`: The track searcher this node uses."""
+        return self._search
+
     @property
     def session(self) -> aiohttp.ClientSession:
         return self.__session
@@ -218,11 +313,31 @@ class BaseNode(object):
     def http(self) -> HTTPClient:
         return self.__http
 
+    @property
+    def codec(self) -> JSONCodec:
+        """:class:`.JSONCodec`: The codec this node uses to encode and decode JSON."""
+        return self.__codec or get_default_codec()
+
     @property
     def stats(self) -> Stats:
         """:class:`.Stats` The statistics for this node returned by the websocket."""
         return self.__stats
 
+    @property
+    def available(self) -> bool:
+        """bool: Whether or not this node is connected and its REST circuit breaker isn't open."""
+        return self.connected and self.__http.circuit.state is not CircuitState.OPEN
+
+    @property
+    def resume_key(self) -> Optional[str]:
+        """Optional[str]: The key used to resume the session, if resuming is enabled."""
+        return self.__internal__.get('resume_key')
+
+    @property
+    def resume_timeout(self) -> float:
+        """float: How long, in seconds, the session is kept alive after the connection is lost."""
+        return self.__internal__.get('resume_timeout', 60)
+
     @property
     def connected(self) -> bool:
         """bool: Whether or not this node is connected."""
@@ -234,19 +349,81 @@ class BaseNode(object):
     def dispatch(self, event: str, *args, **kwargs) -> None:
         raise NotImplementedError
 
-    def dispatch_event(self, player, raw_event: str, event, *args, **kwargs) -> None:
-        self.loop.create_task(
+    def dispatch_event(self, player, raw_event: str, event, *args, **kwargs) -> List[asyncio.Task]:
+        tasks = [self.loop.create_task(
             discord.utils.maybe_coroutine(self.dispatch, player, raw_event, event, *args, **kwargs)
-        )
+        )]
 
         for listener in self.__listeners__.get(event, []):
-            self.loop.create_task(
+            tasks.append(self.loop.create_task(
                 discord.utils.maybe_coroutine(listener, *args, **kwargs)
-            )
+            ))
+
+        return tasks
 
     async def handle_ws_response(self, op: OpCode, data: dict) -> None:
         raise NotImplementedError
 
+    def handle_ws_response_inline(self, op: OpCode, data: dict) -> bool:
+        """Handles a cheap websocket payload synchronously.
+
+        Returns whether or not the payload was handled.
+        If not, it is passed to :meth:`handle_ws_response` instead.
+        """
+        return False
+
+    async def handle_ws_ready(self, *, resumed: bool = False) -> None:
+        if self.resume_key is not None:
+            await self.send(OpCode.SETUP_RESUMING, {
+                'key': self.resume_key,
+                'timeout': int(self.resume_timeout * 1000)
+            })
+
+        buffer_timeout = self.__internal__.get('buffer_timeout')
+        if buffer_timeout is not None:
+            await self.send(OpCode.SETUP_DISPATCH_BUFFER, {'timeout': int(buffer_timeout * 1000)})
+
+        if resumed and not self.__buffer_overflowed:
+            while self.__buffer:
+                payload = self.__buffer.popleft()
+                await self.send(payload['op'], payload['d'])
+
+            return
+
+        if resumed:
+            # Some payloads were dropped, so flushing the rest would leave the players inconsistent.
+            __log__.warning(
+                f'NODE {self.identifier!r} | Payloads were dropped while disconnected, restoring players instead.'
+            )
+
+        # The session was lost, so Obsidian no longer knows about any of our players.
+        self.__buffer.clear()
+        self.__buffer_overflowed = False
+
+        for player in list(self._players.values()):
+            try:
+                await player.restore()
+            except Exception as exc:
+                __log__.error(f'NODE {self.identifier!r} | Failed to restore player {player.guild_id}: {exc}')
+
+    async def handle_ws_closed(self) -> None:
+        if not self.__internal__.get('failover'):
+            return
+
+        if self.resume_key is not None:
+            try:
+                await asyncio.wait_for(self.ws.wait_until_connected(), timeout=self.resume_timeout)
+            except asyncio.TimeoutError:
+                pass
+            else:
+                return
+
+        moved = await self.transfer_players()
+        __log__.warning(f'NODE {self.identifier!r} | Connection lost, failed over {moved} player(s) to other nodes.')
+
+    def _update_stats(self, data: dict) -> None:
+        self.__stats = Stats(data)
+
     async def connect(
             self,
             *,
@@ -282,7 +459,7 @@ class BaseNode(object):
             Whether or not to force disconnection.
         """
 
-        if self.connected:
+        if self.__ws is not None:
             await self.ws.disconnect()
 
         for player in self._players.values():
@@ -312,6 +489,48 @@ class BaseNode(object):
 
         __log__.info(f'NODE {self.identifier!r} | Node has been destroyed.')
 
+    async def transfer_players(self, node: Optional['BaseNode'] = None, *, strategy=None) -> int:
+        """|coro|
+
+        Moves all players of this node to other nodes.
+
+        Parameters
+        ----------
+        node: Optional[:class:`.BaseNode`]
+            The node to move all players to.
+            If not given, a node is chosen for each player using :meth:`NodePool.get_best_node`.
+        strategy: Optional[:class:`.BaseStrategy`]
+            The strategy to use when choosing nodes.
+
+        Returns
+        -------
+        int
+            The amount of players that were moved.
+
+        See Also
+        --------
+        :meth:`Player.move_to`
+        """
+
+        from .pool import NodePool
+
+        moved = 0
+
+        for player in list(self._players.values()):
+            target = node or NodePool.get_best_node(strategy=strategy, region=self._region, exclude=(self,))
+            if target is None:
+                __log__.error(f'NODE {self.identifier!r} | No available node to move player {player.guild_id} to.')
+                break
+
+            try:
+                await player.move_to(target)
+            except Exception as exc:
+                __log__.error(f'NODE {self.identifier!r} | Failed to move player {player.guild_id} to {target.identifier!r}: {exc}')
+            else:
+                moved += 1
+
+        return moved
+
     async def send(self, op: Union[OpCode, int], data: dict) -> None:
         """Sends a message to the Obsidian websocket.
 
@@ -323,19 +542,27 @@ class BaseNode(object):
             The JSON payload to send.
         """
 
-        if not self.connected:
-            raise NodeNotConnected(f'Node {self.identifier!r} is not connected.')
-
         if not isinstance(op, int):
             op = op.value
 
         payload = {'op': op, 'd': data}
 
-        data = json.dumps(payload)
-        if isinstance(data, bytes):
-            data = data.decode('utf-8')
+        if not self.connected:
+            if self.resume_key is not None and self.__ws is not None:
+                if len(self.__buffer) == self.__buffer.maxlen:
+                    dropped = self.__buffer[0]
+                    self.__buffer_overflowed = True
+                    __log__.warning(
+                        f'NODE {self.identifier!r} | Send buffer is full, dropped a buffered {dropped["op"]} websocket payload.'
+                    )
+
+                self.__buffer.append(payload)
+                __log__.debug(f'NODE {self.identifier!r} | Buffered a {op} websocket payload until the session is resumed.')
+                return
+
+            raise NodeNotConnected(f'Node {self.identifier!r} is not connected.')
 
-        await self.ws.send_str(data)
+        await self.ws.send_str(self.codec.dumps(payload))
 
         __log__.debug(f'NODE {self.identifier!r} | Sent a {op} websocket payload: {payload}')
 
@@ -403,11 +630,35 @@ class BaseNode(object):
 
         self.loop.create_task(player.destroy())
 
+    async def __get_decoded(self, id: str) -> Optional[Dict[str, Any]]:
+        cache = self.__internal__.get('decode_cache')
+        if cache is None:
+            return None
+
+        # A broken cache, e.g. a locked SQLite database, should only cost a request
+        try:
+            return await cache.get_async(id)
+        except Exception as exc:
+            __log__.warning(f'NODE {self.identifier!r} | Decode cache lookup of {id!r} failed: {exc}')
+            return None
+
+    async def __put_decoded(self, id: str, info: Dict[str, Any]) -> None:
+        cache = self.__internal__.get('decode_cache')
+        if cache is None:
+            return
+
+        try:
+            await cache.put_async(id, info)
+        except Exception as exc:
+            __log__.warning(f'NODE {self.identifier!r} | Failed to cache decoded track {id!r}: {exc}')
+
     async def decode_track(self, id: str, /, *, cls: type = Track, **kwargs) -> Optional[Track]:
         """|coro|
 
         Decodes a track given it's Base 64 ID.
 
+        Unless `local_decoding` was disabled, this is done without requesting Obsidian if possible.
+
         Parameters
         ----------
         id: str
@@ -427,19 +678,50 @@ class BaseNode(object):
         :meth:`Node.decode_tracks`
         """
 
-        return cls(id=id, info=await self.http.decode_track(id), **kwargs)
+        info = None
+
+        if self.__internal__.get('local_decoding', True):
+            try:
+                info = decode_track_info(id)
+            except ValueError:
+                pass
+
+        if info is None:
+            info = await self.__get_decoded(id)
 
-    async def decode_tracks(self, ids: str, /, *, cls: type = Track, **kwargs) -> Optional[List[Track]]:
+        if info is None:
+            info = await self.http.decode_track(id)
+            await self.__put_decoded(id, info)
+
+        return cls(id=id, info=info, **kwargs)
+
+    async def decode_tracks(
+            self,
+            ids: List[str],
+            /,
+            *,
+            cls: type = Track,
+            chunk_size: int = 100,
+            concurrency: int = 4,
+            **kwargs
+    ) -> Optional[List[Track]]:
         """|coro|
 
         Decodes multiple tracks, given their Base 64 ID's.
 
+        Track IDs that can't be decoded locally are sent to Obsidian in chunks,
+        which are requested concurrently.
+
         Parameters
         ----------
         ids: List[str]
             A list of base 64 track ID's to decode.
         cls: type, default: :class:`Track`
             The class to cast the tracks to.
+        chunk_size: int, default: 100
+            The maximum amount of track IDs to send to Obsidian per request.
+        concurrency: int, default: 4
+            The maximum amount of requests to run at once.
         kwargs
             Extra keyword arguments to pass into the class constructor.
 
@@ -451,10 +733,99 @@ class BaseNode(object):
         See Also
         --------
         :meth:`Node.decode_track`
+
+        :meth:`Node.iter_decode_tracks`
         """
 
-        tracks = await self.http.decode_tracks(ids)
-        return [cls(id=id_, info=track, **kwargs) for id_, track in zip(ids, tracks['tracks'])]
+        return [
+            track async for track in self.iter_decode_tracks(
+                ids, cls=cls, chunk_size=chunk_size, concurrency=concurrency, **kwargs
+            )
+        ]
+
+    async def iter_decode_tracks(
+            self,
+            ids: Iterable[str],
+            /,
+            *,
+            cls: type = Track,
+            chunk_size: int = 100,
+            concurrency: int = 4,
+            **kwargs
+    ) -> AsyncIterator[Track]:
+        """Decodes multiple tracks, yielding them in order as soon as they are decoded.
+
+        This takes the same parameters as :meth:`Node.decode_tracks`.
+
+        Example
+        -------
+
+        .. code:: py
+
+            async for track in node.iter_decode_tracks(ids):
+                queue.add(track)
+        """
+
+        if chunk_size < 1:
+            raise ValueError('Chunk size must be at least 1.')
+
+        if concurrency < 1:
+            raise ValueError('Concurrency must be at least 1.')
+
+        ids = list(ids)
+
+        if self.__internal__.get('local_decoding', True):
+            infos = decode_tracks_info(ids)
+        else:
+            infos = [None] * len(ids)
+
+        missing = []
+
+        for i, info in enumerate(infos):
+            if info is None:
+                infos[i] = await self.__get_decoded(ids[i])
+
+            if infos[i] is None:
+                missing.append(i)
+
+        chunks = [missing[i:i + chunk_size] for i in range(0, len(missing), chunk_size)]
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(chunk: List[int]) -> Dict[str, Any]:
+            async with semaphore:
+                response = await self.http.decode_tracks([ids[i] for i in chunk])
+
+            for i, info in zip(chunk, response['tracks']):
+                await self.__put_decoded(ids[i], info)
+
+            return response
+
+        tasks = [self.loop.create_task(fetch(chunk)) for chunk in chunks]
+        position = 0
+
+        try:
+            for chunk, task in zip(chunks, tasks):
+                while position < chunk[0]:
+                    yield cls(id=ids[position], info=infos[position], **kwargs)
+                    position += 1
+
+                response = await task
+                for i, info in zip(chunk, response['tracks']):
+                    infos[i] = info
+
+                while position <= chunk[-1]:
+                    yield cls(id=ids[position], info=infos[position], **kwargs)
+                    position += 1
+
+            while position < len(ids):
+                yield cls(id=ids[position], info=infos[position], **kwargs)
+                position += 1
+        finally:
+            for task in tasks:
+                task.cancel()
+
+            # Retrieve the results of the abandoned chunks so their exceptions are not reported as never retrieved
+            await asyncio.gather(*tasks, return_exceptions=True)
 
     @overload
     async def search_track(
@@ -464,6 +835,7 @@ class BaseNode(object):
             source: Optional[Source] = None,
             cls: type = Track,
             suppress: bool = False,
+            priority: RequestPriority = RequestPriority.INTERACTIVE,
             **kwargs
     ) -> Optional[Union[Track, Playlist]]:
         ...
@@ -484,6 +856,8 @@ class BaseNode(object):
             The class to cast the track to.
         suppress: bool, default: False
             Whether or not to suppress :exc:`.NoSearchMatchesFound`
+        priority: :class:`.RequestPriority`, default: :attr:`.RequestPriority.INTERACTIVE`
+            The priority of the request to Obsidian.
 
         Returns
         -------
@@ -502,6 +876,7 @@ class BaseNode(object):
             cls: type = Track,
             suppress: bool = True,
             limit: Optional[int] = None,
+            priority: RequestPriority = RequestPriority.INTERACTIVE,
             **kwargs
     ) -> Optional[Union[List[Track], Playlist]]:
         ...
@@ -527,6 +902,8 @@ class BaseNode(object):
             Whether or not to suppress :exc:`.NoSearchMatchesFound`
         limit: Optional[int]
             The maximum amount of tracks to return.
+        priority: :class:`.RequestPriority`, default: :attr:`.RequestPriority.INTERACTIVE`
+            The priority of the request to Obsidian.
 
         Returns
         -------
@@ -536,6 +913,68 @@ class BaseNode(object):
 
         return await self._search.search_tracks(*args, **kwargs)
 
+    def stream_tracks(
+            self,
+            query: str,
+            *,
+            source: Optional[Source] = None,
+            cls: type = Track,
+            limit: Optional[int] = None,
+            priority: RequestPriority = RequestPriority.INTERACTIVE,
+            **kwargs
+    ) -> TrackStream:
+        """Searches for tracks given a query or URL, yielding each track as soon as it arrives.
+
+        Unlike :meth:`search_tracks`, the response is parsed while it is being received,
+        so memory stays bounded for very large playlists and the first track can be played
+        before the rest has arrived. Streamed responses are not cached.
+
+        The returned :class:`.TrackStream` must be used with ``async with``, which closes the response
+        even if iteration stops early. Playlists are not built; their info is available through
+        :attr:`.TrackStream.playlist_info` once it has been received.
+
+        .. warning::
+            If the track is a direct URL, the `source` kwarg will be ignored.
+
+        Example
+        -------
+
+        .. code:: py
+
+            async with node.stream_tracks(url, ctx=ctx) as stream:
+                async for track in stream:
+                    player.queue.add(track)
+
+        Parameters
+        ----------
+        query: str
+            The search query or URL.
+        source: Optional[:class:`.Source`]
+            The source that the tracks should come from.
+        cls: type, default: :class:`.Track`
+            The class to cast the tracks to.
+        limit: Optional[int]
+            The maximum amount of tracks to yield.
+        priority: :class:`.RequestPriority`, default: :attr:`.RequestPriority.INTERACTIVE`
+            The priority of the request to Obsidian.
+
+        Returns
+        -------
+        :class:`.TrackStream`
+            The stream of the tracks found, in order.
+
+        Raises
+        ------
+        :exc:`.ObsidianSearchFailure`
+            Obsidian failed to load the query. Raised while iterating.
+        :exc:`.NoSearchMatchesFound`
+            No tracks were found. Raised while iterating.
+        """
+
+        return self._search.stream_tracks(
+            query, source=source, cls=cls, limit=limit, priority=priority, **kwargs
+        )
+
 
 class Node(BaseNode, NodeListenerMixin):
     """Represents a connection to Obsidian that manages requests and websockets.
@@ -573,7 +1012,7 @@ class Node(BaseNode, NodeListenerMixin):
 
     async def handle_ws_response(self, op: OpCode, data: dict) -> None:
         if op is OpCode.STATS:
-            self.__stats = Stats(data)
+            self._update_stats(data)
             return
 
         player = self.get_player(int(data['guild_id']), must_exist=True)
@@ -581,7 +1020,25 @@ class Node(BaseNode, NodeListenerMixin):
             return
 
         if op is OpCode.PLAYER_EVENT:
-            player.dispatch_event(data)
+            tasks = player.dispatch_event(data)
+
+            # Give listeners a chance to finish before the next payload of this guild is processed
+            if tasks:
+                await asyncio.wait(tasks, timeout=self.LISTENER_TIMEOUT)
 
         elif op is OpCode.PLAYER_UPDATE:
             player.update_state(data)
+
+    def handle_ws_response_inline(self, op: OpCode, data: dict) -> bool:
+        if op is OpCode.STATS:
+            self._update_stats(data)
+            return True
+
+        if op is OpCode.PLAYER_UPDATE:
+            player = self.get_player(int(data['guild_id']), must_exist=True)
+            if player:
+                player.update_state(data)
+
+            return True
+
+        return False
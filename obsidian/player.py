@@ -14,7 +14,9 @@ from .track import Track, Playlist
 from .events import get_cls
 
 from .enums import OpCode, Source
+from .errors import NodeNotConnected
 from .queue import Queue, PointerBasedQueue, LoopType
+from .snapshot import PlayerState
 from .mixin import NodeListenerMixin
 
 
@@ -290,10 +292,10 @@ class Player(NodeListenerMixin):
 
         current_track = data.get('current_track', {})
         self._current_track_id = current_track.get('track')
-        self._last_position = current_track.get('position', 0.)
+        self._last_position = self._position = current_track.get('position', 0.)
         self._paused = current_track.get('paused', False)
 
-    def dispatch_event(self, data: Dict[str, Any]) -> None:
+    def dispatch_event(self, data: Dict[str, Any]) -> List[asyncio.Task]:
         try:
             event_name = data['t']
         except KeyError:
@@ -301,14 +303,14 @@ class Player(NodeListenerMixin):
                 event_name = data['type']
             except KeyError:
                 __log__.error(f'PLAYER | {self.guild_id!r} received unknown event type: {data}')
-                return
+                return []
         
         t = get_cls(event_name)
 
         event = t(data)
 
         __log__.info(f'PLAYER | {self.guild_id!r} dispatching {event.type!r}: {data}')
-        self.node.dispatch_event(f'obsidian_{event.type.value.lower()}', self, event_name, event)
+        return self.node.dispatch_event(f'obsidian_{event.type.value.lower()}', self, event_name, event)
 
     async def dispatch_voice_update(self) -> None:
         if not self._session_id or not self._voice_server_update_data:
@@ -317,6 +319,113 @@ class Player(NodeListenerMixin):
         payload = {'session_id': self._session_id, **self._voice_server_update_data}
         await self._node.send(OpCode.SUBMIT_VOICE_UPDATE, payload)
 
+    async def restore(self, *, position: Optional[float] = None) -> None:
+        """Sends this player's voice connection, filters and current track to its node again.
+
+        This is used when the node no longer knows about this player,
+        e.g. after its session was lost or after moving to another node.
+
+        Parameters
+        ----------
+        position: Optional[float]
+            The position, in milliseconds, to resume the current track at.
+            Defaults to :attr:`Player.position`.
+        """
+
+        if position is None:
+            position = self.position
+
+        paused = self._paused
+
+        await self.dispatch_voice_update()
+
+        if self.__sink.filters:
+            await self.update_filters()
+
+        if self._current is not None:
+            await self.play(self._current, start_time=int(position))
+
+            if paused:
+                await self.set_pause(True)
+
+            self._position = position
+            self._last_update = time.time() * 1000
+
+    def export_state(self) -> PlayerState:
+        """Exports the current track, position, paused state and filters of this player.
+
+        The state can be written to a file along with the states of other players using :func:`.dump_states`.
+
+        Returns
+        -------
+        :class:`.PlayerState`
+            The exported state.
+        """
+
+        return PlayerState(
+            guild_id=self.guild_id,
+            channel_id=self._channel.id if self._channel is not None else None,
+            track=self._current,
+            position=int(self.position),
+            paused=self._paused,
+            filters=self.__sink.to_json(self.guild_id)['filters']
+        )
+
+    async def import_state(self, state: PlayerState, *, play: bool = True) -> None:
+        """Applies a state exported by :meth:`Player.export_state`.
+
+        This player should already be connected to a voice channel, usually the one of `state.channel_id`.
+
+        Parameters
+        ----------
+        state: :class:`.PlayerState`
+            The state to apply.
+        play: bool, default: True
+            Whether or not to resume the track of the state at its position.
+        """
+
+        self.__sink.load(state.filters)
+
+        if self.__sink.filters:
+            await self.update_filters()
+
+        if play and state.track is not None:
+            await self.play(state.track, start_time=state.position)
+
+            if state.paused:
+                await self.set_pause(True)
+
+            self._position = state.position
+            self._last_update = time.time() * 1000
+
+    async def move_to(self, node) -> None:
+        """Moves this player to another node.
+
+        The voice connection is handed over to the new node, and the current track,
+        position, paused state and filters are restored there.
+
+        Parameters
+        ----------
+        node: :class:`.BaseNode`
+            The node to move to.
+        """
+
+        if node is self._node:
+            return
+
+        if not node.connected:
+            raise NodeNotConnected(f'Node {node.identifier!r} is not connected.')
+
+        position = self.position
+
+        self._node._players.pop(self.guild_id, None)
+        node._players[self.guild_id] = self
+        self._node = node
+
+        await self.restore(position=position)
+
+        __log__.info(f'PLAYER | {self.guild_id} moved to node {node.identifier!r}')
+
     async def connect(
             self,
             channel: discord.VoiceChannel,
@@ -640,6 +749,7 @@ class PresetPlayer(Player):
     ) -> None:
         super().__init__(node, bot, guild)
         self._queue: PointerBasedQueue = queue_cls()
+        self.__track_cls: type = track_cls
 
         self.ctx: Optional[commands.Context] = None
         self._dj: Optional[discord.Member] = None
@@ -695,6 +805,35 @@ class PresetPlayer(Player):
         self._kill_destroy_task()
         self._queue.add(track)
 
+    def export_state(self) -> PlayerState:
+        """Exports the state of this player, including a :meth:`Queue.snapshot` of its queue.
+
+        Returns
+        -------
+        :class:`.PlayerState`
+            The exported state.
+        """
+
+        state = super().export_state()
+        state.queue = self._queue.snapshot()
+        return state
+
+    async def import_state(self, state: PlayerState, *, play: bool = True) -> None:
+        """Applies a state exported by :meth:`PresetPlayer.export_state`, restoring its queue first.
+
+        Parameters
+        ----------
+        state: :class:`.PlayerState`
+            The state to apply.
+        play: bool, default: True
+            Whether or not to resume the track of the state at its position.
+        """
+
+        if state.queue is not None:
+            self._queue.restore(state.queue, cls=self.__track_cls)
+
+        await super().import_state(state, play=play)
+
     async def wait_then_destroy(self) -> None:
         await asyncio.sleep(self.__wait_timeout)
         await self.destroy()
@@ -3,11 +3,15 @@ import aiohttp
 import asyncio
 
 from discord.ext import commands
-from typing import Dict, Optional, Union, overload
+from typing import Dict, Iterable, List, Optional, Union, overload
 
 from .node import BaseNode, Node
 from .errors import NodeAlreadyExists
+from .strategy import BaseStrategy, PenaltyStrategy
+from .http import CircuitBreaker
 
+from .cache import BaseTrackCache
+from .codec import JSONCodec
 from .spotify import SpotifyClient
 
 
@@ -21,6 +25,7 @@ Bot = Union[discord.Client, discord.AutoShardedClient, commands.Bot, commands.Au
 class _NodePool:
     def __init__(self):
         self._nodes: Dict[str, BaseNode] = {}
+        self._strategy: BaseStrategy = PenaltyStrategy()
 
     def __repr__(self) -> str:
         return f'NodePool [ {", ".join(map(repr, self._nodes))} ]'
@@ -29,6 +34,18 @@ class _NodePool:
     def nodes(self) -> Dict[str, BaseNode]:
         return self._nodes
 
+    @property
+    def strategy(self) -> BaseStrategy:
+        """:class:`.BaseStrategy`: The default strategy used by :meth:`NodePool.get_best_node`."""
+        return self._strategy
+
+    @strategy.setter
+    def strategy(self, new: BaseStrategy) -> None:
+        if not isinstance(new, BaseStrategy):
+            raise TypeError('Strategies must inherit from BaseStrategy.')
+
+        self._strategy = new
+
     @overload
     async def initiate_node(
             self,
@@ -44,6 +61,18 @@ class _NodePool:
             loop: Optional[asyncio.AbstractEventLoop] = None,
             heartbeat: Optional[float] = None,
             secure: Optional[bool] = None,
+            failover: bool = False,
+            resume_key: Optional[str] = None,
+            resume_timeout: float = 60,
+            buffer_timeout: Optional[float] = None,
+            codec: Optional[JSONCodec] = None,
+            dispatch_workers: int = 64,
+            search_cache: Optional[BaseTrackCache] = None,
+            decode_cache: Optional[BaseTrackCache] = None,
+            local_decoding: bool = True,
+            max_http_concurrency: int = 16,
+            circuit_breaker: Optional[CircuitBreaker] = None,
+            hedge_searches: bool = False,
             **kwargs
     ) -> BaseNode:
         ...
@@ -63,6 +92,18 @@ class _NodePool:
             loop: Optional[asyncio.AbstractEventLoop] = None,
             heartbeat: Optional[float] = None,
             secure: Optional[bool] = None,
+            failover: bool = False,
+            resume_key: Optional[str] = None,
+            resume_timeout: float = 60,
+            buffer_timeout: Optional[float] = None,
+            codec: Optional[JSONCodec] = None,
+            dispatch_workers: int = 64,
+            search_cache: Optional[BaseTrackCache] = None,
+            decode_cache: Optional[BaseTrackCache] = None,
+            local_decoding: bool = True,
+            max_http_concurrency: int = 16,
+            circuit_breaker: Optional[CircuitBreaker] = None,
+            hedge_searches: bool = False,
             spotify: Optional[SpotifyClient] = None,
             **kwargs
     ) -> BaseNode:
@@ -83,6 +124,18 @@ class _NodePool:
             loop: Optional[asyncio.AbstractEventLoop] = None,
             heartbeat: Optional[float] = None,
             secure: Optional[bool] = None,
+            failover: bool = False,
+            resume_key: Optional[str] = None,
+            resume_timeout: float = 60,
+            buffer_timeout: Optional[float] = None,
+            codec: Optional[JSONCodec] = None,
+            dispatch_workers: int = 64,
+            search_cache: Optional[BaseTrackCache] = None,
+            decode_cache: Optional[BaseTrackCache] = None,
+            local_decoding: bool = True,
+            max_http_concurrency: int = 16,
+            circuit_breaker: Optional[CircuitBreaker] = None,
+            hedge_searches: bool = False,
             spotify_client_id: Optional[str] = None,
             spotify_client_secret: Optional[str] = None,
             **kwargs
@@ -113,8 +166,50 @@ class _NodePool:
         self._nodes[node.identifier] = node
         return node
 
-    def get_node(self, identifier: Optional[str] = None) -> BaseNode:
+    def get_node(self, identifier: Optional[str] = None) -> Optional[BaseNode]:
+        """Gets a node by its identifier, or `None` if it does not exist.
+
+        Use :meth:`NodePool.get_best_node` to choose a node instead.
+        """
+
         return self._nodes.get(identifier)
 
+    def get_best_node(
+            self,
+            *,
+            strategy: Optional[BaseStrategy] = None,
+            region: Optional[discord.VoiceRegion] = None,
+            exclude: Optional[Iterable[BaseNode]] = None
+    ) -> Optional[BaseNode]:
+        """Chooses a connected node using a placement strategy.
+
+        Nodes whose REST circuit breaker is open are never chosen.
+
+        Parameters
+        ----------
+        strategy: Optional[:class:`.BaseStrategy`]
+            The strategy to use. Defaults to :attr:`NodePool.strategy`.
+        region: Optional[:class:`discord.VoiceRegion`]
+            If given, nodes in this voice region will be preferred.
+        exclude: Optional[Iterable[:class:`.BaseNode`]]
+            Nodes that should not be chosen.
+
+        Returns
+        -------
+        Optional[:class:`.BaseNode`]
+            The chosen node, or `None` if no nodes are connected.
+        """
+
+        exclude = set(exclude or ())
+        nodes: List[BaseNode] = [
+            node for node in self._nodes.values()
+            if node.available and node not in exclude
+        ]
+
+        if region is not None:
+            nodes = [node for node in nodes if node.region == region] or nodes
+
+        return (strategy or self._strategy).select(nodes)
+
 
 NodePool = _NodePool()
@@ -1,11 +1,19 @@
 from __future__ import annotations
 
+import random
+import struct
+import asyncio
+
+from array import array
+from bisect import bisect_left, bisect_right
 from enum import Enum
 from copy import copy
 from collections import deque
-from typing import Iterable, Iterator, Optional, Union
+from itertools import accumulate, islice
+from typing import Callable, Deque, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
 
 
+from .snapshot import _SnapshotReader, _pack_track, _read_track
 from .track import Track, Playlist
 
 
@@ -13,10 +21,23 @@ __all__: tuple = (
     'Queue',
     'PointerBasedQueue',
     'LoopType',
-    'QueueFull'
+    'QueueFull',
+    'DurationIndex',
+    'ExtendResult'
 )
 
 
+_SNAPSHOT_MAGIC: bytes = b'OBQ'
+_SNAPSHOT_VERSION: int = 1
+
+_SNAPSHOT_HEADER = struct.Struct('>3sBBBiII')
+_SNAPSHOT_INDEX = struct.Struct('>I')
+
+# Snapshot flags
+_SNAPSHOT_EXHAUSTED = 1
+_SNAPSHOT_SHUFFLE = 2
+
+
 class LoopType(Enum):
     NONE = 0
     TRACK = 1
@@ -27,6 +48,325 @@ class QueueFull(Exception):
     ...
 
 
+class ExtendResult(NamedTuple):
+    """The result of adding multiple tracks to a queue at once."""
+
+    added: int
+    """int: The amount of tracks added."""
+
+    dropped: int
+    """int: The amount of tracks that did not fit into the queue."""
+
+
+def _flatten(items: List[Union[Track, Playlist]]) -> Iterator[Track]:
+    for item in items:
+        if isinstance(item, Playlist):
+            yield from item
+        else:
+            yield item
+
+
+def _duration_of(track: Track) -> int:
+    # Streams have no meaningful length
+    return 0 if track.stream else track.length
+
+
+def _fenwick(values: Iterable[int]) -> array:
+    tree = array('q', [0])
+    tree.extend(values)
+    size = len(tree) - 1
+
+    for i in range(1, size + 1):
+        parent = i + (i & -i)
+        if parent <= size:
+            tree[parent] += tree[i]
+
+    return tree
+
+
+def _fenwick_prefix(tree: array, position: int) -> int:
+    result = 0
+
+    while position > 0:
+        result += tree[position]
+        position &= position - 1
+
+    return result
+
+
+def _fenwick_update(tree: array, position: int, delta: int) -> None:
+    size = len(tree)
+    position += 1
+
+    while position < size:
+        tree[position] += delta
+        position += position & -position
+
+
+def _fenwick_append(tree: array, value: int) -> None:
+    i = len(tree)
+    tree.append(value + _fenwick_prefix(tree, i - 1) - _fenwick_prefix(tree, i - (i & -i)))
+
+
+def _fenwick_search(tree: array, value: int) -> Tuple[int, int]:
+    # Returns the amount of leading entries whose sum is at most the value, and that sum
+    size = len(tree) - 1
+    position = 0
+    total = 0
+    step = 1 << size.bit_length()
+
+    while step:
+        following = position + step
+        if following <= size and total + tree[following] <= value:
+            position = following
+            total += tree[following]
+
+        step >>= 1
+
+    return position, total
+
+
+class DurationIndex:
+    """An index over track lengths, used by queues to answer duration queries in O(log n).
+
+    Lengths are kept in blocks of about √n entries, with Fenwick trees over the sums and sizes of the blocks.
+    Appending is O(log n), while inserting or removing anywhere else is O(√n).
+
+    Parameters
+    ----------
+    lengths: Iterable[int]
+        The initial lengths, in milliseconds.
+    """
+
+    __slots__ = ('_blocks', '_sums', '_counts', '_length', '_total')
+
+    # The minimum amount of entries per block, blocks grow with the square root of the length
+    BLOCK_SIZE: int = 64
+
+    def __init__(self, lengths: Iterable[int] = ()) -> None:
+        self._blocks: List[array] = []
+        self._sums: array = array('q', [0])
+        self._counts: array = array('q', [0])
+        self._length: int = 0
+        self._total: int = 0
+
+        self._rebuild(array('q', lengths))
+
+    def __repr__(self) -> str:
+        return f'<DurationIndex entries={len(self)} total={self._total}>'
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[int]:
+        for block in self._blocks:
+            yield from block
+
+    def __getitem__(self, index: int) -> int:
+        position, offset = self._locate(index)
+        return self._blocks[position][offset]
+
+    def _block_size(self) -> int:
+        return max(self.BLOCK_SIZE, int(self._length ** 0.5))
+
+    def _locate(self, index: int) -> Tuple[int, int]:
+        length = self._length
+
+        if index < 0:
+            index += length
+
+        if not 0 <= index < length:
+            raise IndexError('DurationIndex index out of range')
+
+        last = self._blocks[-1]
+        if index >= length - len(last):
+            return len(self._blocks) - 1, index - (length - len(last))
+
+        position, before = _fenwick_search(self._counts, index)
+        return position, index - before
+
+    def _rebuild(self, values: Optional[array] = None) -> None:
+        if values is None:
+            values = array('q')
+            for block in self._blocks:
+                values.extend(block)
+
+        self._length = len(values)
+        self._total = sum(values)
+
+        size = self._block_size()
+        self._blocks = [values[i:i + size] for i in range(0, len(values), size)]
+        self._reindex()
+
+    def _reindex(self) -> None:
+        # Rebuilds the trees over the blocks, which is O(√n)
+        self._sums = _fenwick(sum(block) for block in self._blocks)
+        self._counts = _fenwick(len(block) for block in self._blocks)
+
+    def _update(self, position: int, delta: int, count: int) -> None:
+        if delta:
+            _fenwick_update(self._sums, position, delta)
+        if count:
+            _fenwick_update(self._counts, position, count)
+
+        self._total += delta
+        self._length += count
+
+    def _rebalance(self, position: int) -> None:
+        blocks = self._blocks
+        block = blocks[position]
+        size = self._block_size()
+
+        if len(block) > size * 2:
+            # Split evenly, so that no piece is left much smaller than the rest
+            count = len(block) // size
+            bounds = [len(block) * i // count for i in range(count + 1)]
+
+            blocks[position:position + 1] = [block[start:end] for start, end in zip(bounds, bounds[1:])]
+        elif not block:
+            del blocks[position]
+        elif len(block) < size // 4 and len(blocks) > 1:
+            if position + 1 < len(blocks):
+                block.extend(blocks.pop(position + 1))
+            else:
+                blocks[position - 1].extend(blocks.pop(position))
+        else:
+            return
+
+        self._reindex()
+
+    @property
+    def total(self) -> int:
+        """int: The sum of all lengths."""
+        return self._total
+
+    def prefix(self, index: int) -> int:
+        """Returns the sum of the lengths before the given index."""
+        if index <= 0:
+            return 0
+
+        if index >= self._length:
+            return self._total
+
+        position, offset = self._locate(index)
+        return _fenwick_prefix(self._sums, position) + sum(self._blocks[position][:offset])
+
+    def find(self, time: int) -> Optional[int]:
+        """Returns the index of the entry that covers the given time, or `None` if it is past the end."""
+        time = max(time, 0)
+        if time >= self._total:
+            return None
+
+        position, before = _fenwick_search(self._sums, time)
+        offset = bisect_right(list(accumulate(self._blocks[position])), time - before)
+
+        return _fenwick_prefix(self._counts, position) + offset
+
+    def append(self, length: int) -> None:
+        blocks = self._blocks
+
+        if not blocks or len(blocks[-1]) >= self._block_size() * 2:
+            blocks.append(array('q', [length]))
+            _fenwick_append(self._sums, length)
+            _fenwick_append(self._counts, 1)
+
+            self._total += length
+            self._length += 1
+            return
+
+        blocks[-1].append(length)
+        self._update(len(blocks) - 1, length, 1)
+
+    def appendleft(self, length: int) -> None:
+        self.insert(0, length)
+
+    def insert(self, index: int, length: int) -> None:
+        if index < 0:
+            index = max(index + self._length, 0)
+
+        if index >= self._length:
+            return self.append(length)
+
+        position, offset = self._locate(index)
+
+        self._blocks[position].insert(offset, length)
+        self._update(position, length, 1)
+        self._rebalance(position)
+
+    def extend(self, lengths: Iterable[int]) -> None:
+        lengths = array('q', lengths)
+
+        # Rebuilding is only cheaper than appending one by one if the batch dominates the index
+        if len(lengths) > self._length:
+            values = array('q')
+            for block in self._blocks:
+                values.extend(block)
+
+            values.extend(lengths)
+            return self._rebuild(values)
+
+        for length in lengths:
+            self.append(length)
+
+    def insert_many(self, index: int, lengths: Iterable[int]) -> None:
+        if index < 0:
+            index = max(index + self._length, 0)
+
+        if index >= self._length:
+            return self.extend(lengths)
+
+        lengths = array('q', lengths)
+        if not lengths:
+            return
+
+        position, offset = self._locate(index)
+        block = self._blocks[position]
+
+        block[offset:offset] = lengths
+        self._update(position, sum(lengths), len(lengths))
+        self._rebalance(position)
+
+    def set(self, index: int, length: int) -> None:
+        position, offset = self._locate(index)
+        block = self._blocks[position]
+
+        self._update(position, length - block[offset], 0)
+        block[offset] = length
+
+    def pop(self) -> int:
+        return self.remove(-1)
+
+    def popleft(self) -> int:
+        return self.remove(0)
+
+    def remove(self, index: int) -> int:
+        position, offset = self._locate(index)
+        block = self._blocks[position]
+        length = block.pop(offset)
+
+        self._update(position, -length, -1)
+
+        if not block and position == len(self._blocks) - 1:
+            # The last node of a Fenwick tree is never part of another node's range
+            self._blocks.pop()
+            self._sums.pop()
+            self._counts.pop()
+        else:
+            self._rebalance(position)
+
+        return length
+
+    def copy(self) -> DurationIndex:
+        return self.__class__(self)
+
+    def clear(self) -> None:
+        self._blocks = []
+        self._sums = array('q', [0])
+        self._counts = array('q', [0])
+        self._length = 0
+        self._total = 0
+
+
 class Queue(Iterable[Track]):
     """Utility queue class made only for Tracks and Playlists.
 
@@ -39,6 +379,11 @@ class Queue(Iterable[Track]):
         The maximum number of tracks that the queue can hold.
     cls: type, default: collections.deque
         The deque class to use for the internal queue.
+        See :class:`.BlockList` for faster membership checks and removal in large queues.
+
+    .. note::
+        The queue keeps a :class:`DurationIndex` of its tracks in sync.
+        Modifying :attr:`internal_queue` directly will bring it out of sync.
     """
 
     def __init__(
@@ -49,6 +394,8 @@ class Queue(Iterable[Track]):
     ) -> None:
         self.__max_size: Optional[int] = max_size
         self.__queue: deque = cls()
+        self.__durations: DurationIndex = DurationIndex()
+        self.__waiters: Deque[asyncio.Future] = deque()
 
     def __repr__(self) -> str:
         return f'<Queue tracks={self.count}>'
@@ -87,9 +434,15 @@ class Queue(Iterable[Track]):
 
     def __setitem__(self, index: int, item: Track) -> None:
         self.__queue[index] = item
+        self.__durations.set(index, _duration_of(item))
 
     def __delitem__(self, index: int) -> None:
+        if index < 0:
+            index += self.count
+
         del self.__queue[index]
+        self.__durations.remove(index)
+        self._removed([index])
 
     @property
     def internal_queue(self) -> deque:
@@ -101,6 +454,48 @@ class Queue(Iterable[Track]):
         """Optional[int]: The max size of the queue, passed into the class constructor."""
         return self.__max_size
 
+    @property
+    def durations(self) -> DurationIndex:
+        """:class:`DurationIndex`: The index of track lengths this queue keeps in sync."""
+        return self.__durations
+
+    @property
+    def duration(self) -> int:
+        """int: The total length of all tracks in the queue, in milliseconds. Streams count as zero."""
+        return self.__durations.total
+
+    def time_until(self, index: int) -> int:
+        """Returns how long until the track at the given index starts playing, in milliseconds.
+
+        This is the total length of the tracks before it.
+
+        Parameters
+        ----------
+        index: int
+            The index of the track.
+        """
+
+        if index < 0:
+            index += self.count
+
+        return self.__durations.prefix(index)
+
+    def index_at(self, time: int) -> Optional[int]:
+        """Returns the index of the track that will be playing after the given time.
+
+        Parameters
+        ----------
+        time: int
+            The time from now, in milliseconds.
+
+        Returns
+        -------
+        Optional[int]
+            The index, or `None` if the queue will have finished by then.
+        """
+
+        return self.__durations.find(time)
+
     @property
     def count(self) -> int:
         """int: The amount of tracks currently enqueued."""
@@ -113,10 +508,16 @@ class Queue(Iterable[Track]):
             return False
         return self.count >= self.max_size
 
-    def add(self, track: Union[Track, Playlist], *, left: bool = False) -> None:
+    @property
+    def waiters(self) -> int:
+        """int: The amount of :meth:`get_wait` calls currently waiting for a track."""
+        return sum(not waiter.done() for waiter in self.__waiters)
+
+    def add(self, track: Union[Track, Playlist], *, left: bool = False) -> Optional[ExtendResult]:
         """Adds a :class:`.Track` or :class:`.Playlist` to the queue.
 
         If a playlist is provided, the queue will extend from it's tracks.
+        See :meth:`Queue.extend` for what is returned in that case.
 
         Parameters
         ----------
@@ -127,13 +528,19 @@ class Queue(Iterable[Track]):
         """
 
         if isinstance(track, Playlist):
-            return self.extend(track.tracks)
+            return self.insert_many(0, track) if left else self.extend(track)
 
         if self.full:
             raise QueueFull(f'Could not add track {track.title!r} because the queue was full.')
 
-        method = self.__queue.appendleft if left else self.__queue.append
-        method(track)
+        if left:
+            self.__queue.appendleft(track)
+            self.__durations.appendleft(_duration_of(track))
+            self.__inserted(0, 1)
+        else:
+            self.__queue.append(track)
+            self.__durations.append(_duration_of(track))
+            self.__inserted(self.count - 1, 1)
 
     def set(self, index: int, new: Track) -> None:
         """Sets the track at the given index to the given track.
@@ -163,7 +570,48 @@ class Queue(Iterable[Track]):
         if isinstance(track_or_index, int):
             return self.__delitem__(track_or_index)
 
-        self.__queue.remove(track_or_index)
+        self.__delitem__(self.__queue.index(track_or_index))
+
+    def remove_where(self, predicate: Callable[[Track], bool]) -> int:
+        """Removes every track that matches the given predicate, in a single pass.
+
+        Example
+        -------
+
+        .. code:: py
+
+            queue.remove_where(lambda track: track.requester == member)
+
+        Parameters
+        ----------
+        predicate: Callable[[:class:`.Track`], bool]
+            Returns whether or not the given track should be removed.
+
+        Returns
+        -------
+        int
+            The amount of tracks removed.
+        """
+
+        return len(self._remove_where(predicate))
+
+    def _remove_where(self, predicate: Callable[[Track], bool]) -> List[int]:
+        removed = []
+        kept = []
+
+        for i, track in enumerate(self.__queue):
+            if predicate(track):
+                removed.append(i)
+            else:
+                kept.append(track)
+
+        if removed:
+            self.__queue.clear()
+            self.__queue.extend(kept)
+            self.__durations = DurationIndex(_duration_of(track) for track in kept)
+            self._removed(removed)
+
+        return removed
 
     def pop(self, index: int = 0) -> Track:
         """The rough equivalent of :meth:`Queue.remove` but is internally done differently.
@@ -183,10 +631,16 @@ class Queue(Iterable[Track]):
         """
 
         if index == 0:
-            return self.__queue.popleft()
+            track = self.__queue.popleft()
+            self.__durations.popleft()
+            self._removed([0])
+            return track
 
         if index == -1:
-            return self.__queue.pop()
+            track = self.__queue.pop()
+            self.__durations.pop()
+            self._removed([self.count])
+            return track
 
         _before = self.__queue[index]
         self.remove(index)
@@ -214,39 +668,216 @@ class Queue(Iterable[Track]):
 
         return self.get()
 
+    def _get_nowait(self) -> Optional[Track]:
+        """Returns the next track like :meth:`get`, or `None` if there is none yet."""
+        return self.get() if self else None
+
+    async def get_wait(self, *, timeout: Optional[float] = None) -> Track:
+        """Retrieves the next track like :meth:`get`, waiting for one to be added if there is none yet.
+
+        Waiting does not poll, waiters are woken up by :meth:`add`, :meth:`extend` and :meth:`insert`
+        in the order they started waiting.
+
+        Parameters
+        ----------
+        timeout: Optional[float]
+            How long, in seconds, to wait at most. If `None`, this waits indefinitely.
+
+        Returns
+        -------
+        :class:`.Track`
+            The track to play.
+
+        Raises
+        ------
+        asyncio.TimeoutError
+            No track was added in time.
+        """
+
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        track = self._get_nowait()
+
+        while track is None:
+            # Register before suspending, so that tracks added in the meantime always wake this waiter
+            waiter = loop.create_future()
+            self.__waiters.append(waiter)
+
+            try:
+                if deadline is None:
+                    await waiter
+                else:
+                    await asyncio.wait_for(waiter, max(deadline - loop.time(), 0))
+            except (asyncio.CancelledError, asyncio.TimeoutError):
+                waiter.cancel()
+
+                try:
+                    self.__waiters.remove(waiter)
+                except ValueError:
+                    pass
+
+                # Hand the wakeup over if this waiter was woken up but cancelled before getting a track
+                if not waiter.cancelled():
+                    self.__wake(1)
+
+                raise
+
+            track = self._get_nowait()
+
+        return track
+
+    def __wake(self, count: int) -> None:
+        waiters = self.__waiters
+
+        while waiters and count:
+            waiter = waiters.popleft()
+
+            if not waiter.done():
+                waiter.set_result(None)
+                count -= 1
+
     def insert(self, index: int, track: Union[Track, Playlist]) -> None:
         """Inserts a track at the given index.
 
+        If a playlist is provided, all of its tracks are inserted. See :meth:`Queue.insert_many`.
+
         Parameters
         ----------
         index: int
             The index to insert the track at.
-        track: :class:`.Track`
-            The track to insert.
+        track: Union[:class:`.Track`, :class:`.Playlist`]
+            The track or playlist to insert.
         """
 
         if isinstance(track, Playlist):
-            raise TypeError(f'Playlists are not supported for insertion as of now.')
+            self.insert_many(index, (track,))
+            return
 
         if self.full:
             raise QueueFull(f'Could not insert track {track.title!r} because the queue was full.')
 
+        count = self.count
+        index = min(max(index + count, 0) if index < 0 else index, count)
+
         self.__queue.insert(index, track)
+        self.__durations.insert(index, _duration_of(track))
+        self.__inserted(index, 1)
+
+    def _prepare_batch(self, tracks: Iterable[Union[Track, Playlist]], partial: bool) -> tuple:
+        items = [tracks] if isinstance(tracks, Playlist) else list(tracks)
+        total = sum(len(item) if isinstance(item, Playlist) else 1 for item in items)
+
+        if self.max_size is None:
+            space = total
+        else:
+            space = max(self.max_size - self.count, 0)
+
+        if total > space and not partial:
+            raise QueueFull(f'Could not add {total} tracks because the queue only had space for {space}.')
 
-    def extend(self, tracks: Iterable[Union[Track, Playlist]]) -> None:
+        taken = min(total, space)
+        batch = list(islice(_flatten(items), taken))
+
+        return batch, ExtendResult(added=taken, dropped=total - taken)
+
+    def extend(self, tracks: Iterable[Union[Track, Playlist]], *, partial: bool = False) -> ExtendResult:
         """Extends the queue by an iterable of :class:`.Track` .
 
-        Because this just called :meth:`Queue.add` for each track in the iterable,
-        :class:`.Playlist` will run this method recursively.
+        :class:`.Playlist` s in the iterable are expanded into their tracks.
+        Capacity is checked once for the whole batch, which is then added in a single operation.
 
         Parameters
         ----------
         tracks: Iterable[Union[:class:`.Track`, :class:`.Playlist`]]
             An iterable of tracks to add.
+        partial: bool, default: False
+            Whether or not to add as many tracks as fit if not all of them do,
+            rather than raising :exc:`QueueFull` without adding any.
+            Tracks of a playlist that don't fit are never built.
+
+        Returns
+        -------
+        :class:`ExtendResult`
+            How many tracks were added and dropped.
+
+        Raises
+        ------
+        QueueFull
+            Not all tracks fit into the queue and `partial` is `False`.
+
+        .. note::
+            Older versions added tracks one by one until the queue was full and only then raised :exc:`QueueFull`,
+            leaving the queue partially extended. Pass ``partial=True`` to fill the queue without raising instead.
         """
 
-        for track in tracks:
-            self.add(track)
+        batch, result = self._prepare_batch(tracks, partial)
+
+        if batch:
+            self.__queue.extend(batch)
+            self.__durations.extend(_duration_of(track) for track in batch)
+            self.__inserted(self.count - len(batch), len(batch))
+
+        return result
+
+    def insert_many(
+            self,
+            index: int,
+            tracks: Iterable[Union[Track, Playlist]],
+            *,
+            partial: bool = False
+    ) -> ExtendResult:
+        """Inserts multiple tracks at the given index, keeping their order.
+
+        This works like :meth:`Queue.extend`, but inserts the tracks rather than appending them.
+
+        Parameters
+        ----------
+        index: int
+            The index to insert the tracks at.
+        tracks: Iterable[Union[:class:`.Track`, :class:`.Playlist`]]
+            An iterable of tracks to insert.
+        partial: bool, default: False
+            Whether or not to insert as many tracks as fit if not all of them do,
+            rather than raising :exc:`QueueFull` without inserting any.
+
+        Returns
+        -------
+        :class:`ExtendResult`
+            How many tracks were inserted and dropped.
+
+        Raises
+        ------
+        QueueFull
+            Not all tracks fit into the queue and `partial` is `False`.
+        """
+
+        batch, result = self._prepare_batch(tracks, partial)
+        if not batch:
+            return result
+
+        count = self.count
+        if index < 0:
+            index = max(index + count, 0)
+
+        index = min(index, count)
+        queue = self.__queue
+
+        if index == count:
+            queue.extend(batch)
+        elif isinstance(queue, deque):
+            queue.rotate(-index)
+            queue.extendleft(reversed(batch))
+            queue.rotate(index)
+        elif hasattr(queue, 'insert_many'):
+            # e.g. BlockList and TrackStore, which splice the whole batch at once
+            queue.insert_many(index, batch)
+        else:
+            for offset, track in enumerate(batch):
+                queue.insert(index + offset, track)
+
+        self.__durations.insert_many(index, (_duration_of(track) for track in batch))
+        self.__inserted(index, len(batch))
+        return result
 
     def copy(self) -> Queue:
         """Copies this queue and returns a new queue with the same tracks.
@@ -259,6 +890,7 @@ class Queue(Iterable[Track]):
 
         new = self.__class__(self.max_size, cls=type(self.__queue))
         new.__queue = copy(self.__queue)
+        new.__durations = self.__durations.copy()
 
         return new
 
@@ -267,6 +899,133 @@ class Queue(Iterable[Track]):
         Clears this queue and removes all tracks.
         """
         self.__queue.clear()
+        self.__durations.clear()
+        self._cleared()
+
+    def snapshot(self) -> bytes:
+        """Serializes this queue into a compact, versioned binary format.
+
+        Track IDs are stored as raw bytes, along with the pointer, loop type,
+        history and shuffle state of a :class:`PointerBasedQueue`.
+        The contexts and requesters of tracks are not stored.
+
+        Returns
+        -------
+        bytes
+            The snapshot, which can be loaded again with :meth:`Queue.restore`.
+        """
+
+        flags, loop_type, pointer, history, unplayed = self._snapshot_state()
+        count = self.count
+
+        parts = [_SNAPSHOT_HEADER.pack(
+            _SNAPSHOT_MAGIC,
+            _SNAPSHOT_VERSION,
+            flags,
+            loop_type.value,
+            -1 if pointer is None else pointer,
+            count,
+            len(history)
+        )]
+
+        parts.extend(map(_pack_track, self.__queue))
+        parts.extend(map(_SNAPSHOT_INDEX.pack, history))
+
+        if unplayed is not None:
+            bitmap = bytearray((count + 7) // 8)
+            for i, value in enumerate(unplayed):
+                if value:
+                    bitmap[i >> 3] |= 1 << (i & 7)
+
+            parts.append(bytes(bitmap))
+
+        return b''.join(parts)
+
+    def restore(self, data: bytes, *, cls: type = Track, **kwargs) -> None:
+        """Replaces the tracks of this queue with the ones of a snapshot.
+
+        Tracks are rebuilt from their IDs locally, so this does not make any requests.
+
+        Parameters
+        ----------
+        data: bytes
+            The data returned by :meth:`Queue.snapshot`.
+        cls: type, default: :class:`.Track`
+            The class of the tracks.
+        kwargs
+            Extra keyword arguments to pass into the track class constructor, e.g. `ctx`.
+
+        Raises
+        ------
+        ValueError
+            The snapshot is malformed or was written by an unsupported version.
+        QueueFull
+            The snapshot has more tracks than the queue can hold.
+        """
+
+        reader = _SnapshotReader(data)
+        magic, version, flags, loop_type, pointer, count, history_size = reader.unpack(_SNAPSHOT_HEADER)
+
+        if magic != _SNAPSHOT_MAGIC:
+            raise ValueError('Not a queue snapshot.')
+
+        if version != _SNAPSHOT_VERSION:
+            raise ValueError(f'Unsupported queue snapshot version {version}.')
+
+        loop_type = LoopType(loop_type)
+        tracks = [_read_track(reader, cls, kwargs) for _ in range(count)]
+        history = [reader.unpack(_SNAPSHOT_INDEX)[0] for _ in range(history_size)]
+
+        unplayed = None
+        if flags & _SNAPSHOT_SHUFFLE:
+            bitmap = reader.take((count + 7) // 8)
+            unplayed = [bitmap[i >> 3] >> (i & 7) & 1 for i in range(count)]
+
+        reader.finish()
+
+        pointer = None if pointer < 0 else pointer
+        if pointer is not None and (pointer > count or pointer == count and not flags & _SNAPSHOT_EXHAUSTED):
+            raise ValueError('Queue snapshot has an invalid pointer.')
+
+        if any(index >= count for index in history):
+            raise ValueError('Queue snapshot has an invalid history.')
+
+        if self.max_size is not None and count > self.max_size:
+            raise QueueFull(f'Could not restore {count} tracks because the queue can only hold {self.max_size}.')
+
+        self.clear()
+        self.extend(tracks)
+        self._restore_state(flags, loop_type, pointer, history, unplayed)
+
+    def _snapshot_state(self) -> Tuple[int, LoopType, Optional[int], List[int], Optional[Iterable[int]]]:
+        """Returns the flags, loop type, pointer, history and unplayed flags to snapshot."""
+        return 0, LoopType.NONE, None, [], None
+
+    def _restore_state(
+            self,
+            flags: int,
+            loop_type: LoopType,
+            pointer: Optional[int],
+            history: List[int],
+            unplayed: Optional[List[int]]
+    ) -> None:
+        """Called after the tracks of a snapshot were restored."""
+
+    def __inserted(self, index: int, count: int) -> None:
+        self._inserted(index, count)
+        self.__wake(count)
+
+    def _inserted(self, index: int, count: int) -> None:
+        """Called after `count` tracks were inserted at `index`."""
+
+    def _removed(self, indices: List[int]) -> None:
+        """Called after the tracks at the given indices were removed.
+
+        The indices are sorted and refer to the positions before removal.
+        """
+
+    def _cleared(self) -> None:
+        """Called after the queue was cleared."""
 
     append = add
     put = add
@@ -278,6 +1037,21 @@ class PointerBasedQueue(Queue):
     """A certain type of queue that uses a pointer to point to a track in the queue, rather than popping tracks.
 
     This allows for looping, therefore it is also implemented in this class.
+
+    Tracks can also be played in a random order, see :meth:`PointerBasedQueue.set_shuffle`.
+    The order is drawn one track at a time, so only the part that is played is ever generated,
+    and the tracks themselves are never moved or copied.
+
+    Parameters
+    ----------
+    max_size: Optional[int]
+        The maximum number of tracks that the queue can hold.
+    cls: type, default: collections.deque
+        The deque class to use for the internal queue.
+    default_loop_type: :class:`LoopType`, default: :attr:`LoopType.NONE`
+        The loop type to start with.
+    history_size: int, default: 50
+        The maximum amount of previously played tracks to remember for :meth:`PointerBasedQueue.back`.
     """
 
     def __init__(
@@ -285,12 +1059,19 @@ class PointerBasedQueue(Queue):
             max_size: Optional[int] = None,
             *,
             cls: type = deque,
-            default_loop_type: LoopType = LoopType.NONE
+            default_loop_type: LoopType = LoopType.NONE,
+            history_size: int = 50
     ) -> None:
         super().__init__(max_size, cls=cls)
 
         self.__loop_type: LoopType = default_loop_type
         self.__current: Optional[int] = None
+        self.__exhausted: bool = False
+
+        self.__history: Deque[int] = deque(maxlen=history_size)
+
+        # Marks which tracks have not been played yet in the current shuffle, if shuffling
+        self.__unplayed: Optional[DurationIndex] = None
 
     @property
     def current(self) -> Track:
@@ -315,6 +1096,86 @@ class PointerBasedQueue(Queue):
     def loop_type(self, new: LoopType) -> None:
         self.set_loop_type(new)
 
+    @property
+    def shuffle(self) -> bool:
+        """bool: Whether or not tracks are played in a random order."""
+        return self.__unplayed is not None
+
+    @shuffle.setter
+    def shuffle(self, new: bool) -> None:
+        self.set_shuffle(new)
+
+    @property
+    def history(self) -> List[Track]:
+        """List[:class:`.Track`]: The previously played tracks, from oldest to newest."""
+        return [self[i] for i in self.__history]
+
+    @property
+    def previous(self) -> Optional[Track]:
+        """Optional[:class:`.Track`]: The track that was played before the current one, if any."""
+        return self[self.__history[-1]] if self.__history else None
+
+    def __point(self, index: int) -> None:
+        current = self.__current
+
+        if current is not None and current != index and not self.__exhausted:
+            self.__history.append(current)
+
+        self.__current = index
+        self.__exhausted = False
+
+        if self.__unplayed is not None:
+            self.__unplayed.set(index, 0)
+
+    def __next_index(self) -> Optional[int]:
+        count = self.count
+
+        if self.__unplayed is not None:
+            unplayed = self.__unplayed
+
+            if not unplayed.total:
+                if self.__loop_type is not LoopType.QUEUE or not count:
+                    return None
+
+                # The current track was just played, so the new order starts without it
+                self.reshuffle()
+                unplayed = self.__unplayed
+
+                if not unplayed.total:
+                    return self.__current
+
+            return unplayed.find(random.randrange(unplayed.total))
+
+        if self.__current is None:
+            index = 0
+        elif self.__exhausted:
+            index = self.__current
+        else:
+            index = self.__current + 1
+
+        if index < count:
+            return index
+
+        if self.__loop_type is LoopType.QUEUE and count:
+            return 0
+
+        return None
+
+    def __advance(self) -> Optional[Track]:
+        index = self.__next_index()
+
+        if index is None:
+            # Wait past the end, so that tracks added later are played next
+            if not self.__exhausted and self.__current is not None:
+                self.__history.append(self.__current)
+
+            self.__current = self.count
+            self.__exhausted = True
+            return None
+
+        self.__point(index)
+        return self.current
+
     def get(self) -> Optional[Track]:
         """Retrieves the next track in the queue.
 
@@ -325,20 +1186,15 @@ class PointerBasedQueue(Queue):
         See :meth:`PointerBasedQueue.skip` to skip the current track.
         """
 
-        if self.__current is None:
-            self.__current = 0
-
-        elif self.__loop_type is not LoopType.TRACK:
-            self.__current += 1
-
-        try:
+        if (
+            self.__loop_type is LoopType.TRACK
+            and self.__current is not None
+            and not self.__exhausted
+            and self.__current < self.count
+        ):
             return self.current
-        except IndexError:
-            if self.__loop_type is LoopType.QUEUE:
-                self.__current = 0
-                return self.current
 
-            return None
+        return self.__advance()
 
     def skip(self) -> Optional[Track]:
         """Skips the current track in the queue.
@@ -350,43 +1206,272 @@ class PointerBasedQueue(Queue):
         always skip the current track regardless of the LoopType.
         """
 
-        if self.__current is None:
-            self.__current = 0
-        else:
-            self.__current += 1
+        return self.__advance()
 
-        try:
-            return self.current
-        except IndexError:
-            if self.__loop_type is LoopType.QUEUE:
-                self.__current = 0
-                return self.current
+    def _get_nowait(self) -> Optional[Track]:
+        return self.get()
 
+    def back(self) -> Optional[Track]:
+        """Goes back to the previously played track.
+
+        Returns
+        -------
+        Optional[:class:`.Track`]
+            The previous track, or `None` if there is no history.
+        """
+
+        if not self.__history:
             return None
 
-    def remove(self, track_or_index: Union[int, Track]) -> None:
-        before = self.current
-        super().remove(track_or_index)
+        self.__current = self.__history.pop()
+        self.__exhausted = False
+        return self.current
 
-        if self.current != before:
-            self.__current -= 1
+    def remaining(self, position: int = 0) -> int:
+        """Returns the total length of the tracks left to play, in milliseconds.
 
-    def insert(self, index: int, track: Union[Track, Playlist]) -> None:
-        super().insert(index, track)
+        While shuffling, this is the rest of the current track plus every track not yet played
+        in the current random order, which takes O(n) rather than O(log n).
+
+        Parameters
+        ----------
+        position: int, default: 0
+            How far into the current track the player is, in milliseconds.
+        """
+
+        durations = self.durations
+        current = self.__current
+
+        if self.__unplayed is not None:
+            unplayed = self.__unplayed
+            total = sum(length for length, flag in zip(durations, unplayed) if flag)
+
+            if current is not None and not self.__exhausted and current < self.count:
+                total += max(durations[current] - position, 0)
+
+            return total
+
+        if current is None:
+            return durations.total
+
+        return max(durations.total - durations.prefix(current) - position, 0)
+
+    def time_until(self, index: int, *, position: int = 0) -> Optional[int]:
+        """Returns how long until the track at the given index starts playing, in milliseconds.
+
+        This accounts for the current track and, if the queue is looping, tracks before it.
+        While shuffling, the order of the tracks to come is unknown, so this
+        returns `None` for every track but the current one.
+
+        Parameters
+        ----------
+        index: int
+            The index of the track.
+        position: int, default: 0
+            How far into the current track the player is, in milliseconds.
+
+        Returns
+        -------
+        Optional[int]
+            The time until the track plays, or `None` if it will not be played
+            without skipping to it.
+        """
+
+        if index < 0:
+            index += self.count
+
+        current = self.__current
+        durations = self.durations
+
+        if current is None:
+            return durations.prefix(index)
+
+        if index == current:
+            return 0
+
+        if self.__loop_type is LoopType.TRACK or self.__unplayed is not None:
+            return None
+
+        if index > current:
+            return max(durations.prefix(index) - durations.prefix(current) - position, 0)
+
+        if self.__loop_type is LoopType.QUEUE:
+            return self.remaining(position) + durations.prefix(index)
+
+        return None
+
+    def index_at(self, time: int, *, position: int = 0) -> Optional[int]:
+        """Returns the index of the track that will be playing after the given time.
+
+        While shuffling, the order of the tracks to come is unknown, so this
+        returns `None` unless the current track is still playing by then.
+
+        Parameters
+        ----------
+        time: int
+            The time from now, in milliseconds.
+        position: int, default: 0
+            How far into the current track the player is, in milliseconds.
+
+        Returns
+        -------
+        Optional[int]
+            The index, or `None` if the queue will have finished by then,
+            or if it is unknown because the queue is shuffling.
+        """
 
-        if index <= self.__current:
-            self.__current += 1
+        current = self.__current
+        durations = self.durations
+
+        if self.__loop_type is LoopType.TRACK and current is not None and current < self.count:
+            return current
+
+        if self.__unplayed is not None:
+            if current is None or self.__exhausted or current >= self.count:
+                return None
+
+            return current if position + time < durations[current] else None
+
+        if current is None:
+            return durations.find(time)
+
+        target = durations.prefix(current) + position + time
+        index = durations.find(target)
+
+        if index is None and self.__loop_type is LoopType.QUEUE and durations.total:
+            index = durations.find((target - durations.total) % durations.total)
+
+        return index
 
     def jump(self, index: int) -> Track:
-        self.__current = index
+        if index < 0:
+            index += self.count
+
+        self[index]  # Raise IndexError before moving the pointer
+        self.__point(index)
         return self.current
 
     def reset(self) -> None:
         self.__current = None
+        self.__exhausted = False
+        self.__history.clear()
 
-    def clear(self) -> None:
-        self.__current = None
-        super().clear()
+        if self.__unplayed is not None:
+            self.reshuffle()
 
     def set_loop_type(self, new: LoopType) -> None:
         self.__loop_type = new
+
+    def set_shuffle(self, enabled: bool) -> None:
+        """Enables or disables playing tracks in a random order.
+
+        While shuffling, every track is played once in a random order before any is repeated.
+        With :attr:`LoopType.QUEUE`, a new random order is started once all tracks were played,
+        counting the track that was played last as already played in it.
+
+        Parameters
+        ----------
+        enabled: bool
+            Whether or not to shuffle.
+        """
+
+        if not enabled:
+            self.__unplayed = None
+        elif self.__unplayed is None:
+            self.reshuffle()
+
+    def reshuffle(self) -> None:
+        """Starts a new random order, in which every track but the current one is unplayed.
+
+        This also enables shuffling.
+        """
+
+        self.__unplayed = unplayed = DurationIndex(1 for _ in range(self.count))
+
+        if self.__current is not None and not self.__exhausted and self.__current < self.count:
+            unplayed.set(self.__current, 0)
+
+    def _inserted(self, index: int, count: int) -> None:
+        current = self.__current
+
+        if current is not None and (index < current or index == current and not self.__exhausted):
+            self.__current = current + count
+
+        history = self.__history
+
+        # Appending never moves a played track, so the history only needs updating for inserts before one
+        if history and index < self.count - count:
+            for position in range(len(history)):
+                if history[position] >= index:
+                    history[position] += count
+
+        if self.__unplayed is not None:
+            self.__unplayed.insert_many(index, (1 for _ in range(count)))
+
+    def _removed(self, indices: List[int]) -> None:
+        current = self.__current
+
+        if current is not None:
+            before = bisect_right(indices, current)
+
+            if self.__exhausted:
+                self.__current = current - before
+            elif before:
+                # Point at the track before the current one if the current one was removed
+                current -= before
+                self.__current = current if current >= 0 else None
+
+        if self.__history:
+            removed = set(indices)
+            self.__history = deque(
+                (i - bisect_left(indices, i) for i in self.__history if i not in removed),
+                maxlen=self.__history.maxlen
+            )
+
+        unplayed = self.__unplayed
+        if unplayed is not None:
+            if len(indices) == 1:
+                unplayed.remove(indices[0])
+            else:
+                removed = set(indices)
+                self.__unplayed = DurationIndex(
+                    flag for i, flag in enumerate(unplayed) if i not in removed
+                )
+
+    def _cleared(self) -> None:
+        self.__current = None
+        self.__exhausted = False
+        self.__history.clear()
+
+        if self.__unplayed is not None:
+            self.__unplayed = DurationIndex()
+
+    def _snapshot_state(self) -> Tuple[int, LoopType, Optional[int], List[int], Optional[Iterable[int]]]:
+        flags = 0
+        unplayed = None
+
+        if self.__exhausted:
+            flags |= _SNAPSHOT_EXHAUSTED
+
+        if self.__unplayed is not None:
+            flags |= _SNAPSHOT_SHUFFLE
+            unplayed = list(self.__unplayed)
+
+        return flags, self.__loop_type, self.__current, list(self.__history), unplayed
+
+    def _restore_state(
+            self,
+            flags: int,
+            loop_type: LoopType,
+            pointer: Optional[int],
+            history: List[int],
+            unplayed: Optional[List[int]]
+    ) -> None:
+        self.__loop_type = loop_type
+        self.__current = pointer
+        self.__exhausted = bool(flags & _SNAPSHOT_EXHAUSTED)
+
+        self.__history.clear()
+        self.__history.extend(history)
+
+        self.__unplayed = DurationIndex(unplayed) if unplayed is not None else None
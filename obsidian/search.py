@@ -1,11 +1,15 @@
+import time
+import asyncio
 import logging
 import contextlib
 
+from collections import deque
 from re import compile, Pattern
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple, Union
 
+from .cache import BaseTrackCache, SingleFlight
 from .track import Track, Playlist
-from .enums import Source, LoadType
+from .enums import Source, LoadType, RequestPriority
 from .errors import ObsidianSearchFailure, NoSearchMatchesFound
 
 from .spotify import SpotifyClient
@@ -16,6 +20,7 @@ SPOTIFY_MATCH_REGEX = SpotifyClient.URI_REGEX
 
 __all__: tuple = (
     'TrackSearcher',
+    'TrackStream'
 )
 
 __log__ = logging.getLogger('obsidian.node')
@@ -32,9 +37,30 @@ class _EmptyContextManager:
 class TrackSearcher:
     """
     Searches for tracks via URLs or queries.
+
+    If a cache is given, responses are cached by their sanitized identifier.
+    Concurrent loads of the same identifier are shared between all searchers.
+
+    If hedging is enabled and a load takes longer than the `hedge_percentile` of recent load times,
+    the same load is also sent to another node from the :class:`.NodePool`.
+    Whichever responds first is used, and the other request is cancelled.
+    Until enough load times are known, `hedge_delay` is used as the threshold instead.
     """
 
-    def __init__(self, node, *, url_match_regex: Union[Pattern, str] = None) -> None:
+    _flights: SingleFlight = SingleFlight()
+
+    MIN_HEDGE_SAMPLES: int = 20
+
+    def __init__(
+            self,
+            node,
+            *,
+            url_match_regex: Union[Pattern, str] = None,
+            cache: Optional[BaseTrackCache] = None,
+            hedge: bool = False,
+            hedge_percentile: float = 95,
+            hedge_delay: float = 1.0
+    ) -> None:
         from .node import BaseNode
 
         if isinstance(url_match_regex, str):
@@ -42,6 +68,14 @@ class TrackSearcher:
 
         self._node: BaseNode = node
         self._regex: Pattern = url_match_regex or DEFAULT_MATCH_REGEX
+        self._cache: Optional[BaseTrackCache] = cache
+
+        self.hedge: bool = hedge
+        self.hedge_percentile: float = hedge_percentile
+        self.hedge_delay: float = hedge_delay
+        self.hedged: int = 0
+
+        self.__latencies: Deque[float] = deque(maxlen=200)
 
     def __repr__(self) -> str:
         return f'<TrackSearcher node={self._node.identifier!r}>'
@@ -50,12 +84,110 @@ class TrackSearcher:
     def node(self):
         return self._node
 
+    @property
+    def cache(self) -> Optional[BaseTrackCache]:
+        return self._cache
+
+    @cache.setter
+    def cache(self, new: Optional[BaseTrackCache]) -> None:
+        self._cache = new
+
+    @property
+    def hedge_threshold(self) -> float:
+        """float: How long, in seconds, a load may take before it is hedged."""
+        if len(self.__latencies) < self.MIN_HEDGE_SAMPLES:
+            return self.hedge_delay
+
+        latencies = sorted(self.__latencies)
+        return latencies[min(len(latencies) - 1, int(len(latencies) * self.hedge_percentile / 100))]
+
     @property
     def _can_run_spotify(self) -> bool:
         return False  # Not Implemented
 
-    async def _execute(self, query: str) -> Dict[str, Any]:
-        return await self.node.http.load_tracks(query)
+    async def _cache_get(self, query: str) -> Optional[Dict[str, Any]]:
+        if self._cache is None:
+            return None
+
+        # A broken cache should only cost a request
+        try:
+            return await self._cache.get_async(query)
+        except Exception as exc:
+            __log__.warning(f'SEARCH | Cache lookup of {query!r} failed: {exc}')
+            return None
+
+    async def _cache_put(self, query: str, response: Dict[str, Any], *, negative: bool = False) -> None:
+        if self._cache is None:
+            return
+
+        try:
+            await self._cache.put_async(query, response, negative=negative)
+        except Exception as exc:
+            __log__.warning(f'SEARCH | Failed to cache {query!r}: {exc}')
+
+    async def _execute(self, query: str, priority: RequestPriority = RequestPriority.INTERACTIVE) -> Dict[str, Any]:
+        cached = await self._cache_get(query)
+        if cached is not None:
+            return cached
+
+        return await self._flights.do(query, lambda: self._load(query, priority))
+
+    async def _fetch(self, query: str, priority: RequestPriority = RequestPriority.INTERACTIVE) -> Dict[str, Any]:
+        start = time.monotonic()
+
+        try:
+            return await self.node.http.load_tracks(query, priority=priority)
+        finally:
+            # Slow loads that failed or were cancelled by hedging are the tail, so they must count too
+            self.__latencies.append(time.monotonic() - start)
+
+    async def _hedged_fetch(self, query: str, priority: RequestPriority = RequestPriority.INTERACTIVE) -> Dict[str, Any]:
+        from .pool import NodePool
+
+        primary = self.node.loop.create_task(self._fetch(query, priority))
+        tasks = [primary]
+
+        try:
+            done, _ = await asyncio.wait((primary,), timeout=self.hedge_threshold)
+
+            if done:
+                return primary.result()
+
+            node = NodePool.get_best_node(exclude=(self.node,))
+            if node is None:
+                return await primary
+
+            self.hedged += 1
+            __log__.debug(f'SEARCH | Load of {query!r} is slow on node {self.node.identifier!r}, hedging to {node.identifier!r}')
+
+            backup = self.node.loop.create_task(node.searcher._fetch(query, priority))
+            tasks.append(backup)
+            pending = {primary, backup}
+
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+
+            return primary.result()  # Both failed, raise the primary's exception
+        finally:
+            # Also reached if the caller is cancelled while waiting
+            for task in tasks:
+                task.cancel()
+
+    async def _load(self, query: str, priority: RequestPriority = RequestPriority.INTERACTIVE) -> Dict[str, Any]:
+        if self.hedge:
+            response = await self._hedged_fetch(query, priority)
+        else:
+            response = await self._fetch(query, priority)
+
+        load_type = response.get('load_type')
+        if load_type != LoadType.LOAD_FAILED.value:
+            await self._cache_put(query, response, negative=load_type == LoadType.NO_MATCHES.value)
+
+        return response
 
     def _sanitize_search(self, query: str, source: Optional[Source] = None) -> str:
         if self._regex.match(query) is None:
@@ -70,8 +202,15 @@ class TrackSearcher:
             query = query[1:-1]
         return query
 
-    async def _get_tracks(self, query: str, source: Optional[Source] = None, **kwargs) -> Tuple[Dict[str, Any], LoadType]:
-        response = await self._execute(self._sanitize_search(query, source))
+    async def _get_tracks(
+            self,
+            query: str,
+            source: Optional[Source] = None,
+            *,
+            priority: RequestPriority = RequestPriority.INTERACTIVE,
+            **kwargs
+    ) -> Tuple[Dict[str, Any], LoadType]:
+        response = await self._execute(self._sanitize_search(query, source), priority)
 
         load_type = LoadType(response['load_type'])
         message = f'SEARCH | Query {query!r} returned {load_type}: {response}'
@@ -94,6 +233,7 @@ class TrackSearcher:
             source: Optional[Source] = None,
             cls: type = Track,
             suppress: bool = True,
+            priority: RequestPriority = RequestPriority.INTERACTIVE,
             **kwargs
     ) -> Optional[Union[Track, Playlist]]:
         if suppress:
@@ -105,11 +245,10 @@ class TrackSearcher:
             if (source is Source.SPOTIFY or SPOTIFY_MATCH_REGEX.match(query)) and self._node.spotify:
                 return await self._node.spotify.search_track(query, suppress=suppress, cls=cls, **kwargs)
 
-            response, load_type = await self._get_tracks(query, source)
+            response, load_type = await self._get_tracks(query, source, priority=priority)
 
             if load_type is LoadType.PLAYLIST_LOADED:
-                info = response['playlist_info']
-                info['uri'] = query
+                info = {**response['playlist_info'], 'uri': query}
 
                 return Playlist(info=info, tracks=response['tracks'], cls=cls, **kwargs)
 
@@ -129,6 +268,7 @@ class TrackSearcher:
             cls: type = Track,
             suppress: bool = False,
             limit: Optional[int] = None,
+            priority: RequestPriority = RequestPriority.INTERACTIVE,
             **kwargs
     ) -> Optional[Union[List[Track], Playlist]]:
         if suppress:
@@ -140,11 +280,10 @@ class TrackSearcher:
             if (source is Source.SPOTIFY or SPOTIFY_MATCH_REGEX.match(query)) and self._node.spotify:
                 return await self._node.spotify.search_tracks(query, limit=limit, suppress=suppress, cls=cls, **kwargs)
 
-            response, load_type = await self._get_tracks(query, source)
+            response, load_type = await self._get_tracks(query, source, priority=priority)
 
             if load_type is LoadType.PLAYLIST_LOADED:
-                info = response['playlist_info']
-                info['uri'] = query
+                info = {**response['playlist_info'], 'uri': query}
 
                 return Playlist(info=info, tracks=response['tracks'], cls=cls, **kwargs)
 
@@ -158,3 +297,141 @@ class TrackSearcher:
                     tracks = tracks[:limit]
 
                 return tracks
+
+    def stream_tracks(
+            self,
+            query: str,
+            *,
+            source: Optional[Source] = None,
+            cls: type = Track,
+            limit: Optional[int] = None,
+            priority: RequestPriority = RequestPriority.INTERACTIVE,
+            **kwargs
+    ) -> 'TrackStream':
+        query = self._sanitize_search(query, source)
+        return TrackStream(self._stream_entries(query, priority), query, cls=cls, limit=limit, **kwargs)
+
+    async def _stream_entries(self, query: str, priority: RequestPriority) -> AsyncIterator[Tuple[str, Any]]:
+        cached = await self._cache_get(query)
+        if cached is not None:
+            entries = _iter_response(cached)
+        else:
+            entries = self.node.http.stream_load_tracks(query, priority=priority)
+
+        try:
+            async for entry in entries:
+                yield entry
+        finally:
+            await entries.aclose()
+
+
+class TrackStream:
+    """Tracks that are yielded as soon as they are received, see :meth:`.Node.stream_tracks`.
+
+    The response is held open until the stream is closed, so it must be used as an async context manager,
+    which closes it even if iteration stops early.
+
+    Example
+    -------
+
+    .. code:: py
+
+        async with node.stream_tracks(url) as stream:
+            async for track in stream:
+                player.queue.add(track)
+
+    Attributes
+    ----------
+    query: str
+        The sanitized query that was loaded.
+    playlist_info: Optional[Dict[str, Any]]
+        The info of the playlist that was loaded, if any.
+        This is set once it has been received, which may be after some or all tracks were yielded.
+    """
+
+    def __init__(
+            self,
+            entries: AsyncIterator[Tuple[str, Any]],
+            query: str,
+            *,
+            cls: type = Track,
+            limit: Optional[int] = None,
+            **kwargs
+    ) -> None:
+        self.query: str = query
+        self.playlist_info: Optional[Dict[str, Any]] = None
+
+        self.__entries: AsyncIterator[Tuple[str, Any]] = entries
+        self.__tracks: AsyncIterator[Track] = self.__iter_tracks(cls, limit, kwargs)
+        self.__entered: bool = False
+
+    def __repr__(self) -> str:
+        return f'<TrackStream query={self.query!r}>'
+
+    async def __aenter__(self) -> 'TrackStream':
+        self.__entered = True
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.aclose()
+
+    def __aiter__(self) -> 'TrackStream':
+        return self
+
+    async def __anext__(self) -> Track:
+        if not self.__entered:
+            await self.aclose()
+            raise RuntimeError('TrackStream must be used with \'async with\' so that its response is always closed.')
+
+        return await self.__tracks.__anext__()
+
+    async def aclose(self) -> None:
+        """|coro|
+
+        Closes the stream and its response. This is done automatically when exiting ``async with``.
+        """
+
+        await self.__tracks.aclose()
+
+    async def __iter_tracks(self, cls: type, limit: Optional[int], kwargs: Dict[str, Any]) -> AsyncIterator[Track]:
+        entries = self.__entries
+        query = self.query
+        yielded = 0
+        failed = False
+
+        try:
+            async for key, value in entries:
+                if key == 'track':
+                    yield cls(id=value['track'], info=value['info'], **kwargs)
+                    yielded += 1
+
+                    if limit is not None and yielded >= limit:
+                        return
+
+                elif key == 'playlist_info' and value:
+                    self.playlist_info = {**value, 'uri': query}
+
+                elif key == 'load_type':
+                    failed = value == LoadType.LOAD_FAILED.value
+
+                elif key == 'exception' and value:
+                    __log__.warning(f'SEARCH | Query {query!r} failed: {value}')
+                    raise ObsidianSearchFailure(value)
+        finally:
+            await entries.aclose()
+
+        if failed:
+            __log__.warning(f'SEARCH | Query {query!r} returned {LoadType.LOAD_FAILED}')
+            raise ObsidianSearchFailure(None)
+
+        if not yielded:
+            raise NoSearchMatchesFound(query)
+
+
+async def _iter_response(response: Dict[str, Any]) -> AsyncIterator[Tuple[str, Any]]:
+    for key, value in response.items():
+        if key == 'tracks':
+            for track in value:
+                yield 'track', track
+        else:
+            yield key, value
@@ -0,0 +1,283 @@
+import struct
+
+from base64 import b64decode, b64encode
+from binascii import Error as BinasciiError
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional
+
+from .codec import get_default_codec
+from .decoder import decode_track_bytes
+from .track import Track
+
+
+__all__: tuple = (
+    'PlayerState',
+    'dump_states',
+    'load_states'
+)
+
+_MAGIC: bytes = b'OBS'
+_VERSION: int = 1
+
+_HEADER = struct.Struct('>3sBI')
+_STATE = struct.Struct('>QQqB')
+_ENTRY = struct.Struct('>BI')
+_SIZE = struct.Struct('>I')
+
+# Track entry kinds
+_RAW_ID = 0
+_INFO = 1
+
+# Player state flags
+_PAUSED = 1
+_HAS_TRACK = 2
+_HAS_QUEUE = 4
+
+
+class _SnapshotReader:
+    __slots__ = ('data', 'offset')
+
+    def __init__(self, data: bytes) -> None:
+        self.data: bytes = data
+        self.offset: int = 0
+
+    def take(self, size: int) -> bytes:
+        start = self.offset
+        self.offset += size
+
+        if self.offset > len(self.data):
+            raise ValueError('Snapshot is truncated.')
+
+        return self.data[start:self.offset]
+
+    def unpack(self, fmt: struct.Struct) -> tuple:
+        start = self.offset
+        self.take(fmt.size)
+        return fmt.unpack_from(self.data, start)
+
+    def finish(self) -> None:
+        if self.offset != len(self.data):
+            raise ValueError('Unexpected data after the end of the snapshot.')
+
+
+def _pack_track(track: Track) -> bytes:
+    try:
+        payload = b64decode(track.id, validate=True)
+        decode_track_bytes(payload)
+        kind = _RAW_ID
+    except (BinasciiError, ValueError):
+        # Tracks the local decoder can't rebuild, such as Spotify tracks, keep their info instead
+        payload = get_default_codec().dumps({'track': track.id, 'info': track.info.to_raw()}).encode('utf-8')
+        kind = _INFO
+
+    return _ENTRY.pack(kind, len(payload)) + payload
+
+
+def _read_track(reader: _SnapshotReader, cls: type, kwargs: Dict[str, Any]) -> Track:
+    kind, size = reader.unpack(_ENTRY)
+    payload = reader.take(size)
+
+    if kind == _RAW_ID:
+        return cls(id=b64encode(payload).decode('ascii'), info=decode_track_bytes(payload), **kwargs)
+
+    if kind == _INFO:
+        raw = get_default_codec().loads(payload)
+        return cls(id=raw['track'], info=raw['info'], **kwargs)
+
+    raise ValueError(f'Unknown track entry kind {kind}.')
+
+
+class PlayerState:
+    """The state of a player that can be saved and restored later, e.g. across restarts.
+
+    See :meth:`.Player.export_state` and :meth:`.Player.import_state`.
+
+    Attributes
+    ----------
+    guild_id: int
+        The ID of the guild of the player.
+    channel_id: Optional[int]
+        The ID of the voice channel the player was connected to, if any.
+    track: Optional[:class:`.Track`]
+        The track that was playing, if any.
+    position: int
+        The position, in milliseconds, of the track that was playing.
+    paused: bool
+        Whether or not the player was paused.
+    filters: Dict[str, Any]
+        The raw payloads of the filters the player was using, keyed by their identifier.
+    queue: Optional[bytes]
+        The :meth:`.Queue.snapshot` of the player's queue, if it has one.
+    """
+
+    __slots__: tuple = (
+        'guild_id',
+        'channel_id',
+        'track',
+        'position',
+        'paused',
+        'filters',
+        'queue'
+    )
+
+    def __init__(
+            self,
+            *,
+            guild_id: int,
+            channel_id: Optional[int] = None,
+            track: Optional[Track] = None,
+            position: int = 0,
+            paused: bool = False,
+            filters: Optional[Dict[str, Any]] = None,
+            queue: Optional[bytes] = None
+    ) -> None:
+        self.guild_id: int = guild_id
+        self.channel_id: Optional[int] = channel_id
+        self.track: Optional[Track] = track
+        self.position: int = position
+        self.paused: bool = paused
+        self.filters: Dict[str, Any] = filters or {}
+        self.queue: Optional[bytes] = queue
+
+    def __repr__(self) -> str:
+        return f'<PlayerState guild_id={self.guild_id} track={self.track!r} position={self.position}>'
+
+    def to_bytes(self) -> bytes:
+        """Serializes this state into its binary format."""
+        flags = 0
+        if self.paused:
+            flags |= _PAUSED
+        if self.track is not None:
+            flags |= _HAS_TRACK
+        if self.queue is not None:
+            flags |= _HAS_QUEUE
+
+        parts = [_STATE.pack(self.guild_id, self.channel_id or 0, int(self.position), flags)]
+
+        if self.track is not None:
+            parts.append(_pack_track(self.track))
+
+        filters = get_default_codec().dumps(self.filters).encode('utf-8') if self.filters else b''
+        parts.append(_SIZE.pack(len(filters)))
+        parts.append(filters)
+
+        if self.queue is not None:
+            parts.append(_SIZE.pack(len(self.queue)))
+            parts.append(self.queue)
+
+        return b''.join(parts)
+
+    @classmethod
+    def _read(cls, reader: _SnapshotReader, track_cls: type, kwargs: Dict[str, Any]) -> 'PlayerState':
+        guild_id, channel_id, position, flags = reader.unpack(_STATE)
+        track = _read_track(reader, track_cls, kwargs) if flags & _HAS_TRACK else None
+
+        filters = reader.take(reader.unpack(_SIZE)[0])
+        queue = reader.take(reader.unpack(_SIZE)[0]) if flags & _HAS_QUEUE else None
+
+        return cls(
+            guild_id=guild_id,
+            channel_id=channel_id or None,
+            track=track,
+            position=position,
+            paused=bool(flags & _PAUSED),
+            filters=get_default_codec().loads(filters) if filters else {},
+            queue=queue
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes, *, track_cls: type = Track, **kwargs) -> 'PlayerState':
+        """Deserializes a state from its binary format.
+
+        Parameters
+        ----------
+        data: bytes
+            The data returned by :meth:`PlayerState.to_bytes`.
+        track_cls: type, default: :class:`.Track`
+            The class of the current track.
+        kwargs
+            Extra keyword arguments to pass into the track class constructor.
+
+        Raises
+        ------
+        ValueError
+            The data is malformed.
+        """
+
+        reader = _SnapshotReader(data)
+        state = cls._read(reader, track_cls, kwargs)
+        reader.finish()
+        return state
+
+
+def dump_states(states: Iterable[PlayerState], fp: BinaryIO) -> int:
+    """Writes the states of many players into a binary file at once.
+
+    No network requests are needed to load them again, track IDs are stored as raw bytes.
+
+    Example
+    -------
+
+    .. code:: py
+
+        with open('players.bin', 'wb') as fp:
+            obsidian.dump_states((player.export_state() for player in node.players.values()), fp)
+
+    Parameters
+    ----------
+    states: Iterable[:class:`PlayerState`]
+        The states to write.
+    fp
+        The binary file-like object to write to.
+
+    Returns
+    -------
+    int
+        The amount of states written.
+    """
+
+    records = [state.to_bytes() for state in states]
+
+    fp.write(_HEADER.pack(_MAGIC, _VERSION, len(records)))
+    fp.write(b''.join(records))
+
+    return len(records)
+
+
+def load_states(fp: BinaryIO, *, cls: type = Track, **kwargs) -> List[PlayerState]:
+    """Reads the states written by :func:`dump_states`.
+
+    This does not make any requests.
+
+    Parameters
+    ----------
+    fp
+        The binary file-like object to read from.
+    cls: type, default: :class:`.Track`
+        The class of the current tracks.
+    kwargs
+        Extra keyword arguments to pass into the track class constructor.
+
+    Returns
+    -------
+    List[:class:`PlayerState`]
+        The states, in the order they were written.
+
+    Raises
+    ------
+    ValueError
+        The file is malformed or was written by an unsupported version.
+    """
+
+    reader = _SnapshotReader(fp.read())
+    magic, version, count = reader.unpack(_HEADER)
+
+    if magic != _MAGIC:
+        raise ValueError('Not a player state file.')
+
+    if version != _VERSION:
+        raise ValueError(f'Unsupported player state version {version}.')
+
+    states = [PlayerState._read(reader, cls, kwargs) for _ in range(count)]
+    reader.finish()
+
+    return states
@@ -1,4 +1,4 @@
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 
 __all__: tuple = (
@@ -60,5 +60,13 @@ class Stats:
         self.players_active = players.get('active')
         self.players_total = players.get('total')
 
+    @property
+    def heap_usage(self) -> Optional[float]:
+        """Optional[float]: The fraction of the maximum heap size that is currently used, if known."""
+        if not self.heap_used_max or self.heap_used_used is None:
+            return None
+
+        return self.heap_used_used / self.heap_used_max
+
     def __repr__(self) -> str:
         return f'<Stats total_players={self.players_total} playing_active={self.players_active}>'
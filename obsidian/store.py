@@ -0,0 +1,988 @@
+from __future__ import annotations
+
+from array import array
+from base64 import b64decode, b64encode
+from binascii import Error as BinasciiError
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .enums import Source
+from .track import Track, TrackInfo, _is_track_id
+
+
+__all__: tuple = (
+    'TrackStore',
+    'BlockList'
+)
+
+_SOURCES: Tuple[Source, ...] = tuple(Source)
+_SOURCE_INDICES: Dict[Source, int] = {source: i for i, source in enumerate(_SOURCES)}
+
+_STREAM = 1
+_SEEKABLE = 2
+
+# Compact the columns once this many popped rows have piled up at the front
+_COMPACT_THRESHOLD = 1024
+
+
+class _InternTable:
+    __slots__ = ('values', 'indices', 'refs', 'free')
+
+    def __init__(self) -> None:
+        self.values: List[Any] = []
+        self.indices: Dict[Hashable, int] = {}
+        self.refs: List[int] = []
+        self.free: List[int] = []
+
+    def add(self, value: Any, key: Hashable) -> int:
+        index = self.indices.get(key)
+
+        if index is None:
+            if self.free:
+                index = self.free.pop()
+                self.values[index] = value
+                self.refs[index] = 0
+            else:
+                index = len(self.values)
+                self.values.append(value)
+                self.refs.append(0)
+
+            self.indices[key] = index
+
+        self.refs[index] += 1
+        return index
+
+    def release(self, index: int, key: Hashable) -> None:
+        self.refs[index] -= 1
+
+        if not self.refs[index]:
+            del self.indices[key]
+            self.values[index] = None
+            self.free.append(index)
+
+    def clear(self) -> None:
+        self.values.clear()
+        self.indices.clear()
+        self.refs.clear()
+        self.free.clear()
+
+
+# Kinds of values in a string column
+_NONE = 0
+_TEXT = 1
+_BYTES = 2
+
+# Compact a string heap once this many bytes of it are unused
+_HEAP_COMPACT_THRESHOLD = 1 << 16
+
+
+class _StringHeap:
+    # The buffer shared by the string columns of a store
+    __slots__ = ('buffer', 'garbage', 'columns')
+
+    def __init__(self) -> None:
+        self.buffer: bytearray = bytearray()
+        self.garbage: int = 0
+        self.columns: List[_StringColumn] = []
+
+    def discard(self, size: int) -> None:
+        self.garbage += size
+
+        if self.garbage >= _HEAP_COMPACT_THRESHOLD and self.garbage * 2 >= len(self.buffer):
+            self.compact()
+
+    def compact(self) -> None:
+        view = memoryview(self.buffer)
+        buffer = bytearray()
+
+        for column in self.columns:
+            starts, sizes = column.starts, column.sizes
+
+            for i, (start, size) in enumerate(zip(starts, sizes)):
+                starts[i] = len(buffer)
+                buffer += view[start:start + size]
+
+        view.release()
+        self.buffer = buffer
+        self.garbage = 0
+
+    def clear(self) -> None:
+        self.buffer = bytearray()
+        self.garbage = 0
+
+
+class _StringColumn:
+    # A list-like column of strings, bytes or None, kept in a shared heap rather than as objects
+    __slots__ = ('heap', 'kinds', 'starts', 'sizes')
+
+    def __init__(self, heap: _StringHeap) -> None:
+        self.heap: _StringHeap = heap
+        self.kinds: array = array('B')
+        self.starts: array = array('Q')
+        self.sizes: array = array('I')
+
+        heap.columns.append(self)
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def __getitem__(self, index: int) -> Union[bytes, str, None]:
+        kind = self.kinds[index]
+        if kind == _NONE:
+            return None
+
+        start = self.starts[index]
+        data = bytes(self.heap.buffer[start:start + self.sizes[index]])
+
+        return data.decode('utf-8') if kind == _TEXT else data
+
+    def __setitem__(self, index: Union[int, slice], value: Any) -> None:
+        if isinstance(index, slice):
+            start, stop, _ = index.indices(len(self))
+            del self[start:stop]
+            self.insert_many(start, value)
+            return
+
+        self.heap.discard(self.sizes[index])
+        self.kinds[index], self.starts[index], self.sizes[index] = self.__store(value)
+
+    def __delitem__(self, index: Union[int, slice]) -> None:
+        sizes = self.sizes
+        removed = sum(sizes[index]) if isinstance(index, slice) else sizes[index]
+
+        del self.kinds[index]
+        del self.starts[index]
+        del sizes[index]
+
+        self.heap.discard(removed)
+
+    def __store(self, value: Union[bytes, str, None]) -> Tuple[int, int, int]:
+        if value is None:
+            return _NONE, 0, 0
+
+        if isinstance(value, str):
+            kind, data = _TEXT, value.encode('utf-8')
+        else:
+            kind, data = _BYTES, value
+
+        buffer = self.heap.buffer
+        start = len(buffer)
+        buffer += data
+
+        return kind, start, len(data)
+
+    def equals(self, index: int, value: Union[bytes, str, None]) -> bool:
+        kind = self.kinds[index]
+
+        if value is None or kind == _NONE:
+            return value is None and kind == _NONE
+
+        if isinstance(value, str):
+            if kind != _TEXT:
+                return False
+            value = value.encode('utf-8')
+        elif kind != _BYTES:
+            return False
+
+        size = self.sizes[index]
+        if size != len(value):
+            return False
+
+        start = self.starts[index]
+        return self.heap.buffer[start:start + size] == value
+
+    def append(self, value: Union[bytes, str, None]) -> None:
+        kind, start, size = self.__store(value)
+
+        self.kinds.append(kind)
+        self.starts.append(start)
+        self.sizes.append(size)
+
+    def insert(self, index: int, value: Union[bytes, str, None]) -> None:
+        kind, start, size = self.__store(value)
+
+        self.kinds.insert(index, kind)
+        self.starts.insert(index, start)
+        self.sizes.insert(index, size)
+
+    def insert_many(self, index: int, values: Iterable[Union[bytes, str, None]]) -> None:
+        kinds, starts, sizes = array('B'), array('Q'), array('I')
+
+        for value in values:
+            kind, start, size = self.__store(value)
+            kinds.append(kind)
+            starts.append(start)
+            sizes.append(size)
+
+        self.kinds[index:index] = kinds
+        self.starts[index:index] = starts
+        self.sizes[index:index] = sizes
+
+    def extend(self, values: Iterable[Union[bytes, str, None]]) -> None:
+        self.insert_many(len(self), values)
+
+
+def _encode_id(id: str) -> Union[bytes, str]:
+    try:
+        return b64decode(id, validate=True)
+    except (BinasciiError, ValueError):
+        return id
+
+
+def _decode_id(raw: Union[bytes, str]) -> str:
+    if isinstance(raw, bytes):
+        return b64encode(raw).decode('ascii')
+
+    return raw
+
+
+def _context_key(pair: Tuple[Any, Any]) -> Tuple[int, int]:
+    return id(pair[0]), id(pair[1])
+
+
+class TrackStore:
+    """A compact, deque-like container of tracks.
+
+    Rather than keeping a :class:`.Track` object per entry, track fields are kept in columns:
+    IDs as raw bytes and titles, URIs, identifiers and thumbnails as UTF-8, all packed into one buffer
+    that :class:`array.array` s of offsets point into, numbers and flags in :class:`array.array` s,
+    and authors, sources, contexts, requesters and track classes interned so that repeated values
+    are only stored once.
+
+    Tracks are built again from these columns whenever they are accessed,
+    so the same entry may be returned as a different object each time.
+    Membership checks and removal by track therefore compare track IDs rather than identity.
+    Tracks with placeholder IDs, such as Spotify tracks, are compared by their metadata as well.
+
+    .. note::
+        Only the attributes of :class:`.Track` are kept. Subclasses are rebuilt
+        without calling their `__init__`, so any extra attributes they set are lost.
+
+    This can be used as the backing storage of a queue:
+
+    .. code:: py
+
+        queue = PointerBasedQueue(cls=TrackStore)
+
+    Parameters
+    ----------
+    tracks: Iterable[:class:`.Track`]
+        The tracks to initially store.
+    """
+
+    def __init__(self, tracks: Iterable[Track] = ()) -> None:
+        self.__head: int = 0
+
+        self.__heap: _StringHeap = _StringHeap()
+
+        self.__ids: _StringColumn = _StringColumn(self.__heap)
+        self.__titles: _StringColumn = _StringColumn(self.__heap)
+        self.__uris: _StringColumn = _StringColumn(self.__heap)
+        self.__identifiers: _StringColumn = _StringColumn(self.__heap)
+        self.__thumbnails: _StringColumn = _StringColumn(self.__heap)
+        self.__lengths: array = array('q')
+        self.__positions: array = array('q')
+        self.__flags: array = array('B')
+        self.__sources: array = array('B')
+        self.__authors: array = array('I')
+        self.__contexts: array = array('I')
+        self.__classes: array = array('I')
+
+        self.__columns: tuple = (
+            self.__ids,
+            self.__titles,
+            self.__uris,
+            self.__identifiers,
+            self.__thumbnails,
+            self.__lengths,
+            self.__positions,
+            self.__flags,
+            self.__sources,
+            self.__authors,
+            self.__contexts,
+            self.__classes
+        )
+
+        self.__author_table: _InternTable = _InternTable()
+        self.__context_table: _InternTable = _InternTable()
+        self.__class_table: _InternTable = _InternTable()
+
+        self.extend(tracks)
+
+    def __repr__(self) -> str:
+        return f'<TrackStore tracks={len(self)}>'
+
+    def __len__(self) -> int:
+        return len(self.__ids) - self.__head
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __iter__(self) -> Iterator[Track]:
+        for i in range(self.__head, len(self.__ids)):
+            yield self.__build(i)
+
+    def __reversed__(self) -> Iterator[Track]:
+        for i in range(len(self.__ids) - 1, self.__head - 1, -1):
+            yield self.__build(i)
+
+    def __contains__(self, track: Track) -> bool:
+        return self.__find(track) is not None
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Track, List[Track]]:
+        if isinstance(index, slice):
+            return [self.__build(self.__head + i) for i in range(*index.indices(len(self)))]
+
+        return self.__build(self.__physical(index))
+
+    def __setitem__(self, index: int, track: Track) -> None:
+        physical = self.__physical(index)
+        row = self.__row(track)
+
+        self.__release(physical)
+        for column, value in zip(self.__columns, row):
+            column[physical] = value
+
+    def __delitem__(self, index: int) -> None:
+        physical = self.__physical(index)
+
+        if physical == self.__head:
+            self.popleft()
+            return
+
+        self.__release(physical)
+        for column in self.__columns:
+            del column[physical]
+
+    def __copy__(self) -> TrackStore:
+        return self.copy()
+
+    def __physical(self, index: int) -> int:
+        length = len(self)
+
+        if index < 0:
+            index += length
+
+        if not 0 <= index < length:
+            raise IndexError('TrackStore index out of range')
+
+        return self.__head + index
+
+    def __row(self, track: Track) -> tuple:
+        info = track._info
+
+        flags = 0
+        if info.is_stream:
+            flags |= _STREAM
+        if info.is_seekable:
+            flags |= _SEEKABLE
+
+        context = track._ctx, track._requester
+        cls = type(track)
+
+        return (
+            _encode_id(track._id),
+            info.title,
+            info.uri,
+            info.identifier,
+            info.thumbnail,
+            info.length,
+            info.position,
+            flags,
+            _SOURCE_INDICES[info.source],
+            self.__author_table.add(info.author, info.author),
+            self.__context_table.add(context, _context_key(context)),
+            self.__class_table.add(cls, cls)
+        )
+
+    def __release(self, physical: int) -> None:
+        author = self.__authors[physical]
+        self.__author_table.release(author, self.__author_table.values[author])
+
+        context = self.__contexts[physical]
+        self.__context_table.release(context, _context_key(self.__context_table.values[context]))
+
+        cls = self.__classes[physical]
+        self.__class_table.release(cls, self.__class_table.values[cls])
+
+    def __build(self, physical: int) -> Track:
+        cls = self.__class_table.values[self.__classes[physical]]
+        ctx, requester = self.__context_table.values[self.__contexts[physical]]
+        id = _decode_id(self.__ids[physical])
+
+        info = TrackInfo._interned.get(id) if cls.INTERN_INFO else None
+
+        if info is None:
+            flags = self.__flags[physical]
+
+            info = TrackInfo._from_fields(
+                self.__titles[physical],
+                self.__author_table.values[self.__authors[physical]],
+                self.__uris[physical],
+                self.__identifiers[physical],
+                self.__lengths[physical],
+                self.__positions[physical],
+                bool(flags & _STREAM),
+                bool(flags & _SEEKABLE),
+                _SOURCES[self.__sources[physical]],
+                self.__thumbnails[physical]
+            )
+
+            if cls.INTERN_INFO and isinstance(self.__ids[physical], bytes) and _is_track_id(id):
+                TrackInfo._interned[id] = info
+
+        track = cls.__new__(cls)
+        track._id = id
+        track._ctx = ctx
+        track._requester = requester
+        track._info = info
+
+        return track
+
+    def __find(self, track: Track) -> Optional[int]:
+        raw = _encode_id(track.id)
+        ids = self.__ids
+
+        if _is_track_id(track.id):
+            for i in range(self.__head, len(ids)):
+                if ids.equals(i, raw):
+                    return i
+
+            return None
+
+        # Placeholder IDs are shared by unrelated tracks
+        info = track.info
+
+        for i in range(self.__head, len(ids)):
+            if (
+                ids.equals(i, raw)
+                and self.__lengths[i] == info.length
+                and self.__titles.equals(i, info.title)
+                and self.__uris.equals(i, info.uri)
+                and self.__identifiers.equals(i, info.identifier)
+            ):
+                return i
+
+        return None
+
+    def __compact(self) -> None:
+        head = self.__head
+        if head < _COMPACT_THRESHOLD or head * 2 < len(self.__ids):
+            return
+
+        for column in self.__columns:
+            del column[:head]
+
+        self.__head = 0
+
+    def append(self, track: Track) -> None:
+        """Adds a track to the end of the store."""
+        for column, value in zip(self.__columns, self.__row(track)):
+            column.append(value)
+
+    def appendleft(self, track: Track) -> None:
+        """Adds a track to the beginning of the store."""
+        self.insert(0, track)
+
+    def insert(self, index: int, track: Track) -> None:
+        """Inserts a track before the given index."""
+        length = len(self)
+
+        if index < 0:
+            index = max(index + length, 0)
+
+        physical = self.__head + min(index, length)
+        row = self.__row(track)
+
+        if physical and physical == self.__head:
+            # Reuse a popped slot at the front
+            physical = self.__head = physical - 1
+            for column, value in zip(self.__columns, row):
+                column[physical] = value
+            return
+
+        for column, value in zip(self.__columns, row):
+            column.insert(physical, value)
+
+    def insert_many(self, index: int, tracks: Iterable[Track]) -> None:
+        """Inserts multiple tracks before the given index, keeping their order.
+
+        Each column is spliced once for the whole batch.
+        """
+
+        rows = [self.__row(track) for track in tracks]
+        if not rows:
+            return
+
+        length = len(self)
+        if index < 0:
+            index = max(index + length, 0)
+
+        physical = self.__head + min(index, length)
+
+        for column, values in zip(self.__columns, zip(*rows)):
+            column[physical:physical] = array(column.typecode, values) if isinstance(column, array) else values
+
+    def extend(self, tracks: Iterable[Track]) -> None:
+        """Adds multiple tracks to the end of the store.
+
+        If another :class:`TrackStore` is given, its columns are copied without building any tracks.
+        """
+
+        if isinstance(tracks, TrackStore):
+            tracks = list(tracks) if tracks is self else tracks
+
+            if isinstance(tracks, TrackStore):
+                self.__extend_from(tracks)
+                return
+
+        rows = [self.__row(track) for track in tracks]
+
+        # Each column is extended once for the whole batch
+        for column, values in zip(self.__columns, zip(*rows)):
+            column.extend(values)
+
+    def __extend_from(self, other: TrackStore) -> None:
+        rows = range(other.__head, len(other.__ids))
+
+        for column, source in zip(self.__columns[:9], other.__columns[:9]):
+            column.extend([source[i] for i in rows] if isinstance(source, _StringColumn) else source[rows.start:])
+
+        authors, contexts, classes = other.__author_table.values, other.__context_table.values, other.__class_table.values
+
+        for i in rows:
+            author = authors[other.__authors[i]]
+            context = contexts[other.__contexts[i]]
+            cls = classes[other.__classes[i]]
+
+            self.__authors.append(self.__author_table.add(author, author))
+            self.__contexts.append(self.__context_table.add(context, _context_key(context)))
+            self.__classes.append(self.__class_table.add(cls, cls))
+
+    def pop(self) -> Track:
+        """Removes and returns the last track."""
+        if not self:
+            raise IndexError('pop from an empty TrackStore')
+
+        physical = len(self.__ids) - 1
+        track = self.__build(physical)
+
+        self.__release(physical)
+        for column in self.__columns:
+            del column[physical]
+
+        return track
+
+    def popleft(self) -> Track:
+        """Removes and returns the first track."""
+        if not self:
+            raise IndexError('pop from an empty TrackStore')
+
+        physical = self.__head
+        track = self.__build(physical)
+
+        self.__release(physical)
+        self.__ids[physical] = None
+        self.__titles[physical] = self.__uris[physical] = None
+        self.__identifiers[physical] = self.__thumbnails[physical] = None
+
+        self.__head += 1
+        if self.__head == len(self.__ids):
+            self.clear()
+        else:
+            self.__compact()
+
+        return track
+
+    def remove(self, track: Track) -> None:
+        """Removes the first track with the same ID as the given track.
+
+        Raises
+        ------
+        ValueError
+            No such track is stored.
+        """
+
+        physical = self.__find(track)
+        if physical is None:
+            raise ValueError('TrackStore.remove(x): x not in store')
+
+        del self[physical - self.__head]
+
+    def index(self, track: Track) -> int:
+        """Returns the index of the first track with the same ID as the given track.
+
+        Raises
+        ------
+        ValueError
+            No such track is stored.
+        """
+
+        physical = self.__find(track)
+        if physical is None:
+            raise ValueError('TrackStore.index(x): x not in store')
+
+        return physical - self.__head
+
+    def copy(self) -> TrackStore:
+        """Returns a shallow copy of this store."""
+        new = self.__class__()
+        new.extend(self)
+        return new
+
+    def clear(self) -> None:
+        """Removes all tracks."""
+        for column in self.__columns:
+            del column[:]
+
+        self.__head = 0
+        self.__heap.clear()
+        self.__author_table.clear()
+        self.__context_table.clear()
+        self.__class_table.clear()
+
+    def append_raw(
+            self,
+            id: str,
+            info: Dict[str, Any],
+            *,
+            cls: type = Track,
+            ctx: Any = None,
+            requester: Any = None
+    ) -> None:
+        """Adds a track from its raw payload, without calling the `__init__` of the track class.
+
+        Parameters
+        ----------
+        id: str
+            The Base 64 track ID.
+        info: Dict[str, Any]
+            The track info returned by Obsidian.
+        cls: type, default: :class:`.Track`
+            The class to build the track as when it is accessed.
+        ctx: Optional[:class:`~discord.ext.commands.Context`]
+            The context that requested the track.
+        requester: Optional[:class:`discord.Member`]
+            The member that requested the track.
+        """
+
+        track = cls.__new__(cls)
+        track._id = id
+        track._ctx = ctx
+        track._requester = requester
+        track._info = TrackInfo(info)
+
+        self.append(track)
+
+    def raw(self, index: int) -> Dict[str, Any]:
+        """Returns the track at the given index as the raw payload Obsidian returned."""
+        track = self[index]
+        return {'track': track._id, 'info': track._info.to_raw()}
+
+
+class BlockList:
+    """A deque-like container of tracks, split into blocks and indexed by track ID.
+
+    Blocks hold about √n tracks each, so there are about √n blocks at any time.
+    Membership checks are O(1), while indexing, insertion and removal by index or by track
+    are O(√n), compared to the O(n) of a :class:`collections.deque` .
+
+    Membership checks compare track IDs. Removal by track prefers the given track itself,
+    and otherwise removes the first track with the same ID.
+    Tracks with placeholder IDs, such as Spotify tracks, are only ever matched by identity.
+
+    This can be used as the backing storage of a queue:
+
+    .. code:: py
+
+        queue = PointerBasedQueue(cls=BlockList)
+
+    Parameters
+    ----------
+    tracks: Iterable[:class:`.Track`]
+        The tracks to initially store.
+    """
+
+    # The minimum block size, blocks grow with the square root of the length
+    BLOCK_SIZE: int = 256
+
+    def __init__(self, tracks: Iterable[Track] = ()) -> None:
+        self.__blocks: List[List[Track]] = []
+        self.__length: int = 0
+
+        # Track ID -> {id(block): amount of tracks with this ID in that block}
+        self.__locations: Dict[str, Dict[int, int]] = {}
+
+        self.extend(tracks)
+
+    def __repr__(self) -> str:
+        return f'<BlockList tracks={self.__length} blocks={len(self.__blocks)}>'
+
+    def __len__(self) -> int:
+        return self.__length
+
+    def __bool__(self) -> bool:
+        return self.__length > 0
+
+    def __iter__(self) -> Iterator[Track]:
+        for block in self.__blocks:
+            yield from block
+
+    def __reversed__(self) -> Iterator[Track]:
+        for block in reversed(self.__blocks):
+            yield from reversed(block)
+
+    def __contains__(self, track: Track) -> bool:
+        if track.id not in self.__locations:
+            return False
+
+        return _is_track_id(track.id) or self.__find(track) is not None
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Track, List[Track]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.__length))]
+
+        position, offset = self.__locate(index)
+        return self.__blocks[position][offset]
+
+    def __setitem__(self, index: int, track: Track) -> None:
+        position, offset = self.__locate(index)
+        block = self.__blocks[position]
+
+        self.__unregister(block, block[offset])
+        block[offset] = track
+        self.__register(block, track)
+
+    def __delitem__(self, index: int) -> None:
+        self.__delete(*self.__locate(index))
+
+    def __copy__(self) -> BlockList:
+        return self.copy()
+
+    def __block_size(self) -> int:
+        return max(self.BLOCK_SIZE, int(self.__length ** 0.5))
+
+    def __locate(self, index: int) -> Tuple[int, int]:
+        if index < 0:
+            index += self.__length
+
+        if not 0 <= index < self.__length:
+            raise IndexError('BlockList index out of range')
+
+        if index >= self.__length - len(self.__blocks[-1]):
+            return len(self.__blocks) - 1, index - (self.__length - len(self.__blocks[-1]))
+
+        for position, block in enumerate(self.__blocks):
+            if index < len(block):
+                return position, index
+
+            index -= len(block)
+
+        raise IndexError('BlockList index out of range')
+
+    def __register(self, block: List[Track], track: Track) -> None:
+        counts = self.__locations.setdefault(track.id, {})
+        counts[id(block)] = counts.get(id(block), 0) + 1
+
+    def __unregister(self, block: List[Track], track: Track) -> None:
+        key = track.id
+        counts = self.__locations[key]
+
+        counts[id(block)] -= 1
+        if not counts[id(block)]:
+            del counts[id(block)]
+
+            if not counts:
+                del self.__locations[key]
+
+    def __move(self, source: List[Track], destination: List[Track], tracks: Iterable[Track]) -> None:
+        for track in tracks:
+            self.__unregister(source, track)
+            self.__register(destination, track)
+
+    def __split(self, position: int) -> None:
+        block = self.__blocks[position]
+        half = len(block) // 2
+
+        new = block[half:]
+        del block[half:]
+
+        self.__blocks.insert(position + 1, new)
+        self.__move(block, new, new)
+
+    def __delete(self, position: int, offset: int) -> Track:
+        block = self.__blocks[position]
+        track = block.pop(offset)
+
+        self.__unregister(block, track)
+        self.__length -= 1
+
+        if not block:
+            del self.__blocks[position]
+
+        elif len(block) < self.__block_size() // 4 and position + 1 < len(self.__blocks):
+            following = self.__blocks[position + 1]
+
+            if len(block) + len(following) <= self.__block_size():
+                self.__move(following, block, following)
+                block.extend(following)
+                del self.__blocks[position + 1]
+
+        return track
+
+    def __find(self, track: Track) -> Optional[Tuple[int, int, int]]:
+        counts = self.__locations.get(track.id)
+        if not counts:
+            return None
+
+        fallback = None
+        by_id = _is_track_id(track.id)
+        start = 0
+
+        for position, block in enumerate(self.__blocks):
+            if id(block) in counts:
+                for offset, other in enumerate(block):
+                    if other is track:
+                        return position, offset, start + offset
+
+                    if by_id and fallback is None and other.id == track.id:
+                        fallback = position, offset, start + offset
+
+            start += len(block)
+
+        return fallback
+
+    def append(self, track: Track) -> None:
+        """Adds a track to the end."""
+        if not self.__blocks or len(self.__blocks[-1]) >= self.__block_size():
+            self.__blocks.append([])
+
+        block = self.__blocks[-1]
+        block.append(track)
+
+        self.__register(block, track)
+        self.__length += 1
+
+    def appendleft(self, track: Track) -> None:
+        """Adds a track to the beginning."""
+        self.insert(0, track)
+
+    def insert(self, index: int, track: Track) -> None:
+        """Inserts a track before the given index."""
+        if index < 0:
+            index = max(index + self.__length, 0)
+
+        if index >= self.__length:
+            return self.append(track)
+
+        position, offset = self.__locate(index)
+        block = self.__blocks[position]
+
+        block.insert(offset, track)
+        self.__register(block, track)
+        self.__length += 1
+
+        if len(block) > self.__block_size() * 2:
+            self.__split(position)
+
+    def insert_many(self, index: int, tracks: Iterable[Track]) -> None:
+        """Inserts multiple tracks before the given index, keeping their order.
+
+        The tracks are spliced into a single block, which is then split up if it grew too large.
+        """
+
+        tracks = list(tracks)
+        if not tracks:
+            return
+
+        if index < 0:
+            index = max(index + self.__length, 0)
+
+        if index >= self.__length:
+            return self.extend(tracks)
+
+        position, offset = self.__locate(index)
+        block = self.__blocks[position]
+
+        block[offset:offset] = tracks
+        for track in tracks:
+            self.__register(block, track)
+
+        self.__length += len(tracks)
+        size = self.__block_size()
+
+        if len(block) > size * 2:
+            chunks = [block[i:i + size] for i in range(size, len(block), size)]
+            del block[size:]
+
+            for chunk in chunks:
+                self.__move(block, chunk, chunk)
+
+            self.__blocks[position + 1:position + 1] = chunks
+
+    def extend(self, tracks: Iterable[Track]) -> None:
+        """Adds multiple tracks to the end."""
+        for track in tracks:
+            self.append(track)
+
+    def pop(self) -> Track:
+        """Removes and returns the last track."""
+        if not self.__length:
+            raise IndexError('pop from an empty BlockList')
+
+        return self.__delete(len(self.__blocks) - 1, len(self.__blocks[-1]) - 1)
+
+    def popleft(self) -> Track:
+        """Removes and returns the first track."""
+        if not self.__length:
+            raise IndexError('pop from an empty BlockList')
+
+        return self.__delete(0, 0)
+
+    def remove(self, track: Track) -> None:
+        """Removes the given track, or the first track with the same ID.
+
+        Raises
+        ------
+        ValueError
+            No such track is stored.
+        """
+
+        found = self.__find(track)
+        if found is None:
+            raise ValueError('BlockList.remove(x): x not in list')
+
+        self.__delete(found[0], found[1])
+
+    def index(self, track: Track) -> int:
+        """Returns the index of the given track, or of the first track with the same ID.
+
+        Raises
+        ------
+        ValueError
+            No such track is stored.
+        """
+
+        found = self.__find(track)
+        if found is None:
+            raise ValueError('BlockList.index(x): x not in list')
+
+        return found[2]
+
+    def count(self, track: Track) -> int:
+        """Returns the amount of tracks with the same ID as the given track."""
+        counts = self.__locations.get(track.id, {})
+
+        if _is_track_id(track.id):
+            return sum(counts.values())
+
+        return sum(other is track for block in self.__blocks if id(block) in counts for other in block)
+
+    def copy(self) -> BlockList:
+        """Returns a shallow copy of this list."""
+        return self.__class__(self)
+
+    def clear(self) -> None:
+        """Removes all tracks."""
+        self.__blocks.clear()
+        self.__locations.clear()
+        self.__length = 0
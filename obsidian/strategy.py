@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from typing import Iterable, List, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .node import BaseNode
+
+
+__all__: tuple = (
+    'BaseStrategy',
+    'LeastLoadedStrategy',
+    'PenaltyStrategy',
+    'RoundRobinStrategy'
+)
+
+
+class BaseStrategy(object):
+    """The base class for all node placement strategies.
+
+    Subclasses should either override :meth:`BaseStrategy.score`,
+    in which case the node with the lowest score is chosen,
+    or override :meth:`BaseStrategy.select` entirely.
+    """
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__}>'
+
+    def score(self, node: BaseNode) -> float:
+        """Scores the given node. Lower scores are preferred.
+
+        Parameters
+        ----------
+        node: :class:`.BaseNode`
+            The node to score.
+
+        Returns
+        -------
+        float
+            The score of the node.
+        """
+        raise NotImplementedError
+
+    def select(self, nodes: Iterable[BaseNode]) -> Optional[BaseNode]:
+        """Selects the best node out of the given nodes.
+
+        Parameters
+        ----------
+        nodes: Iterable[:class:`.BaseNode`]
+            The connected nodes to choose from.
+
+        Returns
+        -------
+        Optional[:class:`.BaseNode`]
+            The selected node, or `None` if no nodes were given.
+        """
+        return min(nodes, key=self.score, default=None)
+
+
+class LeastLoadedStrategy(BaseStrategy):
+    """Chooses the node with the least amount of players.
+
+    The player count is taken from the node's latest :class:`.Stats` if available,
+    falling back to the amount of players this client has on that node.
+    """
+
+    def score(self, node: BaseNode) -> float:
+        stats = node.stats
+        players = len(node.players)
+
+        if stats is not None and stats.players_total is not None:
+            return max(players, stats.players_total)
+
+        return players
+
+
+class PenaltyStrategy(BaseStrategy):
+    """Chooses the node with the lowest weighted penalty.
+
+    The penalty is made up of the amount of active players,
+    the CPU load of the system and the Obsidian process, and the heap usage.
+
+    Parameters
+    ----------
+    player_weight: float, default: 1.0
+        The penalty added for each player playing on the node.
+    cpu_weight: float, default: 1.0
+        The weight of the CPU load penalty.
+    memory_weight: float, default: 1.0
+        The weight of the heap usage penalty.
+    """
+
+    def __init__(self, *, player_weight: float = 1.0, cpu_weight: float = 1.0, memory_weight: float = 1.0) -> None:
+        self.player_weight: float = player_weight
+        self.cpu_weight: float = cpu_weight
+        self.memory_weight: float = memory_weight
+
+    def __repr__(self) -> str:
+        return (
+            f'<PenaltyStrategy player_weight={self.player_weight} cpu_weight={self.cpu_weight} '
+            f'memory_weight={self.memory_weight}>'
+        )
+
+    def score(self, node: BaseNode) -> float:
+        stats = node.stats
+        players = len(node.players)
+
+        if stats is None:
+            return players * self.player_weight
+
+        if stats.players_active is not None:
+            players = max(players, stats.players_active)
+
+        # Exponential so that a nearly saturated CPU weighs far more than a half-loaded one
+        system_load = stats.cpu_system_load or 0
+        process_load = stats.cpu_process_load or 0
+        cpu = (1.05 ** (100 * system_load) * 10 - 10) + (1.05 ** (100 * process_load) * 10 - 10)
+
+        memory = 0.
+        if stats.heap_usage is not None:
+            memory = 1.05 ** (100 * stats.heap_usage) * 10 - 10
+
+        return players * self.player_weight + cpu * self.cpu_weight + memory * self.memory_weight
+
+
+class RoundRobinStrategy(BaseStrategy):
+    """Cycles through all connected nodes in order."""
+
+    def __init__(self) -> None:
+        self.__last: Optional[str] = None
+
+    def select(self, nodes: Iterable[BaseNode]) -> Optional[BaseNode]:
+        nodes: List[BaseNode] = sorted(nodes, key=lambda node: node.identifier)
+        if not nodes:
+            return None
+
+        if self.__last is not None:
+            for node in nodes:
+                if node.identifier > self.__last:
+                    break
+            else:
+                node = nodes[0]
+        else:
+            node = nodes[0]
+
+        self.__last = node.identifier
+        return node
@@ -0,0 +1,182 @@
+import json
+import codecs
+
+from typing import Any, List, Optional, Tuple
+
+
+__all__: tuple = (
+    'LoadTracksParser',
+)
+
+_WHITESPACE = ' \t\n\r'
+
+# States
+_START = 0
+_KEY = 1
+_COLON = 2
+_VALUE = 3
+_ARRAY_START = 4
+_ARRAY_ITEM = 5
+_DONE = 6
+
+
+class LoadTracksParser:
+    """Incrementally parses a `/loadtracks` response as its body arrives.
+
+    Each entry of the `tracks` array is emitted as soon as it has been received in full,
+    so the whole response never has to be held in memory at once.
+    Every other top-level key is emitted with its value as-is.
+
+    Example
+    -------
+
+    .. code:: py
+
+        parser = LoadTracksParser()
+
+        async for chunk in response.content.iter_any():
+            for key, value in parser.feed(chunk):
+                ...  # key is 'track' for each entry of the tracks array
+
+        parser.close()
+    """
+
+    def __init__(self) -> None:
+        self.__decoder: json.JSONDecoder = json.JSONDecoder()
+        self.__text: codecs.IncrementalDecoder = codecs.getincrementaldecoder('utf-8')()
+        self.__buffer: str = ''
+        self.__state: int = _START
+        self.__key: Optional[str] = None
+
+    @property
+    def done(self) -> bool:
+        """bool: Whether or not the whole response has been parsed."""
+        return self.__state == _DONE
+
+    def __skip(self, position: int, skip_commas: bool = False) -> int:
+        buffer = self.__buffer
+        length = len(buffer)
+
+        while position < length and (buffer[position] in _WHITESPACE or skip_commas and buffer[position] == ','):
+            position += 1
+
+        return position
+
+    def __decode(self, position: int, final: bool) -> Tuple[Any, int]:
+        value, end = self.__decoder.raw_decode(self.__buffer, position)
+
+        # A trailing number or literal could still continue in the next chunk
+        if end >= len(self.__buffer) and not final:
+            raise ValueError('Value may be incomplete.')
+
+        return value, end
+
+    def feed(self, chunk: bytes, *, final: bool = False) -> List[Tuple[str, Any]]:
+        """Feeds a chunk of the response body.
+
+        Parameters
+        ----------
+        chunk: bytes
+            The next chunk of the body.
+        final: bool, default: False
+            Whether or not this is the last chunk.
+
+        Returns
+        -------
+        List[Tuple[str, Any]]
+            The `(key, value)` pairs that were completed by this chunk.
+            Entries of the `tracks` array use the key `'track'`.
+        """
+
+        self.__buffer += self.__text.decode(chunk, final)
+        buffer = self.__buffer
+        position = 0
+        result = []
+
+        while True:
+            position = self.__skip(position, skip_commas=self.__state in (_KEY, _ARRAY_ITEM))
+            if position >= len(buffer):
+                break
+
+            state = self.__state
+            char = buffer[position]
+
+            if state == _DONE:
+                raise ValueError(f'Unexpected data after the end of the response at {position}.')
+
+            if state == _START:
+                if char != '{':
+                    raise ValueError(f'Expected an object, got {char!r}.')
+
+                self.__state = _KEY
+                position += 1
+
+            elif state == _KEY:
+                if char == '}':
+                    self.__state = _DONE
+                    position += 1
+                    continue
+
+                try:
+                    self.__key, position = self.__decode(position, final)
+                except ValueError:
+                    break
+
+                self.__state = _COLON
+
+            elif state == _COLON:
+                if char != ':':
+                    raise ValueError(f'Expected a colon, got {char!r}.')
+
+                self.__state = _ARRAY_START if self.__key == 'tracks' else _VALUE
+                position += 1
+
+            elif state == _ARRAY_START:
+                if char != '[':
+                    # Not an array after all, treat it as any other value
+                    self.__state = _VALUE
+                    continue
+
+                self.__state = _ARRAY_ITEM
+                position += 1
+
+            elif state == _ARRAY_ITEM:
+                if char == ']':
+                    self.__state = _KEY
+                    position += 1
+                    continue
+
+                try:
+                    value, position = self.__decode(position, final)
+                except ValueError:
+                    break
+
+                result.append(('track', value))
+
+            elif state == _VALUE:
+                try:
+                    value, position = self.__decode(position, final)
+                except ValueError:
+                    break
+
+                result.append((self.__key, value))
+                self.__state = _KEY
+
+        self.__buffer = buffer[position:]
+        return result
+
+    def close(self) -> List[Tuple[str, Any]]:
+        """Parses whatever is left of the body.
+
+        Raises
+        ------
+        ValueError
+            The response ended early or is malformed.
+        """
+
+        result = self.feed(b'', final=True)
+
+        if self.__state != _DONE or self.__buffer.strip():
+            raise ValueError('Response ended unexpectedly.')
+
+        return result
@@ -1,17 +1,316 @@
+import weakref
+
+from functools import lru_cache
+
 import discord
 
 from discord.ext import commands
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Union, TYPE_CHECKING
 
+from .decoder import decode_track_info
 from .enums import Source
 
+if TYPE_CHECKING:
+    from .store import TrackStore
+
 
 __all__: tuple = (
+    'ContextReference',
+    'TrackInfo',
     'Track',
     'Playlist'
 )
 
 
+class ContextReference:
+    """A lightweight reference to a :class:`~discord.ext.commands.Context` .
+
+    Only the IDs of the guild, channel, author and message are kept,
+    along with a weak reference to the context itself.
+    While the context is still alive it is used as-is,
+    otherwise the channel and requester are resolved from the bot's cache on access.
+
+    Parameters
+    ----------
+    ctx: Optional[:class:`~discord.ext.commands.Context`]
+        The context to reference.
+    requester: Optional[:class:`discord.abc.User`]
+        The requester to reference. Defaults to the author of the context.
+    """
+
+    __slots__: tuple = (
+        '_ref',
+        '_bot',
+        'guild_id',
+        'channel_id',
+        'author_id',
+        'message_id'
+    )
+
+    def __init__(
+            self,
+            ctx: Optional[commands.Context] = None,
+            *,
+            requester: Optional[discord.abc.User] = None
+    ) -> None:
+        try:
+            self._ref: Optional[weakref.ref] = weakref.ref(ctx) if ctx is not None else None
+        except TypeError:
+            self._ref = None
+
+        guild = getattr(ctx, 'guild', None) or getattr(requester, 'guild', None)
+        channel = getattr(ctx, 'channel', None)
+        message = getattr(ctx, 'message', None)
+        requester = requester or getattr(ctx, 'author', None)
+
+        self._bot: Optional[discord.Client] = getattr(ctx, 'bot', None)
+        self.guild_id: Optional[int] = guild.id if guild is not None else None
+        self.channel_id: Optional[int] = channel.id if channel is not None else None
+        self.author_id: Optional[int] = requester.id if requester is not None else None
+        self.message_id: Optional[int] = message.id if message is not None else None
+
+    def __repr__(self) -> str:
+        return f'<ContextReference guild_id={self.guild_id} channel_id={self.channel_id} author_id={self.author_id}>'
+
+    @property
+    def ctx(self) -> Optional[commands.Context]:
+        """Optional[:class:`~discord.ext.commands.Context`]: The context, if it is still alive."""
+        return self._ref() if self._ref is not None else None
+
+    @property
+    def guild(self) -> Optional[discord.Guild]:
+        """Optional[:class:`discord.Guild`]: The guild of the context, if cached."""
+        if self.guild_id is None or self._bot is None:
+            return None
+
+        return self._bot.get_guild(self.guild_id)
+
+    @property
+    def channel(self) -> Optional[discord.abc.Messageable]:
+        """Optional[:class:`discord.abc.Messageable`]: The channel of the context, if cached."""
+        ctx = self.ctx
+        if ctx is not None:
+            return ctx.channel
+
+        if self.channel_id is None or self._bot is None:
+            return None
+
+        return self._bot.get_channel(self.channel_id)
+
+    @property
+    def requester(self) -> Optional[discord.abc.User]:
+        """Optional[:class:`discord.abc.User`]: The referenced requester, if cached."""
+        ctx = self.ctx
+        if ctx is not None and ctx.author.id == self.author_id:
+            return ctx.author
+
+        if self.author_id is None or self._bot is None:
+            return None
+
+        guild = self.guild
+        if guild is not None:
+            return guild.get_member(self.author_id)
+
+        return self._bot.get_user(self.author_id)
+
+
+class TrackInfo:
+    """The immutable metadata of a track.
+
+    With interning enabled, tracks that share an ID share the same :class:`TrackInfo`,
+    which is kept in a table of weak references for as long as any track uses it.
+
+    Parameters
+    ----------
+    info: Dict[str, Any]
+        The raw info payload returned by Obsidian.
+
+    See Also
+    --------
+    :meth:`TrackInfo.intern`
+    """
+
+    __slots__: tuple = (
+        'title',
+        'author',
+        'uri',
+        'identifier',
+        'length',
+        'position',
+        'is_stream',
+        'is_seekable',
+        'source',
+        'thumbnail',
+        '__weakref__'
+    )
+
+    _interned: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+
+    def __init__(self, info: Dict[str, Any]) -> None:
+        self._set(
+            info['title'],
+            info['author'],
+            info['uri'],
+            info['identifier'],
+            info['length'],
+            info['position'],
+            info['is_stream'],
+            info['is_seekable'],
+            Source(info['source_name']),
+            info.get('thumbnail')
+        )
+
+    def __repr__(self) -> str:
+        return f'<TrackInfo title={self.title!r} uri={self.uri!r}>'
+
+    def __setattr__(self, key: str, value: Any) -> None:
+        raise AttributeError('TrackInfo is immutable')
+
+    def __delattr__(self, key: str) -> None:
+        raise AttributeError('TrackInfo is immutable')
+
+    def _set(
+            self,
+            title: str,
+            author: str,
+            uri: Optional[str],
+            identifier: str,
+            length: int,
+            position: int,
+            is_stream: bool,
+            is_seekable: bool,
+            source: Source,
+            thumbnail: Optional[str]
+    ) -> None:
+        setter = object.__setattr__
+
+        setter(self, 'title', title)
+        setter(self, 'author', author)
+        setter(self, 'uri', uri)
+        setter(self, 'identifier', identifier)
+        setter(self, 'length', length)
+        setter(self, 'position', position)
+        setter(self, 'is_stream', is_stream)
+        setter(self, 'is_seekable', is_seekable)
+        setter(self, 'source', source)
+        setter(self, 'thumbnail', thumbnail)
+
+    @classmethod
+    def _from_fields(cls, *fields: Any) -> 'TrackInfo':
+        self = cls.__new__(cls)
+        self._set(*fields)
+        return self
+
+    @classmethod
+    def intern(cls, id: str, info: Dict[str, Any]) -> 'TrackInfo':
+        """Returns the shared :class:`TrackInfo` of the given track ID, creating it if needed.
+
+        Track IDs encode their metadata, so the same ID always has the same info.
+        Placeholder IDs that the local decoder can't read, such as the ones of Spotify tracks,
+        are never interned.
+
+        Parameters
+        ----------
+        id: str
+            The Base 64 track ID.
+        info: Dict[str, Any]
+            The raw info payload, used if the ID isn't interned yet.
+        """
+
+        try:
+            return cls._interned[id]
+        except KeyError:
+            pass
+
+        self = cls(info)
+        if _is_track_id(id):
+            cls._interned[id] = self
+
+        return self
+
+    @classmethod
+    def interned(cls) -> int:
+        """Returns the amount of track infos currently interned."""
+        return len(cls._interned)
+
+    def to_raw(self) -> Dict[str, Any]:
+        """Returns the raw info payload this was created from."""
+        info = {
+            'title': self.title,
+            'author': self.author,
+            'length': self.length,
+            'identifier': self.identifier,
+            'is_stream': self.is_stream,
+            'is_seekable': self.is_seekable,
+            'uri': self.uri,
+            'source_name': self.source.value,
+            'position': self.position
+        }
+
+        if self.thumbnail is not None:
+            info['thumbnail'] = self.thumbnail
+
+        return info
+
+
+@lru_cache(maxsize=4096)
+def _is_track_id(id: str) -> bool:
+    # Placeholder IDs, such as the ones of Spotify tracks, are shared by unrelated tracks.
+    # This is checked on every membership test of a store, so results are cached and
+    # anything too short or not padded like Base 64 is rejected without decoding.
+    if len(id) < 16 or len(id) % 4:
+        return False
+
+    try:
+        decode_track_info(id)
+    except ValueError:
+        return False
+
+    return True
+
+
+def _info_property(name: str) -> property:
+    def getter(self: 'Track') -> Any:
+        return getattr(self._info, name)
+
+    def setter(self: 'Track', value: Any) -> None:
+        # The info may be shared with other tracks, so it is copied rather than modified
+        info = self._info
+        self._info = type(info)._from_fields(*(
+            value if field == name else getattr(info, field) for field in _INFO_FIELDS
+        ))
+
+    return property(getter, setter)
+
+
+# In the order TrackInfo._set takes them
+_INFO_FIELDS: tuple = TrackInfo.__slots__[:-1]
+
+
+def _store_context(ctx: Any, requester: Optional[discord.Member], weak: bool) -> tuple:
+    if isinstance(ctx, ContextReference):
+        return ctx, requester
+
+    if weak and (ctx is not None or requester is not None):
+        return ContextReference(ctx, requester=requester), None
+
+    return ctx, requester or (ctx.author if ctx else None)
+
+
+def _load_context(ctx: Any) -> Optional[commands.Context]:
+    if isinstance(ctx, ContextReference):
+        return ctx.ctx
+
+    return ctx
+
+
+def _load_requester(ctx: Any, requester: Optional[discord.Member]) -> Optional[discord.Member]:
+    if requester is None and isinstance(ctx, ContextReference):
+        return ctx.requester
+
+    return requester
+
+
 class Track:
     """
     Represents an obsidian song track.
@@ -23,47 +322,58 @@ class Track:
     info: Dict[str, Any]
         The raw JSON payload returned by Obsidian,
         containing information about this track.
-    ctx: Optional[:class:`commands.Context`]
+    ctx: Optional[Union[:class:`commands.Context`, :class:`ContextReference`]]
         An optional context to use for this track.  
         By default, if this is provided, :attr:`Track.requester` will be the author of the context.
+    weak_context: bool, default: :attr:`Track.WEAK_CONTEXT`
+        Whether or not to keep only a :class:`ContextReference` to the context and requester
+        rather than the objects themselves. :attr:`Track.ctx` will then be `None` once the context
+        is garbage collected, and :attr:`Track.requester` is resolved from the bot's cache.
+    intern: bool, default: :attr:`Track.INTERN_INFO`
+        Whether or not to share the :class:`TrackInfo` of this track with other tracks of the same ID.
+        The requester and context are never shared.
     kwargs
         Extra keyword arguments to pass into the constructor.
     """
 
+    WEAK_CONTEXT: bool = False
+    INTERN_INFO: bool = False
+
     __slots__: tuple = (
         '_id',
         '_ctx',
         '_requester',
-        '_title',
-        '_author',
-        '_uri',
-        '_identifier',
-        '_length',
-        '_position',
-        '_is_stream',
-        '_is_seekable',
-        '_source',
-        '_thumbnail'
+        '_info'
     )
 
     def __init__(self, *, id: str, info: Dict[str, Any], ctx: Optional[commands.Context] = None, **kwargs) -> None:
-        self._ctx: Optional[commands.Context] = ctx
-        self._requester: Optional[discord.Member] = kwargs.get('requester') or (ctx.author if ctx else None)
+        self._ctx: Optional[Union[commands.Context, ContextReference]]
+        self._requester: Optional[discord.Member]
+
+        self._ctx, self._requester = _store_context(
+            ctx, kwargs.get('requester'), kwargs.get('weak_context', self.WEAK_CONTEXT)
+        )
 
         self._id: str = id
-        self._uri: str = info['uri']
-        self._title: str = info['title']
-        self._author: str = info['author']
-        self._length: int = info['length']
-        self._position: int = info['position']
-        self._is_stream: bool = info['is_stream']
-        self._identifier: str = info['identifier']
-        self._is_seekable: bool = info['is_seekable']
-        self._source: Source = Source(info['source_name'])
-        self._thumbnail: Optional[str] = info.get('thumbnail')
+        self._info: TrackInfo = (
+            TrackInfo.intern(id, info) if kwargs.get('intern', self.INTERN_INFO) else TrackInfo(info)
+        )
+
+    # Compatibility with subclasses that use the attributes tracks used to store themselves
+    _title = _info_property('title')
+    _author = _info_property('author')
+    _uri = _info_property('uri')
+    _identifier = _info_property('identifier')
+    _length = _info_property('length')
+    _position = _info_property('position')
+    _is_stream = _info_property('is_stream')
+    _is_seekable = _info_property('is_seekable')
+    _source = _info_property('source')
+    _thumbnail = _info_property('thumbnail')
 
     def __repr__(self) -> str:
-        return f'<Track title={self._title!r} uri={self._uri!r} source={self.source!r} length={self._length}>'
+        info = self._info
+        return f'<Track title={info.title!r} uri={info.uri!r} source={info.source!r} length={info.length}>'
 
     @property
     def id(self) -> str:
@@ -76,76 +386,83 @@ class Track:
         """
         return self._id
 
+    @property
+    def info(self) -> TrackInfo:
+        """
+        :class:`TrackInfo`: The metadata of this track.
+        """
+        return self._info
+
     @property
     def ctx(self) -> Optional[commands.Context]:
         """
         Optional[:class:`~discord.ext.commands.Context`]: The :class:`~discord.ext.commands.Context` 
         that invoked the track. Could be `None` .
         """
-        return self._ctx
+        return _load_context(self._ctx)
 
     @property
     def title(self) -> str:
         """
         str: The track title.
         """
-        return self._title
+        return self._info.title
 
     @property
     def author(self) -> str:
         """
         str: The author of the track.
         """
-        return self._author
+        return self._info.author
 
     @property
     def uri(self) -> str:
         """
         str: The track's URI.
         """
-        return self._uri
+        return self._info.uri
 
     @property
     def identifier(self) -> str:
         """
         str: The tracks identifier.
         """
-        return self._identifier
+        return self._info.identifier
 
     @property
     def length(self) -> int:
         """
         int: The duration of the track in milliseconds.
         """
-        return self._length
+        return self._info.length
 
     @property
     def position(self) -> int:
         """
         int: The current position of the track in milliseconds.
         """
-        return self._position
+        return self._info.position
 
     @property
     def stream(self) -> bool:
         """
         bool: Whether the track is a stream or not.
         """
-        return self._is_stream
+        return self._info.is_stream
 
     @property
     def seekable(self) -> bool:
         """
         bool: If you are able to seek the track's position or not.
         """
-        return self._is_seekable
+        return self._info.is_seekable
 
     @property
     def source(self) -> Source:
         """
         :class:`Source`: Return an |enum_link| indicates the type of the :class:`.Source` .
         """
-        return self._source
+        return self._info.source
 
     @property
     def thumbnail(self) -> str:
@@ -155,8 +472,8 @@ class Track:
         if self.source is Source.YOUTUBE:
             return f'https://img.youtube.com/vi/{self.identifier}/hqdefault.jpg'
 
-        if self._thumbnail:
-            return self._thumbnail
+        if self._info.thumbnail:
+            return self._info.thumbnail
 
         return ''
 
@@ -165,13 +482,16 @@ class Track:
         """
         Optional[:class:`discord.Member`]: The :class:`discord.Member` that requested the track.
         """
-        return self._requester
+        return _load_requester(self._ctx, self._requester)
 
     @ctx.setter
     def ctx(self, ctx: commands.Context) -> None:
         """
         A utility `function` for changing the :attr:`ctx`.
         """
+        if isinstance(self._ctx, ContextReference) and ctx is not None:
+            ctx = ContextReference(ctx) if not isinstance(ctx, ContextReference) else ctx
+
         self._ctx = ctx
 
     @requester.setter
@@ -185,8 +505,49 @@ class Track:
 class Playlist:
     """
     Represents a playlist of tracks.
+
+    Parameters
+    ----------
+    info: Dict[str, Any]
+        The raw playlist info returned by Obsidian.
+    tracks: List[Dict[str, Any]]
+        The raw tracks returned by Obsidian.
+    ctx: Optional[Union[:class:`commands.Context`, :class:`ContextReference`]]
+        An optional context to use for this playlist and its tracks.
+    weak_context: bool, default: :attr:`Playlist.WEAK_CONTEXT`
+        Whether or not to keep only a :class:`ContextReference` to the context and requester.
+        The same reference is shared with all tracks of this playlist.
+    cls: type, default: :class:`Track`
+        The class to cast the tracks to.
+    compact: bool, default: False
+        Whether or not to keep the tracks in a :class:`.TrackStore` rather than as raw payloads.
+        :attr:`Playlist.tracks` will then be the store itself.
+    kwargs
+        Extra keyword arguments to pass into the track constructor.
+        These are ignored if `compact` is `True`.
+
+    .. note::
+        Iterating over a playlist yields :class:`Track` objects, built as they are reached.
+        Older versions yielded the raw track payloads; use :attr:`Track.id` and :attr:`Track.info` instead.
     """
 
+    WEAK_CONTEXT: bool = False
+
+    __slots__: tuple = (
+        '_ctx',
+        '_requester',
+        '_name',
+        '_tracks',
+        '_count',
+        '_selected_track',
+        '_uri',
+        '_compact',
+        '__track_cls',
+        '__built',
+        '__built_count',
+        '__kwargs'
+    )
+
     def __init__(
             self,
             *,
@@ -194,20 +555,35 @@ class Playlist:
             tracks: List[Dict[str, Any]],
             ctx: Optional[commands.Context] = None,
             cls: type = Track,
+            compact: bool = False,
             **kwargs
     ) -> None:
-        self._ctx: Optional[commands.Context] = ctx
-        self._requester: Optional[discord.Member] = kwargs.get('requester') or (ctx.author if ctx else None)
+        self._ctx: Optional[Union[commands.Context, ContextReference]]
+        self._requester: Optional[discord.Member]
+
+        self._ctx, self._requester = _store_context(
+            ctx, kwargs.get('requester'), kwargs.get('weak_context', self.WEAK_CONTEXT)
+        )
 
         self._name: str = info['name']
-        self._tracks: List[Dict[str, Any]] = tracks
+        self._tracks: Optional[Union[List[Dict[str, Any]], TrackStore]] = tracks
+        self._count: int = len(tracks)
         self._selected_track: int = info.get('selected_track', 0)
 
         self._uri: Optional[str] = info.get('uri')
+        self._compact: bool = compact
 
         self.__track_cls: type = cls
-        self.__constructed_tracks: Optional[List[Track]] = None
-        self.__kwargs = kwargs
+        self.__built: Optional[List[Optional[Track]]] = None
+        self.__built_count: int = 0
+        self.__kwargs: Dict[str, Any] = kwargs
+
+        if compact:
+            from .store import TrackStore
+
+            self._tracks = store = TrackStore()
+            for track in tracks:
+                store.append_raw(track['track'], track['info'], cls=cls, ctx=self._ctx, requester=self._requester)
 
     @property
     def __track_kwargs(self) -> Dict[str, Any]:
@@ -216,26 +592,76 @@ class Playlist:
             'requester': self._requester
         }
 
+    def __track_at(self, index: int) -> Track:
+        if self._compact:
+            return self._tracks[index]
+
+        built = self.__built
+        if built is None:
+            self.__built = built = [None] * self._count
+
+        track = built[index]
+        if track is None:
+            raw = self._tracks[index]
+            built[index] = track = self.__track_cls(
+                id=raw['track'], info=raw['info'], ctx=self._ctx, **self.__track_kwargs
+            )
+
+            self.__built_count += 1
+            if self.__built_count == self._count:
+                self._tracks = None  # Every track is built, the raw payloads are no longer needed
+
+        return track
+
+    @property
+    def compact(self) -> bool:
+        """
+        bool: Whether or not the tracks of this playlist are kept in a :class:`.TrackStore` .
+        """
+        return self._compact
+
     @property
     def count(self) -> int:
         """
         int: Return the total amount of tracks in the playlist.
         """
-        return len(self._tracks)
+        return self._count
 
     @property
     def tracks(self) -> List[Track]:
         """
         List[Track]: Return a `list` of :class:`Track` s.
+
+        This builds every track of the playlist. To only build some of them,
+        index or slice the playlist instead, or see :meth:`Playlist.page`.
+        """
+        if self._compact:
+            return self._tracks
+
+        if self.__built_count < self._count:
+            for i in range(self._count):
+                self.__track_at(i)
+
+        return self.__built or []
+
+    def page(self, page: int, per_page: int = 10) -> List[Track]:
+        """Returns a page of tracks, only building the tracks on that page.
+
+        Parameters
+        ----------
+        page: int
+            The zero-based page number.
+        per_page: int, default: 10
+            The amount of tracks per page.
+
+        Returns
+        -------
+        List[:class:`Track`]
+            The tracks on the page. This is empty if the page is out of range.
         """
-        if self.__constructed_tracks is not None:
-            return self.__constructed_tracks
 
-        self.__constructed_tracks = res = [
-            self.__track_cls(id=track['track'], info=track['info'], ctx=self.ctx, **self.__track_kwargs)
-            for track in self._tracks
-        ]
-        return res
+        start = page * per_page
+        return self[start:start + per_page]
 
     @property
     def ctx(self) -> Optional[commands.Context]:
@@ -243,7 +669,7 @@ class Playlist:
         Optional[:class:`~discord.ext.commands.Context`]: The :class:`~discord.ext.commands.Context` 
         that invoked the playlist. Could be `None` .
         """
-        return self._ctx
+        return _load_context(self._ctx)
 
     @property
     def name(self) -> str:
@@ -257,10 +683,13 @@ class Playlist:
         """
         The selected track returned by Obsidian, could be `None` .
         """
+        if not self._count:
+            return None
+
         try:
-            return self.tracks[self._selected_track]
+            return self[self._selected_track]
         except IndexError:
-            return self.tracks[0]
+            return self[0]
 
     @property
     def uri(self) -> Optional[str]:
@@ -275,7 +704,7 @@ class Playlist:
         :class:`.Source`: Return an |enum_link| indicates the type of the :class:`.Source` .
         """
         try:
-            return self.tracks[0].source
+            return self[0].source
         except (IndexError, KeyError):
             return Source.YOUTUBE
 
@@ -284,7 +713,7 @@ class Playlist:
         """
         Optional[:class:`discord.Member`]: The :class:`discord.Member` that requested the playlist.
         """
-        return self._requester
+        return _load_requester(self._ctx, self._requester)
 
     @requester.setter
     def requester(self, requester: discord.Member) -> None:
@@ -298,13 +727,29 @@ class Playlist:
         """
         A utility `function` for changing the :attr:`ctx`.
         """
+        if isinstance(self._ctx, ContextReference) and ctx is not None:
+            ctx = ContextReference(ctx) if not isinstance(ctx, ContextReference) else ctx
+
         self._ctx = ctx
 
-    def __iter__(self) -> iter:
-        return iter(self._tracks)
+    def __getitem__(self, index: Union[int, slice]) -> Union[Track, List[Track]]:
+        if isinstance(index, slice):
+            return [self.__track_at(i) for i in range(*index.indices(self._count))]
+
+        if index < 0:
+            index += self._count
+
+        if not 0 <= index < self._count:
+            raise IndexError('Playlist index out of range')
+
+        return self.__track_at(index)
+
+    def __iter__(self) -> Iterator[Track]:
+        for i in range(self._count):
+            yield self.__track_at(i)
 
     def __len__(self) -> int:
         return self.count
 
     def __repr__(self) -> str:
-        return f'<Playlist name={self._name!r} selected_track={self.selected_track} count={len(self._tracks)}>'
+        return f'<Playlist name={self._name!r} selected_track={self.selected_track} count={self._count}>'
@@ -6,6 +6,7 @@ from discord.backoff import ExponentialBackoff
 from typing import Coroutine, Dict, Optional
 
 from .enums import OpCode
+from .dispatch import EventDispatcher
 from .errors import ObsidianConnectionFailure, ObsidianAuthorizationFailure
 
 
@@ -16,6 +17,14 @@ __all__: tuple = (
 __log__: logging.Logger = logging.getLogger('obsidian.node')
 
 
+def _session_resumed(ws: aiohttp.ClientWebSocketResponse) -> bool:
+    # Obsidian tells whether it resumed the session in the headers of the handshake response
+    response = getattr(ws, '_response', None)
+    headers = getattr(response, 'headers', None) or {}
+
+    return str(headers.get('Session-Resumed', '')).lower() == 'true'
+
+
 class Websocket:
     def __init__(
             self,
@@ -36,6 +45,13 @@ class Websocket:
         self.__node: BaseNode = node
         self.__secure: bool = secure
         self.__ws: Optional[aiohttp.ClientWebSocketResponse] = None
+        self.__task: Optional[asyncio.Task] = None
+        self.__ready: asyncio.Event = asyncio.Event()
+        self.__closing: bool = False
+        self.__reconnecting: bool = False
+        self.__dispatcher: EventDispatcher = EventDispatcher(
+            node, loop, max_workers=node.__internal__.get('dispatch_workers', 64)
+        )
 
         self.__internal__ = connect_kwargs
 
@@ -49,71 +65,132 @@ class Websocket:
 
     @property
     def headers(self) -> Dict[str, any]:
-        return {
+        headers = {
             'Authorization': self._password,
             'User-Id': self._bot_user_id,
             'Client-Name': 'Obsidian'
         }
 
+        if self.__node.resume_key is not None:
+            headers['Resume-Key'] = self.__node.resume_key
+
+        return headers
+
     @property
     def connected(self) -> bool:
         return self.__ws is not None and not self.__ws.closed
 
+    @property
+    def dispatcher(self) -> EventDispatcher:
+        return self.__dispatcher
+
     @property
     def _ws(self) -> aiohttp.ClientWebSocketResponse:
         return self.__ws
 
-    async def connect(self) -> aiohttp.ClientWebSocketResponse:
+    async def wait_until_connected(self) -> None:
+        await self.__ready.wait()
+
+    async def _connect(self) -> aiohttp.ClientWebSocketResponse:
         identifier = self.__node.identifier
 
         try:
             ws = await self._session.ws_connect(self.url, headers=self.headers, **self.__internal__)
         except aiohttp.WSServerHandshakeError as exc:
-            if exc.status == 4001:
+            if exc.status in (401, 4001):
                 __log__.error(f'NODE {identifier!r} | Failed to authorize')
                 raise ObsidianAuthorizationFailure(self.__node)
 
-            raise Exception(exc)
+            __log__.error(f'NODE {identifier!r} | Handshake failed with status {exc.status}')
+            raise ObsidianConnectionFailure(self.__node, exc)
         except Exception as exc:
             __log__.fatal(f'NODE {identifier!r} | Failed to connect')
             raise ObsidianConnectionFailure(self.__node, exc)
-        else:
-            self.__node.__task = self._loop.create_task(self.listen())
-            self.__node.dispatch_event('obsidian_node_ready', self.__node)
 
-            self.__ws = ws
-            __log__.info(f'NODE {identifier!r} | Connection successful')
+        # Only trust Obsidian on whether the session was resumed, it may have restarted in the meantime.
+        # Otherwise players are restored from scratch.
+        resumed = self.__reconnecting and self.__node.resume_key is not None and _session_resumed(ws)
+
+        self.__ws = ws
+        self.__reconnecting = False
+        self.__ready.set()
+
+        __log__.info(f'NODE {identifier!r} | Connection successful' + (' (session resumed)' if resumed else ''))
+
+        await self.__node.handle_ws_ready(resumed=resumed)
+        self.__node.dispatch_event('obsidian_node_ready', self.__node)
 
-            return ws
+        return ws
+
+    async def connect(self) -> aiohttp.ClientWebSocketResponse:
+        ws = await self._connect()
+        self.__task = self._loop.create_task(self.listen())
+        return ws
 
     async def disconnect(self) -> None:
-        await self.__ws.close()
+        self.__closing = True
 
-    async def listen(self) -> None:
+        if self.__ws is not None:
+            await self.__ws.close()
+
+    async def _reconnect(self) -> bool:
+        identifier = self.__node.identifier
         backoff = ExponentialBackoff(base=7)
 
+        while not self.__closing:
+            retry = backoff.delay()
+            __log__.warning(f'NODE {identifier!r} | Websocket is closed, attempting reconnection in {retry:.2f} seconds.')
+
+            await asyncio.sleep(retry)
+
+            try:
+                await self._connect()
+            except ObsidianAuthorizationFailure:
+                # Retrying won't help until the password is fixed
+                __log__.error(f'NODE {identifier!r} | Authorization was rejected, no longer reconnecting.')
+                return False
+            except ObsidianConnectionFailure as exc:
+                __log__.warning(f'NODE {identifier!r} | Reconnection failed: {exc}')
+            except Exception as exc:
+                __log__.error(f'NODE {identifier!r} | Unexpected error while reconnecting: {exc!r}')
+            else:
+                return True
+
+        return False
+
+    async def listen(self) -> None:
         while True:
             payload = await self.__ws.receive()
 
-            if payload.type is aiohttp.WSMsgType.CLOSED:
-                retry = backoff.delay()
-                __log__.warning(f'NODE {self.__node.identifier!r} | Websocket is closed, attempting reconnection in {retry:.2f} seconds.')
+            if payload.type in (
+                aiohttp.WSMsgType.CLOSE,
+                aiohttp.WSMsgType.CLOSING,
+                aiohttp.WSMsgType.CLOSED,
+                aiohttp.WSMsgType.ERROR
+            ):
+                self.__ready.clear()
+
+                if self.__closing:
+                    return
+
+                self.__reconnecting = True
+                self._loop.create_task(self.__node.handle_ws_closed())
+
+                if not await self._reconnect():
+                    return
+
+                continue
 
-                await asyncio.sleep(retry)
+            data = self.__node.codec.loads(payload.data)
 
-                if not self.connected:
-                    self._loop.create_task(self.connect())
+            try:
+                op = OpCode(data['op'])
+            except ValueError:
+                __log__.warning(f'NODE {self.__node.identifier!r} | Received payload with invalid operation code: {data}')
+                continue
             else:
-                data = payload.json()
-
-                try:
-                    op = OpCode(data['op'])
-                except ValueError:
-                    __log__.warning(f'NODE {self.__node.identifier!r} | Received payload with invalid operation code: {data}')
-                    continue
-                else:
-                    __log__.debug(f'NODE {self.__node.identifier!r} | Received payload with op-code {op!r}: {data}')
-                    self._loop.create_task(self.__node.handle_ws_response(op, data['d']))
+                __log__.debug(f'NODE {self.__node.identifier!r} | Received payload with op-code {op!r}: {data}')
+                self.__dispatcher.feed(op, data['d'])
 
     def send_str(self, data: str, compress: Optional[int] = None) -> Coroutine[None, None, None]:
         return self.__ws.send_str(data, compress)
@@ -49,6 +49,9 @@ setup(
             'karma_sphinx_theme>=0.0.8',
             'sphinxcontrib-asyncio>=0.3.0',
             'sphinx-nervproject-theme>=2.0.4',
+        ],
+        'speed': [
+            'orjson>=3.5.0',
         ]
     },
     python_requires='>=3.7.0',
@@ -0,0 +1,116 @@
+import asyncio
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from obsidian.cache import SQLiteTrackCache, SingleFlight
+
+from .utils import run
+
+
+class SQLiteTrackCacheTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+
+        self.path = os.path.join(directory.name, 'tracks.db')
+        self.cache = SQLiteTrackCache(self.path)
+        self.addCleanup(self.cache.close)
+
+    def test_async_round_trip(self):
+        async def main():
+            await self.cache.put_async('query', {'load_type': 'TRACK_LOADED'})
+            self.assertEqual(await self.cache.get_async('query'), {'load_type': 'TRACK_LOADED'})
+            self.assertIsNone(await self.cache.get_async('other'))
+
+        run(main())
+        self.assertEqual(self.cache.stats, {'hits': 1, 'misses': 1})
+
+    def test_corrupt_entry_is_a_miss(self):
+        self.cache.put('query', {'load_type': 'TRACK_LOADED'})
+
+        connection = sqlite3.connect(self.path)
+        with connection:
+            connection.execute('UPDATE tracks SET value = ? WHERE key = ?', (b'{not json', 'query'))
+        connection.close()
+
+        with self.assertLogs('obsidian.cache', level='WARNING'):
+            self.assertIsNone(self.cache.get('query'))
+
+        self.assertIsNone(self.cache.get('query'))
+        self.assertEqual(self.cache.misses, 2)
+
+    def test_locked_database(self):
+        self.cache.put('query', {'load_type': 'TRACK_LOADED'})
+
+        connection = sqlite3.connect(self.path, isolation_level=None)
+        connection.execute('BEGIN EXCLUSIVE')
+
+        try:
+            self.cache.put('other', {})
+            self.cache.remove('query')
+
+            with self.assertLogs('obsidian.cache', level='WARNING'):
+                self.cache.clear()
+        finally:
+            connection.rollback()
+            connection.close()
+
+        self.assertEqual(self.cache.get('query'), {'load_type': 'TRACK_LOADED'})
+
+
+class SingleFlightTest(unittest.TestCase):
+    def test_shares_result(self):
+        async def main():
+            flights = SingleFlight()
+            calls = []
+
+            async def load():
+                calls.append(None)
+                await asyncio.sleep(0)
+                return 'result'
+
+            results = await asyncio.gather(flights.do('key', load), flights.do('key', load))
+
+            self.assertEqual(results, ['result', 'result'])
+            self.assertEqual(len(calls), 1)
+            self.assertEqual(flights.in_flight, 0)
+
+        run(main())
+
+    def test_cancels_once_last_waiter_leaves(self):
+        async def main():
+            flights = SingleFlight()
+            started = asyncio.Event()
+            cancelled = asyncio.Event()
+
+            async def load():
+                started.set()
+                try:
+                    await asyncio.sleep(1)
+                except asyncio.CancelledError:
+                    cancelled.set()
+                    raise
+
+            first = asyncio.ensure_future(flights.do('key', load))
+            second = asyncio.ensure_future(flights.do('key', load))
+            await started.wait()
+
+            first.cancel()
+            await asyncio.sleep(0)
+            self.assertFalse(cancelled.is_set())
+
+            second.cancel()
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+            self.assertTrue(cancelled.is_set())
+
+            await asyncio.gather(first, second, return_exceptions=True)
+            self.assertEqual(flights.in_flight, 0)
+
+        run(main())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,225 @@
+import asyncio
+import json
+import unittest
+
+from types import SimpleNamespace
+
+from obsidian.enums import CircuitState, RequestPriority
+from obsidian.errors import CircuitOpen
+from obsidian.http import CircuitBreaker, HTTPClient, RequestScheduler
+from obsidian.search import TrackSearcher
+
+from .utils import make_info, make_track, run
+
+
+class _Response:
+    status = 200
+    headers = {}
+    url = 'http://localhost:3030/'
+
+    async def read(self):
+        return b'{"ok": true}'
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_):
+        return False
+
+
+class _Content:
+    def __init__(self, body):
+        self.body = body
+
+    async def iter_chunked(self, size):
+        for i in range(0, len(self.body), size):
+            yield self.body[i:i + size]
+
+
+class _StreamResponse(_Response):
+    def __init__(self, body):
+        self.content = _Content(body)
+        self.closed = False
+
+    async def __aexit__(self, *_):
+        self.closed = True
+        return False
+
+
+class _Session:
+    def __init__(self, body=b''):
+        self.responses = []
+        self.body = body
+
+    def request(self, **_):
+        return _Response()
+
+    def get(self, url, **_):
+        response = _StreamResponse(self.body)
+        self.responses.append(response)
+        return response
+
+
+def _playlist_body(count):
+    tracks = [make_track(str(i)) for i in range(count)]
+    return json.dumps({
+        'load_type': 'PLAYLIST_LOADED',
+        'playlist_info': {'name': 'Mix', 'selected_track': -1},
+        'tracks': [{'track': track.id, 'info': make_info(track.title)} for track in tracks]
+    }).encode('utf-8')
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    def test_opens_after_threshold(self):
+        circuit = CircuitBreaker(failure_threshold=2, recovery_timeout=60)
+
+        circuit.record_failure()
+        self.assertIs(circuit.state, CircuitState.CLOSED)
+
+        circuit.record_failure()
+        self.assertIs(circuit.state, CircuitState.OPEN)
+        self.assertFalse(circuit.allow())
+
+    def test_half_open_allows_single_trial(self):
+        circuit = CircuitBreaker(failure_threshold=1, recovery_timeout=0)
+        circuit.record_failure()
+
+        self.assertIs(circuit.state, CircuitState.HALF_OPEN)
+        self.assertTrue(circuit.allow())
+        self.assertFalse(circuit.allow())
+
+        circuit.record_success()
+        self.assertIs(circuit.state, CircuitState.CLOSED)
+
+    def test_failed_trial_reopens(self):
+        circuit = CircuitBreaker(failure_threshold=3, recovery_timeout=60)
+        for _ in range(3):
+            circuit.record_failure()
+
+        circuit._CircuitBreaker__opened_at -= 60
+        self.assertTrue(circuit.allow())
+
+        circuit.record_failure()
+        self.assertIs(circuit.state, CircuitState.OPEN)
+
+
+class RequestSchedulerTest(unittest.TestCase):
+    def test_grants_by_priority(self):
+        async def main():
+            scheduler = RequestScheduler(max_concurrency=1)
+            await scheduler.acquire()
+
+            order = []
+
+            async def request(priority, name):
+                await scheduler.acquire(priority)
+                order.append(name)
+                scheduler.release()
+
+            tasks = [
+                asyncio.ensure_future(request(RequestPriority.BULK, 'bulk')),
+                asyncio.ensure_future(request(RequestPriority.INTERACTIVE, 'interactive'))
+            ]
+            await asyncio.sleep(0)
+
+            scheduler.release()
+            await asyncio.gather(*tasks)
+
+            self.assertEqual(order, ['interactive', 'bulk'])
+            self.assertEqual(scheduler.active, 0)
+
+        run(main())
+
+
+class HTTPClientTest(unittest.TestCase):
+    def test_request_cancelled_while_queued_frees_trial(self):
+        async def main():
+            circuit = CircuitBreaker(failure_threshold=1, recovery_timeout=0)
+            circuit.record_failure()
+
+            client = HTTPClient(_Session(), 'localhost', '3030', 'password', max_concurrency=1, circuit_breaker=circuit)
+            await client.scheduler.acquire()
+
+            queued = asyncio.ensure_future(client.request('GET', '/loadtracks'))
+            await asyncio.sleep(0)
+
+            queued.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await queued
+
+            client.scheduler.release()
+            self.assertEqual(await client.request('GET', '/loadtracks'), {'ok': True})
+            self.assertIs(circuit.state, CircuitState.CLOSED)
+
+        run(main())
+
+    def test_open_circuit_fails_fast(self):
+        async def main():
+            circuit = CircuitBreaker(failure_threshold=1, recovery_timeout=60)
+            circuit.record_failure()
+
+            client = HTTPClient(_Session(), 'localhost', '3030', 'password', circuit_breaker=circuit)
+            with self.assertRaises(CircuitOpen):
+                await client.request('GET', '/loadtracks')
+
+            self.assertEqual(client.scheduler.active, 0)
+
+        run(main())
+
+
+class StreamTest(unittest.TestCase):
+    def make_client(self, count=5):
+        session = _Session(_playlist_body(count))
+        return session, HTTPClient(session, 'localhost', '3030', 'password', max_concurrency=1)
+
+    def test_slot_released_after_headers(self):
+        async def main():
+            session, client = self.make_client()
+            entries = client.stream_load_tracks('query', chunk_size=64)
+
+            self.assertEqual((await entries.__anext__())[0], 'load_type')
+            self.assertEqual(client.scheduler.active, 0)
+            self.assertEqual(await client.request('GET', '/loadtracks'), {'ok': True})
+
+            await entries.aclose()
+            self.assertTrue(session.responses[0].closed)
+            self.assertEqual(client.scheduler.active, 0)
+
+        run(main())
+
+    def test_track_stream(self):
+        async def main():
+            session, client = self.make_client()
+            searcher = TrackSearcher(SimpleNamespace(http=client, identifier='MAIN'))
+
+            async with searcher.stream_tracks('https://example.com/mix') as stream:
+                titles = [track.title async for track in stream]
+
+            self.assertEqual(titles, [str(i) for i in range(5)])
+            self.assertEqual(stream.playlist_info['name'], 'Mix')
+            self.assertEqual(stream.playlist_info['uri'], 'https://example.com/mix')
+
+        run(main())
+
+    def test_track_stream_closes_early(self):
+        async def main():
+            session, client = self.make_client(50)
+            searcher = TrackSearcher(SimpleNamespace(http=client, identifier='MAIN'))
+
+            async with searcher.stream_tracks('https://example.com/mix') as stream:
+                async for track in stream:
+                    break
+
+            self.assertTrue(session.responses[0].closed)
+
+            with self.assertRaises(RuntimeError):
+                async for track in searcher.stream_tracks('https://example.com/mix'):
+                    pass
+
+            self.assertEqual(client.scheduler.active, 0)
+
+        run(main())
+
+
+if __name__ == '__main__':
+    unittest.main()
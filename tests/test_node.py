@@ -0,0 +1,166 @@
+import asyncio
+import sqlite3
+import unittest
+
+from types import SimpleNamespace
+
+from obsidian.cache import TrackCache
+from obsidian.enums import OpCode
+from obsidian.node import Node
+
+from .utils import make_info, make_track, run
+
+
+class _BrokenCache(TrackCache):
+    def get(self, key, *, count=True):
+        raise sqlite3.OperationalError('database is locked')
+
+    def put(self, key, value, *, negative=False):
+        raise sqlite3.OperationalError('database is locked')
+
+
+class DecodeCacheTest(unittest.TestCase):
+    def make_node(self, **kwargs):
+        loop = asyncio.get_event_loop()
+        node = Node(SimpleNamespace(loop=loop), session=object(), loop=loop, **kwargs)
+        node.requests = []
+
+        async def decode_track(id):
+            node.requests.append(id)
+            return make_info('Remote')
+
+        async def decode_tracks(ids):
+            node.requests.extend(ids)
+            return {'tracks': [make_info('Remote') for _ in ids]}
+
+        node.http.decode_track = decode_track
+        node.http.decode_tracks = decode_tracks
+        return node
+
+    def test_uses_separate_cache(self):
+        async def main():
+            search_cache, decode_cache = TrackCache(), TrackCache()
+            node = self.make_node(search_cache=search_cache, decode_cache=decode_cache)
+
+            await node.decode_track('undecodable')
+            self.assertEqual(len(search_cache), 0)
+            self.assertIn('undecodable', decode_cache)
+
+            await node.decode_track('undecodable')
+            tracks = await node.decode_tracks(['undecodable', make_track().id, 'other'])
+
+            self.assertEqual(node.requests, ['undecodable', 'other'])
+            self.assertEqual([track.title for track in tracks], ['Remote', make_track().title, 'Remote'])
+            self.assertEqual(len(search_cache), 0)
+
+        run(main())
+
+    def test_broken_cache_falls_back_to_requests(self):
+        async def main():
+            node = self.make_node(decode_cache=_BrokenCache())
+
+            with self.assertLogs('obsidian.node', level='WARNING'):
+                track = await node.decode_track('undecodable')
+                tracks = await node.decode_tracks(['undecodable'])
+
+            self.assertEqual(track.title, 'Remote')
+            self.assertEqual([track.title for track in tracks], ['Remote'])
+            self.assertEqual(node.requests, ['undecodable', 'undecodable'])
+
+        run(main())
+
+    def test_abandoned_chunks_are_awaited(self):
+        async def main():
+            node = self.make_node()
+            never = asyncio.get_event_loop().create_future()
+
+            async def decode_tracks(ids):
+                if ids == ['second']:
+                    await never
+
+                return {'tracks': [make_info('Remote') for _ in ids]}
+
+            node.http.decode_tracks = decode_tracks
+
+            tracks = node.iter_decode_tracks(['first', 'second'], chunk_size=1)
+            track = await tracks.__anext__()
+            await tracks.aclose()
+
+            self.assertEqual(track.title, 'Remote')
+            self.assertEqual(asyncio.all_tasks(), {asyncio.current_task()})
+
+        run(main())
+
+
+class _Websocket:
+    def __init__(self):
+        self.connected = False
+        self.sent = []
+
+    async def send_str(self, data):
+        self.sent.append(data)
+
+
+class _Player:
+    def __init__(self):
+        self.restored = 0
+
+    async def restore(self):
+        self.restored += 1
+
+
+class _SmallBufferNode(Node):
+    MAX_BUFFERED_PAYLOADS = 2
+
+
+class ResumeBufferTest(unittest.TestCase):
+    def make_node(self):
+        loop = asyncio.get_event_loop()
+        node = _SmallBufferNode(SimpleNamespace(loop=loop), session=object(), loop=loop, resume_key='key')
+        node._BaseNode__ws = ws = _Websocket()
+        node._players[1] = player = _Player()
+        return node, ws, player
+
+    def test_flushes_buffer_on_resume(self):
+        async def main():
+            node, ws, player = self.make_node()
+            await node.send(OpCode.PLAYER_PAUSE, {'guild_id': '1', 'state': True})
+            await node.send(OpCode.PLAYER_PAUSE, {'guild_id': '1', 'state': False})
+
+            ws.connected = True
+            await node.handle_ws_ready(resumed=True)
+
+            self.assertEqual([node.codec.loads(data)['op'] for data in ws.sent[1:]], [OpCode.PLAYER_PAUSE.value] * 2)
+            self.assertEqual(player.restored, 0)
+
+        run(main())
+
+    def test_restores_players_after_dropping_payloads(self):
+        async def main():
+            node, ws, player = self.make_node()
+
+            with self.assertLogs('obsidian.node', level='WARNING') as logs:
+                for state in (True, False, True):
+                    await node.send(OpCode.PLAYER_PAUSE, {'guild_id': '1', 'state': state})
+
+                ws.connected = True
+                await node.handle_ws_ready(resumed=True)
+
+            self.assertEqual(len(logs.records), 2)
+            self.assertEqual([node.codec.loads(data)['op'] for data in ws.sent], [OpCode.SETUP_RESUMING.value])
+            self.assertEqual(player.restored, 1)
+
+            # The next resume flushes normally again
+            ws.connected = False
+            await node.send(OpCode.PLAYER_PAUSE, {'guild_id': '1', 'state': True})
+            ws.connected = True
+            await node.handle_ws_ready(resumed=True)
+
+            self.assertEqual(len(ws.sent), 3)
+            self.assertEqual(player.restored, 1)
+
+        run(main())
+
+
+if __name__ == '__main__':
+    unittest.main()
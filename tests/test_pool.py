@@ -0,0 +1,21 @@
+import unittest
+
+from types import SimpleNamespace
+
+from obsidian.pool import _NodePool
+
+
+class GetNodeTest(unittest.TestCase):
+    def test_get_node(self):
+        pool = _NodePool()
+        self.assertIsNone(pool.get_node())
+
+        pool.nodes['a'] = node = SimpleNamespace(identifier='a', available=True)
+
+        self.assertIs(pool.get_node('a'), node)
+        self.assertIsNone(pool.get_node('b'))
+        self.assertIsNone(pool.get_node())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,381 @@
+import asyncio
+import random
+import unittest
+
+from bisect import bisect_right
+from collections import deque
+from itertools import accumulate
+
+from obsidian.queue import DurationIndex, LoopType, PointerBasedQueue, Queue, QueueFull
+from obsidian.store import BlockList, TrackStore
+from obsidian.track import Playlist
+
+from .utils import make_info, make_track, run
+
+
+class _SmallDurationIndex(DurationIndex):
+    BLOCK_SIZE = 2
+
+
+class DurationIndexTest(unittest.TestCase):
+    def assertMatches(self, index, expected):
+        prefixes = [0, *accumulate(expected)]
+
+        self.assertEqual(len(index), len(expected))
+        self.assertEqual(index.total, prefixes[-1])
+        self.assertEqual([index[i] for i in range(len(expected))], expected)
+        self.assertEqual([index.prefix(i) for i in range(len(expected) + 1)], prefixes)
+
+        for time in range(-1, prefixes[-1] + 2, max(prefixes[-1] // 100, 1)):
+            found = bisect_right(prefixes, max(time, 0)) - 1
+            self.assertEqual(index.find(time), found if found < len(expected) else None, time)
+
+    def test_matches_list(self):
+        for cls in (DurationIndex, _SmallDurationIndex):
+            with self.subTest(cls=cls.__name__):
+                self.check_matches_list(cls())
+
+    def check_matches_list(self, index):
+        rng = random.Random(0)
+        expected = []
+
+        for _ in range(1500):
+            operation = rng.randrange(9)
+            length = rng.choice((0, rng.randrange(1, 50)))
+
+            if operation == 0:
+                index.append(length)
+                expected.append(length)
+            elif operation == 1:
+                index.appendleft(length)
+                expected.insert(0, length)
+            elif operation == 2:
+                position = rng.randrange(-3, len(expected) + 3)
+                index.insert(position, length)
+                expected.insert(max(position + len(expected), 0) if position < 0 else position, length)
+            elif operation == 3:
+                lengths = [rng.randrange(50) for _ in range(rng.choice((3, 3, 70)))]
+                index.extend(lengths)
+                expected.extend(lengths)
+            elif operation == 4:
+                lengths = [rng.randrange(50) for _ in range(rng.randrange(5))]
+                position = rng.randrange(-3, len(expected) + 3)
+                index.insert_many(position, lengths)
+                position = max(position + len(expected), 0) if position < 0 else position
+                expected[position:position] = lengths
+            elif not expected:
+                continue
+            elif operation == 5:
+                self.assertEqual(index.pop(), expected.pop())
+            elif operation == 6:
+                self.assertEqual(index.popleft(), expected.pop(0))
+            elif operation == 7:
+                position = rng.randrange(len(expected))
+                self.assertEqual(index.remove(position), expected.pop(position))
+            else:
+                position = rng.randrange(len(expected))
+                index.set(position, length)
+                expected[position] = length
+
+            self.assertEqual(index.total, sum(expected))
+
+            if rng.random() < 0.1:
+                self.assertMatches(index, expected)
+
+        self.assertMatches(index, expected)
+        self.assertMatches(index.copy(), expected)
+
+    def test_blocks_grow_with_square_root(self):
+        index = _SmallDurationIndex()
+
+        for i in range(10000):
+            index.insert(i // 2, i)
+
+        self.assertLessEqual(len(index._blocks), 3 * int(len(index) ** 0.5))
+        self.assertEqual(index.total, sum(range(10000)))
+
+    def test_popleft_until_empty(self):
+        index = _SmallDurationIndex(range(1, 101))
+
+        for length in range(1, 100):
+            self.assertEqual(index.popleft(), length)
+            self.assertEqual(index.find(0), 0)
+
+        self.assertMatches(index, [100])
+        index.popleft()
+        self.assertMatches(index, [])
+
+        index.append(5)
+        self.assertMatches(index, [5])
+
+
+class GetWaitTest(unittest.TestCase):
+    def test_returns_available_track(self):
+        async def main():
+            queue = Queue(None)
+            track = make_track()
+            queue.add(track)
+            self.assertIs(await queue.get_wait(), track)
+
+        run(main())
+
+    def test_times_out(self):
+        async def main():
+            queue = Queue(None)
+            with self.assertRaises(asyncio.TimeoutError):
+                await queue.get_wait(timeout=0.01)
+
+            self.assertEqual(queue.waiters, 0)
+
+        run(main())
+
+    def test_add_right_after_scheduling_wakes_waiter(self):
+        async def main():
+            queue = Queue(None)
+            track = make_track()
+
+            waiter = asyncio.ensure_future(queue.get_wait(timeout=0.5))
+            await asyncio.sleep(0)
+            queue.add(track)
+
+            self.assertIs(await waiter, track)
+
+        run(main())
+
+    def test_waiters_are_woken_in_order(self):
+        async def main():
+            queue = Queue(None)
+            tracks = [make_track(str(i)) for i in range(2)]
+
+            first = asyncio.ensure_future(queue.get_wait())
+            second = asyncio.ensure_future(queue.get_wait())
+            await asyncio.sleep(0)
+            self.assertEqual(queue.waiters, 2)
+
+            queue.extend(tracks)
+            self.assertEqual([await first, await second], tracks)
+
+        run(main())
+
+    def test_cancelled_waiter_hands_over_wakeup(self):
+        async def main():
+            queue = Queue(None)
+            track = make_track()
+
+            first = asyncio.ensure_future(queue.get_wait())
+            second = asyncio.ensure_future(queue.get_wait())
+            await asyncio.sleep(0)
+
+            queue.add(track)
+            first.cancel()
+
+            self.assertIs(await second, track)
+            self.assertTrue(first.cancelled())
+
+        run(main())
+
+    def test_pointer_queue_waits_once_exhausted(self):
+        async def main():
+            queue = PointerBasedQueue()
+            first, second = make_track('first'), make_track('second')
+
+            queue.add(first)
+            self.assertIs(await queue.get_wait(), first)
+
+            waiter = asyncio.ensure_future(queue.get_wait())
+            await asyncio.sleep(0)
+            self.assertFalse(waiter.done())
+
+            queue.add(second)
+            self.assertIs(await waiter, second)
+
+        run(main())
+
+
+class BulkInsertTest(unittest.TestCase):
+    BACKINGS = (deque, BlockList, TrackStore)
+
+    def test_extend_and_insert_many(self):
+        tracks = [make_track(str(i), length=1000 * (i + 1)) for i in range(12)]
+
+        for backing in self.BACKINGS:
+            with self.subTest(backing=backing.__name__):
+                queue = Queue(None, cls=backing)
+                queue.extend(tracks[:4])
+                queue.insert_many(1, tracks[4:8])
+                queue.insert_many(-1, tracks[8:10])
+                queue.insert_many(100, tracks[10:])
+
+                expected = tracks[:1] + tracks[4:8] + tracks[1:3] + tracks[8:10] + tracks[3:4] + tracks[10:]
+                self.assertEqual([track.id for track in queue], [track.id for track in expected])
+                self.assertEqual(queue.duration, sum(track.length for track in expected))
+                self.assertEqual(queue.time_until(5), sum(track.length for track in expected[:5]))
+
+    def test_partial(self):
+        tracks = [make_track(str(i)) for i in range(6)]
+
+        for backing in self.BACKINGS:
+            with self.subTest(backing=backing.__name__):
+                queue = Queue(4, cls=backing)
+                queue.extend(tracks[:2])
+
+                with self.assertRaises(QueueFull):
+                    queue.insert_many(0, tracks[2:])
+
+                self.assertEqual(queue.count, 2)
+
+                result = queue.insert_many(1, tracks[2:], partial=True)
+                self.assertEqual((result.added, result.dropped), (2, 2))
+                self.assertEqual(
+                    [track.id for track in queue],
+                    [track.id for track in (tracks[0], tracks[2], tracks[3], tracks[1])]
+                )
+
+    def test_extend_raises_without_adding(self):
+        tracks = [make_track(str(i)) for i in range(6)]
+
+        for backing in self.BACKINGS:
+            with self.subTest(backing=backing.__name__):
+                queue = Queue(4, cls=backing)
+                queue.extend(tracks[:2])
+
+                with self.assertRaises(QueueFull):
+                    queue.extend(tracks[2:])
+
+                self.assertEqual([track.id for track in queue], [track.id for track in tracks[:2]])
+
+                playlist = Playlist(
+                    info={'name': 'Mix'},
+                    tracks=[{'track': track.id, 'info': make_info(track.title)} for track in tracks[2:]]
+                )
+                with self.assertRaises(QueueFull):
+                    queue.add(playlist)
+
+                self.assertEqual(queue.count, 2)
+
+    def test_extend_partial(self):
+        tracks = [make_track(str(i)) for i in range(6)]
+
+        for backing in self.BACKINGS:
+            with self.subTest(backing=backing.__name__):
+                queue = Queue(4, cls=backing)
+                queue.extend(tracks[:2])
+
+                result = queue.extend(tracks[2:], partial=True)
+                self.assertEqual((result.added, result.dropped), (2, 2))
+                self.assertEqual([track.id for track in queue], [track.id for track in tracks[:4]])
+                self.assertTrue(queue.full)
+
+                result = queue.extend(tracks[4:], partial=True)
+                self.assertEqual((result.added, result.dropped), (0, 2))
+                self.assertEqual(queue.count, 4)
+
+    def test_wakes_waiters(self):
+        async def main():
+            queue = Queue(None, cls=BlockList)
+            queue.add(make_track('0'))
+            queue.get()
+
+            waiter = asyncio.ensure_future(queue.get_wait())
+            await asyncio.sleep(0)
+
+            tracks = [make_track(str(i)) for i in range(3)]
+            queue.insert_many(0, tracks)
+            self.assertIs(await waiter, tracks[0])
+
+        run(main())
+
+
+class HistoryTest(unittest.TestCase):
+    def test_follows_inserts(self):
+        tracks = [make_track(str(i)) for i in range(8)]
+        queue = PointerBasedQueue(None)
+        queue.extend(tracks[:4])
+
+        played = [queue.get() for _ in range(3)]
+        history = queue._PointerBasedQueue__history
+
+        queue.add(tracks[4])
+        queue.extend(tracks[5:6])
+        queue.insert(1, tracks[6])
+        queue.add(tracks[7], left=True)
+
+        self.assertIs(queue._PointerBasedQueue__history, history)
+        self.assertEqual(queue.history, played[:2])
+        self.assertIs(queue.current, played[2])
+
+        queue.remove(played[0])
+        self.assertEqual(queue.history, played[1:2])
+        self.assertIs(queue.previous, played[1])
+
+
+class ShuffleTest(unittest.TestCase):
+    def setUp(self):
+        self.tracks = [make_track(str(i), length=1000 * (i + 1)) for i in range(5)]
+
+    def make_queue(self, **kwargs):
+        queue = PointerBasedQueue(None, **kwargs)
+        queue.extend(self.tracks)
+        queue.shuffle = True
+        return queue
+
+    def test_plays_every_track_once(self):
+        queue = self.make_queue()
+        played = [queue.get() for _ in range(5)]
+
+        self.assertCountEqual(played, self.tracks)
+        self.assertIsNone(queue.get())
+        self.assertEqual(queue.history, played)
+
+    def test_back(self):
+        queue = self.make_queue()
+        first, second = queue.get(), queue.get()
+
+        self.assertIs(queue.previous, first)
+        self.assertIs(queue.back(), first)
+        self.assertIs(queue.current, first)
+        self.assertIsNot(first, second)
+
+    def test_new_cycle_skips_current_track(self):
+        queue = self.make_queue(default_loop_type=LoopType.QUEUE)
+        random.seed(0)
+
+        played = [queue.get() for _ in range(200)]
+        self.assertCountEqual(played[:5], self.tracks)
+
+        for previous, track in zip(played, played[1:]):
+            self.assertIsNot(previous, track)
+
+    def test_single_track_loops(self):
+        queue = PointerBasedQueue(None, default_loop_type=LoopType.QUEUE)
+        queue.add(self.tracks[0])
+        queue.shuffle = True
+
+        self.assertIs(queue.get(), self.tracks[0])
+        self.assertIs(queue.get(), self.tracks[0])
+
+    def test_estimates(self):
+        queue = self.make_queue()
+        self.assertEqual(queue.remaining(), sum(track.length for track in self.tracks))
+
+        current = queue.get()
+        index = queue.index
+        other = (index + 1) % 5
+
+        self.assertEqual(queue.time_until(index), 0)
+        self.assertIsNone(queue.time_until(other))
+
+        self.assertEqual(queue.index_at(current.length - 501, position=500), index)
+        self.assertIsNone(queue.index_at(current.length, position=0))
+
+        self.assertEqual(queue.remaining(500), sum(track.length for track in self.tracks) - 500)
+
+        queue.get()
+        self.assertEqual(
+            queue.remaining(),
+            sum(track.length for track in self.tracks) - current.length
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+import asyncio
+import unittest
+
+from types import SimpleNamespace
+from unittest import mock
+
+from obsidian.cache import TrackCache
+from obsidian.pool import NodePool
+from obsidian.search import TrackSearcher
+
+from .utils import run
+
+
+class _Searcher(TrackSearcher):
+    def __init__(self, node, delay, **kwargs):
+        super().__init__(node, hedge=True, **kwargs)
+        self.delay = delay
+        self.cancelled = False
+
+    async def _fetch(self, query, priority=None):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+
+        return {'node': self.node.identifier}
+
+
+def _make_searcher(identifier, delay):
+    node = SimpleNamespace(identifier=identifier, loop=asyncio.get_event_loop())
+    node.searcher = _Searcher(node, delay, hedge_delay=0.01)
+    return node.searcher
+
+
+class HedgeTest(unittest.TestCase):
+    def test_uses_faster_node(self):
+        async def main():
+            primary, backup = _make_searcher('A', 1), _make_searcher('B', 0)
+
+            with mock.patch.object(NodePool, 'get_best_node', return_value=backup.node):
+                self.assertEqual(await primary._hedged_fetch('query'), {'node': 'B'})
+
+            await asyncio.sleep(0)
+            self.assertEqual(primary.hedged, 1)
+            self.assertTrue(primary.cancelled)
+
+        run(main())
+
+    def test_cancelled_before_hedging(self):
+        async def main():
+            searcher = _make_searcher('A', 1)
+            searcher.hedge_delay = 1
+
+            task = asyncio.ensure_future(searcher._hedged_fetch('query'))
+            await asyncio.sleep(0.01)
+            task.cancel()
+
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+            await asyncio.sleep(0)
+            self.assertTrue(searcher.cancelled)
+
+        run(main())
+
+    def test_cancelled_through_shared_load(self):
+        async def main():
+            searcher = _make_searcher('A', 1)
+            searcher.hedge_delay = 1
+
+            first = asyncio.ensure_future(searcher._execute('shared query'))
+            second = asyncio.ensure_future(searcher._execute('shared query'))
+            await asyncio.sleep(0.01)
+
+            first.cancel()
+            await asyncio.sleep(0.01)
+            self.assertFalse(searcher.cancelled)
+
+            second.cancel()
+            await asyncio.sleep(0.01)
+            self.assertTrue(searcher.cancelled)
+
+            for task in (first, second):
+                with self.assertRaises(asyncio.CancelledError):
+                    await task
+
+        run(main())
+
+
+class CacheTest(unittest.TestCase):
+    def test_broken_cache_falls_back_to_loading(self):
+        class BrokenCache(TrackCache):
+            def get(self, key, *, count=True):
+                raise ValueError('corrupt')
+
+            def put(self, key, value, *, negative=False):
+                raise ValueError('corrupt')
+
+        async def main():
+            async def load_tracks(query, priority=None):
+                return {'load_type': 'TRACK_LOADED', 'tracks': []}
+
+            node = SimpleNamespace(identifier='A', http=SimpleNamespace(load_tracks=load_tracks))
+            searcher = TrackSearcher(node, cache=BrokenCache())
+
+            with self.assertLogs('obsidian.node', level='WARNING'):
+                self.assertEqual(await searcher._execute('broken query'), {'load_type': 'TRACK_LOADED', 'tracks': []})
+
+        run(main())
+
+
+class LatencyTest(unittest.TestCase):
+    def test_records_cancelled_and_failed_loads(self):
+        async def main():
+            async def load_tracks(query, priority=None):
+                if query == 'fail':
+                    raise RuntimeError(query)
+
+                await asyncio.sleep(1)
+
+            node = SimpleNamespace(identifier='A', http=SimpleNamespace(load_tracks=load_tracks))
+            searcher = TrackSearcher(node)
+            latencies = searcher._TrackSearcher__latencies
+
+            with self.assertRaises(RuntimeError):
+                await searcher._fetch('fail')
+
+            task = asyncio.ensure_future(searcher._fetch('slow'))
+            await asyncio.sleep(0.05)
+            task.cancel()
+
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+            self.assertEqual(len(latencies), 2)
+            self.assertGreaterEqual(latencies[-1], 0.04)
+
+        run(main())
+
+
+if __name__ == '__main__':
+    unittest.main()
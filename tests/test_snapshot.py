@@ -0,0 +1,135 @@
+import io
+import unittest
+
+from obsidian.filters import FilterSink, TimescaleFilter, VolumeFilter
+from obsidian.queue import LoopType, PointerBasedQueue, Queue, QueueFull
+from obsidian.snapshot import PlayerState, dump_states, load_states
+from obsidian.track import Track
+
+from .utils import make_id, make_info, make_spotify_track, make_track
+
+
+class QueueSnapshotTest(unittest.TestCase):
+    def setUp(self):
+        self.tracks = [make_track(str(i), length=1000 * (i + 1)) for i in range(10)]
+
+    def test_round_trip(self):
+        queue = PointerBasedQueue(history_size=5)
+        queue.extend(self.tracks)
+        queue.set_loop_type(LoopType.QUEUE)
+        for _ in range(4):
+            queue.get()
+
+        restored = PointerBasedQueue()
+        restored.restore(queue.snapshot())
+
+        self.assertEqual([track.id for track in restored], [track.id for track in queue])
+        self.assertEqual(restored.index, queue.index)
+        self.assertIs(restored.loop_type, LoopType.QUEUE)
+        self.assertEqual([track.id for track in restored.history], [track.id for track in queue.history])
+        self.assertEqual(restored.duration, queue.duration)
+        self.assertEqual(restored.snapshot(), queue.snapshot())
+
+    def test_shuffle_progress_is_kept(self):
+        queue = PointerBasedQueue()
+        queue.extend(self.tracks)
+        queue.set_shuffle(True)
+        played = {queue.get().id for _ in range(4)}
+
+        restored = PointerBasedQueue()
+        restored.restore(queue.snapshot())
+
+        rest = {restored.get().id for _ in range(6)}
+        self.assertTrue(restored.shuffle)
+        self.assertEqual(played | rest, {track.id for track in self.tracks})
+        self.assertIsNone(restored.get())
+
+    def test_exhausted_pointer(self):
+        queue = PointerBasedQueue()
+        queue.extend(self.tracks[:2])
+        for _ in range(3):
+            queue.get()
+
+        restored = PointerBasedQueue()
+        restored.restore(queue.snapshot())
+        restored.add(self.tracks[5])
+
+        self.assertIs(restored.get(), restored[2])
+
+    def test_tracks_without_decodable_ids(self):
+        undecodable = Track(id=make_id('Future', version=9), info=make_info('Future'))
+        queue = Queue(None)
+        queue.extend([make_spotify_track('Spotify'), undecodable, self.tracks[0]])
+
+        restored = Queue(None)
+        restored.restore(queue.snapshot())
+
+        self.assertEqual([track.title for track in restored], ['Spotify', 'Future', '0'])
+        self.assertEqual([track.id for track in restored], [track.id for track in queue])
+
+    def test_rejects_malformed_data(self):
+        queue = Queue(None)
+        queue.extend(self.tracks)
+        data = queue.snapshot()
+
+        for bad in (data[:-1], data + b'\0', b'XXX' + data[3:]):
+            with self.assertRaises(ValueError):
+                Queue(None).restore(bad)
+
+    def test_respects_max_size(self):
+        queue = Queue(None)
+        queue.extend(self.tracks)
+
+        target = Queue(3)
+        target.add(self.tracks[0])
+
+        with self.assertRaises(QueueFull):
+            target.restore(queue.snapshot())
+
+        self.assertEqual(len(target), 1)
+
+
+class PlayerStateTest(unittest.TestCase):
+    def test_file_round_trip(self):
+        queue = Queue(None)
+        queue.extend([make_track('a'), make_track('b')])
+
+        sink = FilterSink(None)
+        sink.add(VolumeFilter(0.5))
+        sink.add(TimescaleFilter(pitch_semitones=2))
+        filters = sink.to_json()['filters']
+
+        states = [
+            PlayerState(
+                guild_id=2 ** 63,
+                channel_id=5,
+                track=make_spotify_track('current'),
+                position=1500,
+                paused=True,
+                filters=filters,
+                queue=queue.snapshot()
+            ),
+            PlayerState(guild_id=1)
+        ]
+
+        fp = io.BytesIO()
+        self.assertEqual(dump_states(states, fp), 2)
+        fp.seek(0)
+
+        first, second = load_states(fp)
+
+        self.assertEqual(first.guild_id, 2 ** 63)
+        self.assertEqual(first.channel_id, 5)
+        self.assertEqual(first.track.title, 'current')
+        self.assertEqual((first.position, first.paused), (1500, True))
+        self.assertEqual(first.queue, states[0].queue)
+        self.assertEqual(FilterSink(None).load(first.filters).to_json()['filters'], filters)
+
+        self.assertIsNone(second.track)
+        self.assertIsNone(second.channel_id)
+        self.assertIsNone(second.queue)
+        self.assertEqual(second.filters, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
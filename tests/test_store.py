@@ -0,0 +1,187 @@
+import random
+import unittest
+
+from collections import deque
+
+from obsidian.store import BlockList, TrackStore, _StringColumn
+
+from .utils import make_spotify_track, make_track
+
+
+class BlockListTest(unittest.TestCase):
+    def test_matches_deque(self):
+        rng = random.Random(0)
+        tracks = [make_track(str(i)) for i in range(50)]
+
+        blocks = BlockList()
+        blocks.BLOCK_SIZE = 4
+        expected = deque()
+
+        for _ in range(3000):
+            action = rng.random()
+            track = rng.choice(tracks)
+
+            if action < 0.4 or not expected:
+                index = rng.randint(-len(expected) - 1, len(expected) + 1)
+                blocks.insert(index, track)
+                expected.insert(index, track)
+            elif action < 0.6:
+                index = rng.randrange(len(expected))
+                del blocks[index]
+                del expected[index]
+            elif action < 0.7:
+                self.assertIs(blocks.popleft(), expected.popleft())
+            elif action < 0.8:
+                self.assertIs(blocks.pop(), expected.pop())
+            elif action < 0.9 and track in expected:
+                self.assertIs(blocks[blocks.index(track)], track)
+                blocks.remove(track)
+                expected.remove(track)
+            else:
+                blocks.append(track)
+                expected.append(track)
+
+            self.assertEqual(len(blocks), len(expected))
+            self.assertEqual(track in blocks, track in expected)
+
+        self.assertEqual(list(blocks), list(expected))
+        self.assertEqual(list(reversed(blocks)), list(reversed(expected)))
+
+    def test_placeholder_ids_match_by_identity(self):
+        first, second = make_spotify_track('A'), make_spotify_track('B')
+        blocks = BlockList([first])
+
+        self.assertIn(first, blocks)
+        self.assertNotIn(second, blocks)
+        self.assertEqual(blocks.count(second), 0)
+
+        with self.assertRaises(ValueError):
+            blocks.remove(second)
+
+        blocks.append(second)
+        self.assertEqual(blocks.index(second), 1)
+
+    def test_insert_many(self):
+        tracks = [make_track(str(i)) for i in range(40)]
+        blocks = BlockList()
+        blocks.BLOCK_SIZE = 4
+        expected = []
+
+        for index, start in ((0, 0), (0, 5), (3, 10), (-2, 12), (100, 30), (7, 35)):
+            batch = tracks[start:start + 5]
+            blocks.insert_many(index, batch)
+            expected[index:index] = batch
+
+            self.assertEqual(list(blocks), expected)
+
+        for track in tracks:
+            self.assertEqual(track in blocks, track in expected)
+
+        self.assertEqual(blocks.index(tracks[12]), expected.index(tracks[12]))
+        limit = 2 * max(blocks.BLOCK_SIZE, int(len(blocks) ** 0.5))
+        self.assertLessEqual(max(len(block) for block in blocks._BlockList__blocks), limit)
+
+    def test_block_count_grows_with_square_root(self):
+        tracks = [make_track(str(i)) for i in range(10)]
+        blocks = BlockList()
+        blocks.BLOCK_SIZE = 4
+
+        for i in range(20000):
+            blocks.append(tracks[i % 10])
+
+        self.assertLessEqual(len(blocks._BlockList__blocks), 3 * int(len(blocks) ** 0.5))
+
+
+class TrackStoreTest(unittest.TestCase):
+    def test_round_trip(self):
+        tracks = [make_track(str(i), length=i) for i in range(5)] + [make_spotify_track('spotify')]
+        store = TrackStore(tracks)
+
+        self.assertEqual([track.title for track in store], [track.title for track in tracks])
+        self.assertEqual([track.id for track in store], [track.id for track in tracks])
+        self.assertEqual(store[-1].title, 'spotify')
+
+    def test_deque_operations(self):
+        tracks = [make_track(str(i)) for i in range(5)]
+        store = TrackStore(tracks)
+
+        self.assertEqual(store.popleft().title, '0')
+        self.assertEqual(store.pop().title, '4')
+
+        store.appendleft(tracks[0])
+        store.insert(2, tracks[4])
+        self.assertEqual([track.title for track in store], ['0', '1', '4', '2', '3'])
+
+        del store[1]
+        store.remove(tracks[2])
+        self.assertEqual([track.title for track in store], ['0', '4', '3'])
+        self.assertEqual(store.index(tracks[3]), 2)
+
+    def test_insert_many(self):
+        tracks = [make_track(str(i), length=i) for i in range(20)] + [make_spotify_track('spotify')]
+        store = TrackStore(tracks[:4])
+        expected = tracks[:4]
+
+        store.popleft()
+        del expected[0]
+
+        for index, start in ((0, 4), (2, 8), (-1, 12), (100, 16)):
+            batch = tracks[start:start + 4] + ([tracks[-1]] if start == 16 else [])
+            store.insert_many(index, batch)
+            expected[index:index] = batch
+
+            self.assertEqual([track.id for track in store], [track.id for track in expected])
+
+        self.assertEqual([track.length for track in store], [track.length for track in expected])
+        self.assertEqual(store[-1].title, 'spotify')
+
+    def test_placeholder_ids_match_by_metadata(self):
+        store = TrackStore([make_spotify_track('A')])
+
+        self.assertIn(make_spotify_track('A'), store)
+        self.assertNotIn(make_spotify_track('B'), store)
+
+        with self.assertRaises(ValueError):
+            store.remove(make_spotify_track('B'))
+
+    def test_strings_are_packed(self):
+        tracks = [make_track('Títle ✓ %d' % i) for i in range(10)] + [make_spotify_track('spotify')]
+        store = TrackStore(tracks)
+
+        self.assertIsInstance(store._TrackStore__titles, _StringColumn)
+        self.assertEqual([track.title for track in store], [track.title for track in tracks])
+        self.assertEqual([track.id for track in store], [track.id for track in tracks])
+        self.assertEqual([track.uri for track in store], [track.uri for track in tracks])
+
+        copied = store.copy()
+        copied[0] = tracks[5]
+        self.assertEqual(copied[0].title, tracks[5].title)
+        self.assertEqual(store[0].title, tracks[0].title)
+
+    def test_heap_is_compacted(self):
+        tracks = [make_track('x' * 200 + str(i)) for i in range(1000)]
+        store = TrackStore()
+
+        for _ in range(5):
+            store.extend(tracks)
+            for _ in range(len(tracks)):
+                store.pop()
+
+        store.extend(tracks[:10])
+        heap = store._TrackStore__heap
+
+        self.assertLess(len(heap.buffer), 4 * 1024 * 200)
+        self.assertEqual([track.title for track in store], [track.title for track in tracks[:10]])
+
+    def test_popleft_compacts(self):
+        tracks = [make_track(str(i)) for i in range(3000)]
+        store = TrackStore(tracks)
+
+        for track in tracks[:2500]:
+            self.assertEqual(store.popleft().id, track.id)
+
+        self.assertEqual([track.title for track in store], [track.title for track in tracks[2500:]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import gc
+import unittest
+
+from obsidian.track import Playlist, Track, TrackInfo, _is_track_id
+from obsidian.store import TrackStore
+
+from .utils import make_id, make_info, make_spotify_track, make_track
+
+
+class TrackInfoInternTest(unittest.TestCase):
+    def test_same_id_shares_info(self):
+        id = make_id('Interned')
+        first = Track(id=id, info=make_info('Interned'), intern=True)
+        second = Track(id=id, info=make_info('Interned'), intern=True)
+
+        self.assertIs(first.info, second.info)
+
+    def test_placeholder_ids_are_not_interned(self):
+        first = make_spotify_track('A', intern=True)
+        second = make_spotify_track('B', intern=True)
+
+        self.assertEqual((first.title, second.title), ('A', 'B'))
+        self.assertIsNot(first.info, second.info)
+
+    def test_undecodable_base64_is_not_interned(self):
+        first = Track(id='AAAA', info=make_info('A'), intern=True)
+        second = Track(id='AAAA', info=make_info('B'), intern=True)
+
+        self.assertEqual(second.title, 'B')
+
+    def test_info_is_released_with_its_tracks(self):
+        id = make_id('Released')
+        track = Track(id=id, info=make_info('Released'), intern=True)
+        self.assertIn(id, TrackInfo._interned)
+
+        del track
+        gc.collect()
+        self.assertNotIn(id, TrackInfo._interned)
+
+    def test_store_does_not_intern_placeholders(self):
+        class InternedTrack(Track):
+            INTERN_INFO = True
+
+            __slots__ = ()
+
+        store = TrackStore()
+        store.append(InternedTrack(id='spotify', info=make_info('A', source='spotify')))
+        store.append(InternedTrack(id='spotify', info=make_info('B', source='spotify')))
+
+        self.assertEqual([track.title for track in store], ['A', 'B'])
+
+
+class TrackCompatibilityTest(unittest.TestCase):
+    def test_legacy_attributes(self):
+        track = make_track('Legacy', length=1000)
+
+        self.assertEqual(track._title, 'Legacy')
+        self.assertEqual(track._length, 1000)
+        self.assertEqual(track._source, track.source)
+
+    def test_legacy_attributes_can_be_set(self):
+        class Renamed(Track):
+            def __init__(self, **kwargs):
+                super().__init__(**kwargs)
+                self._title = self._title.upper()
+
+        id = make_id('Shared')
+        original = Track(id=id, info=make_info('Shared'), intern=True)
+        renamed = Renamed(id=id, info=make_info('Shared'), intern=True)
+
+        self.assertEqual(renamed.title, 'SHARED')
+        self.assertEqual(renamed.length, original.length)
+        self.assertEqual(original.title, 'Shared')
+        self.assertEqual(TrackInfo.intern(id, make_info('Shared')).title, 'Shared')
+
+
+class TrackIdTest(unittest.TestCase):
+    def test_checks(self):
+        self.assertTrue(_is_track_id(make_id()))
+        self.assertFalse(_is_track_id('spotify'))
+        self.assertFalse(_is_track_id(make_id(version=9)))
+
+    def test_results_are_cached(self):
+        id = make_id('Cached')
+        _is_track_id(id)
+
+        hits = _is_track_id.cache_info().hits
+        _is_track_id(id)
+        self.assertEqual(_is_track_id.cache_info().hits, hits + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
+
+
+class PlaylistTest(unittest.TestCase):
+    def make_playlist(self, *titles, **kwargs):
+        tracks = [{'track': make_id(title), 'info': make_info(title)} for title in titles]
+        return Playlist(info={'name': 'Mix'}, tracks=tracks, **kwargs)
+
+    def test_iterates_over_tracks(self):
+        for compact in (False, True):
+            with self.subTest(compact=compact):
+                playlist = self.make_playlist('A', 'B', 'C', compact=compact)
+                tracks = list(playlist)
+
+                self.assertTrue(all(isinstance(track, Track) for track in tracks))
+                self.assertEqual([track.title for track in tracks], ['A', 'B', 'C'])
+                self.assertEqual([track.id for track in tracks], [make_id(title) for title in 'ABC'])
+
+    def test_iteration_reuses_built_tracks(self):
+        playlist = self.make_playlist('A', 'B')
+        first = playlist[0]
+
+        self.assertIs(next(iter(playlist)), first)
+        self.assertEqual(list(playlist), playlist.tracks)
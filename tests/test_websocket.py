@@ -0,0 +1,93 @@
+import asyncio
+import unittest
+
+from unittest import mock
+
+import aiohttp
+
+from obsidian.errors import ObsidianAuthorizationFailure
+from obsidian.websocket import Websocket
+
+from .utils import run
+
+
+class _Backoff:
+    def __init__(self, *_, **__):
+        pass
+
+    def delay(self):
+        return 0
+
+
+class _Socket:
+    closed = False
+
+    def __init__(self, headers):
+        self._response = mock.Mock(headers=headers)
+
+
+class _Session:
+    def __init__(self, *results):
+        self.results = list(results)
+
+    async def ws_connect(self, *_, **__):
+        result = self.results.pop(0)
+        if isinstance(result, BaseException):
+            raise result
+
+        return result
+
+
+class _Node:
+    identifier = 'MAIN'
+    host = 'localhost'
+    port = '3030'
+    password = 'password'
+    resume_key = 'key'
+    resume_timeout = 60
+    __internal__ = {}
+
+    def __init__(self):
+        self.bot = mock.Mock()
+        self.bot.user.id = 1
+        self.ready = []
+
+    async def handle_ws_ready(self, *, resumed=False):
+        self.ready.append(resumed)
+
+    def dispatch_event(self, *_):
+        pass
+
+
+@mock.patch('obsidian.websocket.ExponentialBackoff', _Backoff)
+class WebsocketReconnectTest(unittest.TestCase):
+    def reconnect(self, *results):
+        async def main():
+            node = _Node()
+            ws = Websocket(node, _Session(*results), asyncio.get_event_loop())
+            ws._Websocket__reconnecting = True
+            return await ws._reconnect(), node.ready
+
+        with self.assertLogs('obsidian.node', level='WARNING'):
+            return run(main())
+
+    def test_resumed_only_when_obsidian_says_so(self):
+        self.assertEqual(self.reconnect(_Socket({'Session-Resumed': 'true'})), (True, [True]))
+        self.assertEqual(self.reconnect(_Socket({})), (True, [False]))
+
+    def test_retries_transient_errors(self):
+        error = aiohttp.WSServerHandshakeError(None, (), status=502)
+        self.assertEqual(self.reconnect(OSError(), error, _Socket({})), (True, [False]))
+
+    def test_stops_on_authorization_failure(self):
+        error = aiohttp.WSServerHandshakeError(None, (), status=401)
+        self.assertEqual(self.reconnect(error), (False, []))
+
+
+class AuthorizationFailureTest(unittest.TestCase):
+    def test_is_raised_as_itself(self):
+        self.assertIsInstance(ObsidianAuthorizationFailure(_Node()), ObsidianAuthorizationFailure)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import asyncio
+import struct
+
+from base64 import b64encode
+from typing import Any, Dict
+
+from obsidian.track import Track
+
+
+def _utf(value: str) -> bytes:
+    data = value.encode('utf-8')
+    return struct.pack('>H', len(data)) + data
+
+
+def make_id(
+        title: str = 'Never Gonna Give You Up',
+        *,
+        author: str = 'Rick Astley',
+        length: int = 212000,
+        identifier: str = 'dQw4w9WgXcQ',
+        uri: str = 'https://www.youtube.com/watch?v=dQw4w9WgXcQ',
+        source: str = 'youtube',
+        version: int = 2
+) -> str:
+    """Builds a Lavaplayer track ID the way Obsidian encodes them."""
+
+    body = (
+        bytes([version]) + _utf(title) + _utf(author) + struct.pack('>q', length)
+        + _utf(identifier) + b'\x00' + b'\x01' + _utf(uri) + _utf(source) + struct.pack('>q', 0)
+    )
+    return b64encode(struct.pack('>i', len(body) | 1 << 30) + body).decode('ascii')
+
+
+def make_info(title: str = 'Never Gonna Give You Up', *, length: int = 212000, source: str = 'youtube') -> Dict[str, Any]:
+    return {
+        'title': title,
+        'author': 'Rick Astley',
+        'length': length,
+        'identifier': 'dQw4w9WgXcQ',
+        'is_stream': False,
+        'is_seekable': True,
+        'uri': 'https://www.youtube.com/watch?v=dQw4w9WgXcQ',
+        'source_name': source,
+        'position': 0
+    }
+
+
+def make_track(title: str = 'Never Gonna Give You Up', *, length: int = 212000, **kwargs) -> Track:
+    return Track(id=make_id(title, length=length), info=make_info(title, length=length), **kwargs)
+
+
+def make_spotify_track(title: str, **kwargs) -> Track:
+    return Track(id='spotify', info=make_info(title, source='spotify'), **kwargs)
+
+
+def run(coro: Any) -> Any:
+    loop = asyncio.new_event_loop()
+
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()